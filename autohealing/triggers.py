@@ -1,3 +1,4 @@
+import threading
 from config.settings import (
     AUTO_HEAL_CPU_THRESHOLD, AUTO_HEAL_MEMORY_THRESHOLD, 
     AUTO_HEAL_DISK_THRESHOLD, AUTO_HEALING_ENABLED
@@ -9,6 +10,9 @@ class AutoHealingTriggers:
         self.system_healer = system_healer
         self.action_logger = action_logger
         self.enabled = AUTO_HEALING_ENABLED
+        # Services en cours de redémarrage (surveillance événementielle et cycle peuvent se croiser)
+        self.lock = threading.Lock()
+        self.healing = set()
     
     def evaluate_and_heal(self, metrics, services_status):
         """Évalue les métriques et déclenche l'auto-réparation si nécessaire"""
@@ -33,31 +37,46 @@ class AutoHealingTriggers:
         
         for service, status in services_status.items():
             if not status:  # Service arrêté
-                success, message, details = self.service_healer.restart_service(service)
-                
-                healing_actions.append({
-                    'type': 'service_restart',
-                    'service': service,
-                    'success': success,
-                    'message': message,
-                    'details': details
-                })
-                
-                # Log de l'action dans le log principal via ActionLogger
-                self.action_logger.log_service_restart(service, success, message, details)
+                action = self.heal_service(service)
+                if action is not None:
+                    healing_actions.append(action)
         
         return healing_actions
     
+    def heal_service(self, service):
+        """Redémarre un service arrêté; None si un redémarrage de ce service est déjà en cours"""
+        with self.lock:
+            if service in self.healing:
+                return None
+            self.healing.add(service)
+        
+        try:
+            success, message, details = self.service_healer.restart_service(service)
+        finally:
+            with self.lock:
+                self.healing.discard(service)
+        
+        # Log de l'action dans le log principal via ActionLogger
+        self.action_logger.log_service_restart(service, success, message, details)
+        
+        return {
+            'type': 'service_restart',
+            'service': service,
+            'success': success,
+            'message': message,
+            'details': details
+        }
+    
     def _heal_system_issues(self, metrics):
-        """Réparation automatique des problèmes système"""
+        """Réparation automatique des problèmes système (métriques absentes ignorées)"""
         healing_actions = []
         
-        cpu_value = metrics['cpu']
-        memory_value = metrics['memory']
-        disk_value = metrics['disk']
+        cpu_value = metrics.get('cpu')
+        memory_value = metrics.get('memory')
+        disk_value = metrics.get('disk')
         
         # CPU trop élevé
-        if cpu_value > AUTO_HEAL_CPU_THRESHOLD:
+        if cpu_value is not None and cpu_value > AUTO_HEAL_CPU_THRESHOLD:
             success, message, details = self.system_healer.clear_cache()
             
             healing_actions.append({
@@ -71,7 +90,7 @@ class AutoHealingTriggers:
             self.action_logger.log_system_healing('clear_cache', success, message, details)
         
         # Mémoire trop élevée
-        if memory_value > AUTO_HEAL_MEMORY_THRESHOLD:
+        if memory_value is not None and memory_value > AUTO_HEAL_MEMORY_THRESHOLD:
             success, message, details = self.system_healer.kill_process_by_memory(threshold_percent=15.0)
             
             healing_actions.append({
@@ -85,7 +104,7 @@ class AutoHealingTriggers:
             self.action_logger.log_system_healing('kill_process', success, message, details)
         
         # Disque presque plein
-        if disk_value > AUTO_HEAL_DISK_THRESHOLD:
+        if disk_value is not None and disk_value > AUTO_HEAL_DISK_THRESHOLD:
             success, message, details = self.system_healer.cleanup_temp_files()
             
             healing_actions.append({
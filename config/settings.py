@@ -9,13 +9,79 @@ CPU_THRESHOLD = float(os.getenv('CPU_THRESHOLD', 80.0))
 MEMORY_THRESHOLD = float(os.getenv('MEMORY_THRESHOLD', 85.0))
 DISK_THRESHOLD = float(os.getenv('DISK_THRESHOLD', 90.0))
 NETWORK_THRESHOLD = float(os.getenv('NETWORK_THRESHOLD', 100.0))
+CPU_CORE_THRESHOLD = float(os.getenv('CPU_CORE_THRESHOLD', 95.0))  # un cœur saturé
+CPU_IOWAIT_THRESHOLD = float(os.getenv('CPU_IOWAIT_THRESHOLD', 20.0))  # % du temps CPU en attente d'E/S
 
 # Services à surveiller
 MONITORED_SERVICES = [s.strip() for s in os.getenv('MONITORED_SERVICES', 'cron,dbus,apache2').split(',')]
+# Source de l'état des services: 'systemctl' (un seul 'systemctl show' par cycle) ou 'fake' (hôtes sans systemd)
+SERVICE_STATE_SOURCE = os.getenv('SERVICE_STATE_SOURCE', 'systemctl').lower()
+# Détection des pannes: 'poll' (à chaque cycle) ou 'journal' (événementielle, journalctl -f)
+SERVICE_WATCH_MODE = os.getenv('SERVICE_WATCH_MODE', 'poll').lower()
+SERVICE_RESYNC_INTERVAL = int(os.getenv('SERVICE_RESYNC_INTERVAL', 300))  # vérification complète en mode événementiel (secondes)
 
-# Configuration des logs - FORMAT JSON ARRAY MAINTENANT
-LOG_FILE = os.getenv('LOG_FILE', 'logs/monitoring.json')
+# Moteur de collecte: intervalle propre à chaque collecteur (cpu, memory, disk, network, services), en secondes
+# ex: COLLECTOR_INTERVALS=cpu=2,disk=60,services=30 (collecteurs non cités: MONITORING_INTERVAL)
+COLLECTOR_INTERVALS = {
+    name.strip(): float(interval)
+    for name, _, interval in (item.partition('=') for item in os.getenv('COLLECTOR_INTERVALS', '').split(','))
+    if name.strip() and interval.strip()
+}
+# Cadence fixe: échéances alignées sur les multiples de l'intervalle en heure murale (grille commune aux hôtes)
+SCHEDULE_ALIGN = os.getenv('SCHEDULE_ALIGN', 'true').lower() == 'true'
+# Échéances manquées (collecte plus longue que l'intervalle): 'skip' (prochaine échéance) ou 'coalesce' (une exécution immédiate)
+SCHEDULE_MISSED_TICKS = os.getenv('SCHEDULE_MISSED_TICKS', 'skip').lower()
+
+# Configuration des logs - FORMAT JSON LINES (append-only) PAR DÉFAUT
+LOG_FILE = os.getenv('LOG_FILE', 'logs/monitoring.jsonl')
+# Ancien emplacement par défaut (tableau JSON): signalé au démarrage s'il n'a pas été migré (utils/migrate_log.py)
+LEGACY_LOG_FILE = os.getenv('LEGACY_LOG_FILE', 'logs/monitoring.json')
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'jsonl').lower()  # 'jsonl' ou 'array' (ancien format)
+LOG_FSYNC = os.getenv('LOG_FSYNC', 'interval').lower()  # 'never', 'always' ou 'interval'
+LOG_FSYNC_INTERVAL = float(os.getenv('LOG_FSYNC_INTERVAL', 5.0))
+
+# Écriture asynchrone des logs (file bornée + thread d'écriture par lots)
+LOG_ASYNC = os.getenv('LOG_ASYNC', 'True').lower() == 'true'
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+LOG_BATCH_SIZE = int(os.getenv('LOG_BATCH_SIZE', 200))
+LOG_FLUSH_INTERVAL = float(os.getenv('LOG_FLUSH_INTERVAL', 1.0))
+
+# Segmentation temporelle des logs et rétention
+LOG_SEGMENT_PERIOD = os.getenv('LOG_SEGMENT_PERIOD', 'daily').lower()  # 'hourly', 'daily' ou 'none'
+LOG_RETENTION_DAYS = int(os.getenv('LOG_RETENTION_DAYS', 30))  # 0 = illimité
+LOG_RETENTION_MAX_MB = float(os.getenv('LOG_RETENTION_MAX_MB', 0))  # 0 = illimité
+LOG_RETENTION_CHECK_INTERVAL = int(os.getenv('LOG_RETENTION_CHECK_INTERVAL', 300))
+LOG_COMPRESSION = os.getenv('LOG_COMPRESSION', 'gzip').lower()  # segments fermés: 'gzip', 'lzma' ou 'none'
+
+# Magasin colonnaire des métriques système (fichiers mappés en mémoire)
+METRIC_STORE_ENABLED = os.getenv('METRIC_STORE_ENABLED', 'True').lower() == 'true'
+METRIC_STORE_PATH = os.getenv('METRIC_STORE_PATH', 'logs/metrics')
+
+# Agrégats incrémentaux (1m / 5m / 1h) pour l'historique long
+ROLLUPS_ENABLED = os.getenv('ROLLUPS_ENABLED', 'True').lower() == 'true'
+ROLLUP_PATH = os.getenv('ROLLUP_PATH', 'logs/rollups')
+DASHBOARD_MAX_POINTS = int(os.getenv('DASHBOARD_MAX_POINTS', 2000))  # points max par courbe
+DASHBOARD_RENDER_CACHE_SIZE = int(os.getenv('DASHBOARD_RENDER_CACHE_SIZE', 64))  # sorties rendues gardées en cache (LRU)
+
+# Service du tableau de bord: 'embedded' (thread du processus de surveillance, serveur de développement)
+# ou 'separate' (processus gunicorn dédiés, lecture seule du log et du magasin de métriques)
+DASHBOARD_MODE = os.getenv('DASHBOARD_MODE', 'embedded')
+DASHBOARD_PORT = int(os.getenv('DASHBOARD_PORT', 8050))
+DASHBOARD_WORKERS = int(os.getenv('DASHBOARD_WORKERS', 4))
+
+# API REST d'historique (/api/metrics, /api/alerts, /api/actions, /api/services)
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', 500))  # entrées par page par défaut
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 5000))
+
+# Base SQLite des événements (alertes, actions, événements système): dernières entrées et requêtes de l'API
+# (les comptes du tableau de bord sont lus dans les compteurs d'événements ci-dessous)
+LOG_SQLITE_ENABLED = os.getenv('LOG_SQLITE_ENABLED', 'False').lower() == 'true'
+LOG_SQLITE_FILE = os.getenv('LOG_SQLITE_FILE', 'logs/events.db')
+
+# Compteurs d'événements maintenus à l'écriture (par type, service, gravité, statut et par intervalle)
+EVENT_COUNTERS_ENABLED = os.getenv('EVENT_COUNTERS_ENABLED', 'True').lower() == 'true'
+EVENT_COUNTERS_BUCKET_SECONDS = int(os.getenv('EVENT_COUNTERS_BUCKET_SECONDS', 3600))
 
 # Configuration de l'auto-réparation
 AUTO_HEALING_ENABLED = os.getenv('AUTO_HEALING_ENABLED', 'True').lower() == 'true'
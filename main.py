@@ -1,28 +1,64 @@
+import importlib.util
+import subprocess
+import sys
 import threading
 import time
+from config.settings import DASHBOARD_MODE, DASHBOARD_PORT, DASHBOARD_WORKERS
 from monitoring.monitor import main as monitoring_main
 from visualization.dashboard import MonitoringDashboard
+from utils.event_bus import event_bus
 
 def run_monitoring():
     """Lance le système de surveillance"""
     print("🔧 Démarrage du système de surveillance...")
     monitoring_main()
 
-def run_dashboard():
+def run_dashboard(dashboard):
     """Lance le tableau de bord"""
     print("📊 Démarrage du tableau de bord...")
-    dashboard = MonitoringDashboard(port=8050)
     dashboard.run_dashboard()
 
+def start_dashboard_workers():
+    """Lance le tableau de bord dans des processus gunicorn séparés (None si indisponible)"""
+    if importlib.util.find_spec('gunicorn') is None:
+        print("⚠️ gunicorn n'est pas installé: tableau de bord lancé dans le processus de surveillance")
+        return None
+    
+    print(f"📊 Démarrage du tableau de bord ({DASHBOARD_WORKERS} processus)...")
+    command = [
+        sys.executable, '-m', 'gunicorn',
+        '--workers', str(DASHBOARD_WORKERS),
+        '--bind', f'0.0.0.0:{DASHBOARD_PORT}',
+        'visualization.wsgi:server'
+    ]
+    try:
+        return subprocess.Popen(command)
+    except OSError as e:
+        print(f"❌ Erreur lancement du tableau de bord: {e}")
+        return None
+
+def stop_dashboard_workers(process):
+    """Arrête les processus du tableau de bord"""
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
 def main():
     """Lance les deux systèmes en parallèle"""
     print("🚀 Démarrage du système de surveillance avec tableau de bord...")
-    print("💡 Le tableau de bord sera disponible sur: http://localhost:8050")
+    print(f"💡 Le tableau de bord sera disponible sur: http://localhost:{DASHBOARD_PORT}")
     print("⏳ Démarrage dans 3 secondes...")
     time.sleep(3)
     
-    dashboard_thread = threading.Thread(target=run_dashboard, daemon=True)
-    dashboard_thread.start()
+    workers = start_dashboard_workers() if DASHBOARD_MODE == 'separate' else None
+    if workers is None:
+        # Même processus: le tableau de bord reçoit les entrées en direct par le bus d'événements
+        # (créé avant la surveillance pour être abonné avant la première entrée)
+        dashboard = MonitoringDashboard(port=DASHBOARD_PORT, event_bus=event_bus)
+        dashboard_thread = threading.Thread(target=run_dashboard, args=(dashboard,), daemon=True)
+        dashboard_thread.start()
     
     try:
         run_monitoring()
@@ -30,6 +66,9 @@ def main():
         print("\n🛑 Arrêt du système complet...")
     except Exception as e:
         print(f"❌ Erreur: {e}")
+    finally:
+        if workers is not None:
+            stop_dashboard_workers(workers)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
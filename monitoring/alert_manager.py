@@ -1,22 +1,34 @@
-from config.settings import EMAIL_ALERTS_ENABLED, EMAIL_RECIPIENTS, EMAIL_ALERT_INTERVAL
+from config.settings import (
+    EMAIL_ALERTS_ENABLED, EMAIL_RECIPIENTS, EMAIL_ALERT_INTERVAL,
+    CPU_CORE_THRESHOLD, CPU_IOWAIT_THRESHOLD
+)
+import threading
 from datetime import datetime
 
 class AlertManager:
-    def __init__(self, cpu_threshold, memory_threshold, disk_threshold, network_threshold, email_sender=None):
+    def __init__(self, cpu_threshold, memory_threshold, disk_threshold, network_threshold, email_sender=None,
+                 core_threshold=CPU_CORE_THRESHOLD, iowait_threshold=CPU_IOWAIT_THRESHOLD):
         self.cpu_threshold = cpu_threshold
+        self.core_threshold = core_threshold
+        self.iowait_threshold = iowait_threshold
         self.memory_threshold = memory_threshold
         self.disk_threshold = disk_threshold
         self.network_threshold = network_threshold
         self.email_sender = email_sender
         self.sent_alerts = set()  # Pour éviter les doublons
+        # Cycle de surveillance et watcher des services alertent depuis des threads différents
+        self.lock = threading.Lock()
     
     def check_thresholds(self, metrics):
-        """Vérifie si les métriques dépassent les seuils (sans auto-réparation)"""
+        """
+        Vérifie si les métriques dépassent les seuils (sans auto-réparation)
+        Seules les métriques présentes sont vérifiées (collecteurs à intervalles différents)
+        """
         alerts = []
         
         # Vérification CPU
-        cpu_value = metrics['cpu']
-        if cpu_value > self.cpu_threshold:
+        cpu_value = metrics.get('cpu')
+        if cpu_value is not None and cpu_value > self.cpu_threshold:
             severity = "CRITIQUE" if cpu_value > 90 else "AVERTISSEMENT"
             alert_data = {
                 'type': 'high_cpu',
@@ -31,9 +43,44 @@ class AlertManager:
             # Envoyer email pour TOUTES les alertes CPU (pas seulement critiques)
             self._send_email_alert(alert_data)
         
+        # Vérification par cœur et attente d'E/S (répartition issue des compteurs CPU)
+        cpu_details = metrics.get('cpu_details') or {}
+        per_core = cpu_details.get('per_core') or []
+        saturated = [core for core, value in enumerate(per_core) if value >= self.core_threshold]
+        if saturated and len(per_core) > 1 and cpu_value is not None and cpu_value <= self.cpu_threshold:
+            # Un seul cœur saturé reste invisible dans la moyenne (processus mono-thread bloqué)
+            core_value = max(per_core[core] for core in saturated)
+            cores = ', '.join(str(core) for core in saturated)
+            alert_data = {
+                'type': 'saturated_core',
+                'value': core_value,
+                'threshold': self.core_threshold,
+                'severity': "AVERTISSEMENT",
+                'message': f"🚨 AVERTISSEMENT - Cœur CPU saturé: cœur {cores} à {core_value}% "
+                           f"(seuil: {self.core_threshold}%, global: {cpu_value}%)",
+                'timestamp': metrics['timestamp']
+            }
+            alerts.append(alert_data)
+            self._send_email_alert(alert_data)
+        
+        iowait_value = cpu_details.get('iowait')
+        if iowait_value is not None and iowait_value > self.iowait_threshold:
+            severity = "CRITIQUE" if iowait_value > self.iowait_threshold * 2 else "AVERTISSEMENT"
+            alert_data = {
+                'type': 'high_iowait',
+                'value': iowait_value,
+                'threshold': self.iowait_threshold,
+                'severity': severity,
+                'message': f"🚨 {severity} - Attente d'E/S élevée: {iowait_value}% du temps CPU "
+                           f"(seuil: {self.iowait_threshold}%)",
+                'timestamp': metrics['timestamp']
+            }
+            alerts.append(alert_data)
+            self._send_email_alert(alert_data)
+        
         # Vérification Mémoire
-        memory_value = metrics['memory']
-        if memory_value > self.memory_threshold:
+        memory_value = metrics.get('memory')
+        if memory_value is not None and memory_value > self.memory_threshold:
             severity = "CRITIQUE" if memory_value > 95 else "AVERTISSEMENT"
             alert_data = {
                 'type': 'high_memory',
@@ -49,8 +96,8 @@ class AlertManager:
             self._send_email_alert(alert_data)
         
         # Vérification Disque
-        disk_value = metrics['disk']
-        if disk_value > self.disk_threshold:
+        disk_value = metrics.get('disk')
+        if disk_value is not None and disk_value > self.disk_threshold:
             severity = "CRITIQUE" if disk_value > 95 else "AVERTISSEMENT"
             alert_data = {
                 'type': 'low_disk',
@@ -66,8 +113,8 @@ class AlertManager:
             self._send_email_alert(alert_data)
         
         # Vérification Réseau
-        network_data = metrics['network']
-        total_network_mb = network_data['sent_mb'] + network_data['recv_mb']
+        network_data = metrics.get('network')
+        total_network_mb = network_data['sent_mb'] + network_data['recv_mb'] if network_data else 0.0
         if total_network_mb > self.network_threshold:
             severity = "CRITIQUE" if total_network_mb > (self.network_threshold * 2) else "AVERTISSEMENT"
             alert_data = {
@@ -112,8 +159,10 @@ class AlertManager:
         # Créer une clé unique pour cette alerte (pour éviter les doublons)
         alert_key = f"{alert_data['type']}_{alert_data.get('service', '')}"
         
-        # Vérifier si on peut envoyer cette alerte (anti-spam)
-        if self.email_sender.can_send_alert(alert_key, EMAIL_ALERT_INTERVAL):
+        # Vérifier si on peut envoyer cette alerte (anti-spam, décision atomique; envoi hors verrou)
+        with self.lock:
+            allowed = self.email_sender.can_send_alert(alert_key, EMAIL_ALERT_INTERVAL)
+        if allowed:
             subject = f"Alerte {alert_data['severity']} - {self._get_alert_type_display(alert_data['type'])}"
             message = self._create_email_message(alert_data)
             
@@ -123,6 +172,8 @@ class AlertManager:
         """Retourne le nom d'affichage pour le type d'alerte"""
         types = {
             'high_cpu': 'CPU Élevé',
+            'saturated_core': 'Cœur CPU Saturé',
+            'high_iowait': "Attente d'E/S Élevée",
             'high_memory': 'Mémoire Élevée',
             'low_disk': 'Espace Disque Faible',
             'high_network': 'Réseau Élevé',
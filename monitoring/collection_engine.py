@@ -0,0 +1,178 @@
+import asyncio
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from monitoring.scheduler import FixedRateSchedule
+
+# Écart toléré entre les échéances de deux grilles alignées (secondes, inférieur au plus petit intervalle)
+TICK_EPSILON = 0.001
+
+# Mesure d'un collecteur: échéance de sa grille et fin de la collecte (heures murales, epoch), résultat
+Sample = namedtuple('Sample', ('name', 'tick', 'collected_at', 'result'))
+
+
+class Collector:
+    """Collecte périodique: fonction bloquante exécutée dans le pool de threads, à son propre intervalle"""
+
+    def __init__(self, name, collect, interval):
+        self.name = name
+        self.collect = collect
+        self.interval = max(float(interval), 0.01)
+        self.runs = 0
+        self.errors = 0
+        self.last_duration = None
+        self.max_duration = 0.0
+        self.schedule = None
+
+
+class CollectionEngine:
+    """
+    Moteur de collecte asyncio
+    - chaque collecteur tourne dans sa propre tâche, à son intervalle
+    - les appels bloquants (psutil, systemctl, écriture du log) sont déportés dans un pool de threads
+    - un collecteur lent ne retarde que lui-même: les autres continuent à leur rythme
+    - cadence fixe alignée sur l'heure murale (FixedRateSchedule): pas de dérive due à la durée des collectes
+    Chaque collecte produit une mesure (Sample) mise en file: le cycle les reçoit toutes, une seule
+    fois chacune, par drain_samples(), quel que soit le rapport entre les intervalles
+    Le dernier résultat de chaque collecteur reste disponible dans results (par nom de collecteur)
+    Le cycle s'exécute après les collectes de sa propre échéance: il attend (au plus la moitié de
+    son intervalle) que chaque collecteur d'intervalle inférieur ou égal au sien ait terminé ses
+    échéances jusqu'à celle du cycle; cette attente compte dans le retard du cycle
+    Les collecteurs plus lents ne sont pas attendus: leurs mesures arrivent au cycle suivant
+    """
+
+    def __init__(self, collectors, max_workers=None, align=True, missed='skip'):
+        self.collectors = {collector.name: collector for collector in collectors}
+        self.results = {}
+        self.samples = deque()
+        self.max_workers = max_workers
+        self.align = align
+        self.missed = missed
+        self.cycle = None
+        self.collected = None
+        self.incomplete_cycles = 0
+
+    async def _run_once(self, collector, executor):
+        """Exécute une collecte dans le pool de threads; retourne (réussite, résultat)"""
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        try:
+            result = await loop.run_in_executor(executor, collector.collect)
+        except Exception as e:
+            collector.errors += 1
+            print(f"❌ Erreur du collecteur {collector.name}: {e}")
+            return False, None
+        else:
+            collector.runs += 1
+            return True, result
+        finally:
+            collector.last_duration = time.monotonic() - started
+            collector.max_duration = max(collector.max_duration, collector.last_duration)
+
+    async def _loop(self, collector, executor):
+        """Boucle d'un collecteur: une collecte à chaque échéance de sa grille, une mesure par collecte"""
+        collector.schedule = FixedRateSchedule(collector.interval, self.align, self.missed)
+        while True:
+            await asyncio.sleep(collector.schedule.delay())
+            collector.schedule.start_tick()
+            tick = collector.schedule.tick_time()
+            ok, result = await self._run_once(collector, executor)
+            if ok:
+                self.results[collector.name] = result
+                if self.cycle is not None:
+                    self.samples.append(Sample(collector.name, tick, time.time(), result))
+            collector.schedule.finish_tick()
+            async with self.collected:
+                self.collected.notify_all()
+
+    def drain_samples(self):
+        """
+        Mesures produites depuis l'appel précédent, dans leur ordre d'arrivée
+        Chaque mesure n'est rendue qu'une fois (appelé depuis le thread du cycle)
+        """
+        samples = []
+        while self.samples:
+            samples.append(self.samples.popleft())
+        return samples
+
+    def settled_until(self):
+        """
+        Heure murale (epoch) avant laquelle chaque collecteur a terminé toutes ses échéances
+        Les mesures de ces échéances sont déjà en file: à lire avant drain_samples()
+        """
+        ticks = [
+            collector.schedule.tick_time()
+            for collector in self.collectors.values() if collector.schedule is not None
+        ]
+        return min(ticks, default=time.time()) - TICK_EPSILON
+
+    def _collected_until(self, tick, interval):
+        """
+        Vrai si chaque collecteur d'intervalle inférieur ou égal à interval a terminé toutes
+        ses échéances jusqu'à tick (heure murale)
+        """
+        return all(
+            collector.schedule is not None and collector.schedule.tick_time() > tick + TICK_EPSILON
+            for collector in self.collectors.values() if collector.interval <= interval + TICK_EPSILON
+        )
+
+    async def _cycle_loop(self, cycle, executor):
+        """Boucle du cycle: à chaque échéance, s'exécute après les collectes de cette même échéance"""
+        cycle.schedule = FixedRateSchedule(cycle.interval, self.align, self.missed)
+        while True:
+            await asyncio.sleep(cycle.schedule.delay())
+            tick = cycle.schedule.tick_time()
+            try:
+                async with self.collected:
+                    await asyncio.wait_for(
+                        self.collected.wait_for(lambda: self._collected_until(tick, cycle.interval)),
+                        cycle.interval / 2
+                    )
+            except asyncio.TimeoutError:
+                # Collecteur lent: ses mesures de cette échéance seront traitées au cycle suivant
+                self.incomplete_cycles += 1
+            # Retard mesuré après l'attente des collectes: il l'inclut
+            cycle.schedule.start_tick()
+            await self._run_once(cycle, executor)
+            cycle.schedule.finish_tick()
+
+    async def run(self, cycle=None):
+        """
+        Lance tous les collecteurs jusqu'à annulation (Ctrl+C)
+        cycle: collecteur consommant les mesures (alertes, auto-réparation, journalisation);
+        son résultat n'est pas conservé. Sans cycle, aucune mesure n'est mise en file
+        """
+        collectors = list(self.collectors.values())
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers or len(collectors) + 1,
+            thread_name_prefix="collector"
+        )
+        self.cycle = cycle
+        self.collected = asyncio.Condition()
+        try:
+            tasks = [self._loop(collector, executor) for collector in collectors]
+            if cycle is not None:
+                tasks.append(self._cycle_loop(cycle, executor))
+            await asyncio.gather(*tasks)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self):
+        """Exécutions, erreurs, durées (ms) et ponctualité de chaque collecteur (et du cycle)"""
+        collectors = list(self.collectors.values())
+        if self.cycle is not None:
+            collectors.append(self.cycle)
+        stats = {}
+        for collector in collectors:
+            stats[collector.name] = {
+                'interval': collector.interval,
+                'runs': collector.runs,
+                'errors': collector.errors,
+                'last_duration_ms': round((collector.last_duration or 0.0) * 1000, 2),
+                'max_duration_ms': round(collector.max_duration * 1000, 2)
+            }
+            if collector.schedule is not None:
+                stats[collector.name].update(collector.schedule.get_stats())
+        if self.cycle is not None:
+            stats[self.cycle.name]['incomplete'] = self.incomplete_cycles
+        return stats
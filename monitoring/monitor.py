@@ -1,26 +1,77 @@
 import time
+import asyncio
 import platform
-from datetime import datetime
 from config.settings import (
     MONITORING_INTERVAL, CPU_THRESHOLD, MEMORY_THRESHOLD, 
     DISK_THRESHOLD, NETWORK_THRESHOLD, MONITORED_SERVICES, 
-    LOG_FILE, 
+    CPU_CORE_THRESHOLD, CPU_IOWAIT_THRESHOLD, SERVICE_STATE_SOURCE,
+    SERVICE_WATCH_MODE, SERVICE_RESYNC_INTERVAL, COLLECTOR_INTERVALS, SCHEDULE_ALIGN, SCHEDULE_MISSED_TICKS,
+    LOG_FILE, LEGACY_LOG_FILE, LOG_FORMAT, LOG_FSYNC, LOG_FSYNC_INTERVAL,
+    LOG_ASYNC, LOG_QUEUE_SIZE, LOG_BATCH_SIZE, LOG_FLUSH_INTERVAL,
+    LOG_SEGMENT_PERIOD, LOG_RETENTION_DAYS, LOG_RETENTION_MAX_MB, LOG_RETENTION_CHECK_INTERVAL,
+    LOG_COMPRESSION,
+    METRIC_STORE_ENABLED, METRIC_STORE_PATH, ROLLUPS_ENABLED, ROLLUP_PATH,
+    LOG_SQLITE_ENABLED, LOG_SQLITE_FILE, EVENT_COUNTERS_ENABLED, EVENT_COUNTERS_BUCKET_SECONDS,
     AUTO_HEALING_ENABLED, CLEANUP_PATHS,
     EMAIL_ALERTS_ENABLED, EMAIL_SMTP_SERVER, EMAIL_SMTP_PORT, 
     EMAIL_SENDER, EMAIL_SENDER_PASSWORD, EMAIL_RECIPIENTS
 )
 from monitoring.system_monitor import SystemMonitor
-from monitoring.service_monitor import ServiceMonitor
+from monitoring.service_monitor import ServiceMonitor, FakeSystemctl, ACTIVE_STATES
+from monitoring.service_watcher import ServiceWatcher, JournalEventSource, STOPPED_STATES, is_failure
 from monitoring.alert_manager import AlertManager
+from monitoring.collection_engine import CollectionEngine, Collector
 from autohealing.service_healer import ServiceHealer
 from autohealing.system_healer import SystemHealer
 from autohealing.action_logger import ActionLogger
 from autohealing.triggers import AutoHealingTriggers
 from utils.json_array_logger import JSONArrayLogger
+from utils.metric_store import MetricStore
+from utils.rollups import RollupAggregator
+from utils.sqlite_event_store import SQLiteEventStore
+from utils.event_counters import EventCounters, counters_path, COUNTED_EVENT_TYPES
+from utils.log_index import iter_query_records
+from utils.log_reader import check_legacy_log
+from utils.event_bus import event_bus
 from utils.email_sender import EmailSender
 
 # Initialisation du logger JSON array
-json_logger = JSONArrayLogger(LOG_FILE)
+json_logger = JSONArrayLogger(
+    LOG_FILE, LOG_FORMAT, LOG_FSYNC, LOG_FSYNC_INTERVAL,
+    async_mode=LOG_ASYNC, queue_size=LOG_QUEUE_SIZE,
+    batch_size=LOG_BATCH_SIZE, flush_interval=LOG_FLUSH_INTERVAL,
+    segment_period=LOG_SEGMENT_PERIOD, retention_days=LOG_RETENTION_DAYS,
+    retention_max_bytes=int(LOG_RETENTION_MAX_MB * 1024 * 1024),
+    retention_interval=LOG_RETENTION_CHECK_INTERVAL, compression=LOG_COMPRESSION
+)
+
+# Magasin colonnaire alimenté par le logger à chaque lot écrit
+metric_store = MetricStore(METRIC_STORE_PATH) if METRIC_STORE_ENABLED else None
+if metric_store is not None:
+    json_logger.add_observer(metric_store.ingest)
+
+# Agrégats 1m/5m/1h maintenus à l'écriture des métriques système
+rollups = RollupAggregator(ROLLUP_PATH) if ROLLUPS_ENABLED else None
+if rollups is not None:
+    json_logger.add_observer(rollups.ingest)
+
+# Base SQLite optionnelle pour les requêtes sur les événements
+event_store = SQLiteEventStore(LOG_SQLITE_FILE) if LOG_SQLITE_ENABLED else None
+if event_store is not None:
+    json_logger.add_observer(event_store.ingest)
+
+# Compteurs d'événements persistés à côté du log (graphiques d'incidents et indicateurs)
+event_counters = None
+if EVENT_COUNTERS_ENABLED:
+    event_counters = EventCounters.load(counters_path(LOG_FILE), retention_days=LOG_RETENTION_DAYS)
+    if event_counters is None:
+        # Première activation: comptage de l'historique existant (lecture des seuls offsets indexés)
+        event_counters = EventCounters(counters_path(LOG_FILE), EVENT_COUNTERS_BUCKET_SECONDS, LOG_RETENTION_DAYS)
+        event_counters.rebuild(iter_query_records(LOG_FILE, COUNTED_EVENT_TYPES))
+    json_logger.add_observer(event_counters.ingest)
+
+# Diffusion en direct des nouvelles entrées (tableau de bord du même processus)
+json_logger.add_listener(event_bus.publish)
 
 def display_system_info(auto_healing_enabled, email_alerts_enabled):
     """Affiche les informations du système"""
@@ -29,17 +80,27 @@ def display_system_info(auto_healing_enabled, email_alerts_enabled):
     print(f"💻 Système: {system} {version}")
     print(f"⏰ Intervalle: {MONITORING_INTERVAL} secondes")
     print(f"📊 Seuils - CPU: {CPU_THRESHOLD}%, Mémoire: {MEMORY_THRESHOLD}%, Disque: {DISK_THRESHOLD}%, Réseau: {NETWORK_THRESHOLD}MB")
+    print(f"📊 Seuils CPU détaillés - Cœur: {CPU_CORE_THRESHOLD}%, Attente E/S: {CPU_IOWAIT_THRESHOLD}%")
     print(f"🔧 Services surveillés: {', '.join(MONITORED_SERVICES)}")
     print(f"⚡ Auto-réparation: {'ACTIVÉE' if auto_healing_enabled else 'DÉSACTIVÉE'}")
     print(f"📧 Alertes Email: {'ACTIVÉES' if email_alerts_enabled else 'DÉSACTIVÉES'}")
 
 def display_system_metrics(metrics):
-    """Affiche les métriques système"""
+    """Affiche les métriques système (seules celles mesurées sont présentes)"""
     print(f"📊 [{metrics['timestamp']}] Métriques système:")
-    print(f"   CPU: {metrics['cpu']:.1f}% | Mémoire: {metrics['memory']:.1f}% | Disque: {metrics['disk']:.1f}%")
-    network_data = metrics['network']
-    total_network = network_data['sent_mb'] + network_data['recv_mb']
-    print(f"   Réseau: ↑{network_data['sent_mb']:.1f}MB ↓{network_data['recv_mb']:.1f}MB (Total: {total_network:.1f}MB)")
+    usage = [f"{label}: {metrics[name]:.1f}%" for name, label in (('cpu', 'CPU'), ('memory', 'Mémoire'), ('disk', 'Disque'))
+             if metrics.get(name) is not None]
+    if usage:
+        print(f"   {' | '.join(usage)}")
+    cpu_details = metrics.get('cpu_details') or {}
+    if cpu_details.get('per_core'):
+        print(f"   CPU détail: user {cpu_details.get('user', 0):.1f}% | system {cpu_details.get('system', 0):.1f}% | "
+              f"iowait {cpu_details.get('iowait', 0):.1f}% | steal {cpu_details.get('steal', 0):.1f}% | "
+              f"cœur max {max(cpu_details['per_core']):.1f}%")
+    network_data = metrics.get('network')
+    if network_data is not None:
+        total_network = network_data['sent_mb'] + network_data['recv_mb']
+        print(f"   Réseau: ↑{network_data['sent_mb']:.1f}MB ↓{network_data['recv_mb']:.1f}MB (Total: {total_network:.1f}MB)")
 
 def display_services_status(services_status):
     """Affiche le statut des services"""
@@ -63,17 +124,28 @@ def display_healing_actions(healing_actions):
     return output
 
 def log_metrics_to_json(metrics, json_logger):
-    """Log les métriques en JSON (sans affichage console)"""
+    """
+    Log les métriques en JSON (sans affichage console); null pour les métriques non mesurées
+    L'entrée est horodatée à l'échéance de collecte (tick) si elle est connue
+    """
+    cpu_details = metrics.get('cpu_details') or {}
+    network = metrics.get('network')
     json_logger.log_metric('system', {
-        'cpu_percent': metrics['cpu'],
-        'memory_percent': metrics['memory'],
-        'disk_percent': metrics['disk'],
-        'network_sent_mb': metrics['network']['sent_mb'],
-        'network_recv_mb': metrics['network']['recv_mb'],
-        'total_network_mb': metrics['network']['sent_mb'] + metrics['network']['recv_mb']
+        'cpu_percent': metrics.get('cpu'),
+        'cpu_user': cpu_details.get('user'),
+        'cpu_system': cpu_details.get('system'),
+        'cpu_iowait': cpu_details.get('iowait'),
+        'cpu_steal': cpu_details.get('steal'),
+        'cpu_per_core': cpu_details.get('per_core'),
+        'memory_percent': metrics.get('memory'),
+        'disk_percent': metrics.get('disk'),
+        'network_sent_mb': network['sent_mb'] if network else None,
+        'network_recv_mb': network['recv_mb'] if network else None,
+        'total_network_mb': network['sent_mb'] + network['recv_mb'] if network else None
     }, {
-        'timestamp': metrics['timestamp']
-    })
+        'timestamp': metrics['timestamp'],
+        'collected_at': metrics.get('collected_at')
+    }, timestamp=metrics.get('tick'))
 
 def log_alerts_to_json(alerts, json_logger):
     """Log les alertes en JSON (sans affichage console)"""
@@ -89,17 +161,130 @@ def log_alerts_to_json(alerts, json_logger):
             }
         )
 
-def log_services_to_json(services_status, json_logger):
-    """Log le statut des services en JSON (sans affichage console)"""
+def log_services_to_json(services_status, json_logger, service_states=None):
+    """Log le statut des services en JSON (sans affichage console), avec l'état systemd détaillé"""
+    service_states = service_states or {}
     for service, status in services_status.items():
-        json_logger.log_metric('service_status', {
+        values = {
             'service': service,
             'status': 'active' if status else 'inactive'
+        }
+        state = service_states.get(service)
+        if state is not None:
+            values.update({
+                'active_state': state['active_state'],
+                'sub_state': state['sub_state'],
+                'n_restarts': state['n_restarts'],
+                'main_pid': state['main_pid'],
+                'memory_mb': state['memory_mb']
+            })
+        json_logger.log_metric('service_status', values)
+
+def group_by_tick(samples):
+    """Résultats et fins de collecte des mesures système, par échéance: {échéance: (résultats, fins)}"""
+    ticks = {}
+    for sample in samples:
+        results, collected_at = ticks.setdefault(round(sample.tick, 3), ({}, {}))
+        results[sample.name] = sample.result
+        collected_at[sample.name] = sample.collected_at
+    return ticks
+
+def split_samples(samples, pending):
+    """
+    Sépare les mesures du moteur de collecte: métriques système de ces mesures (une entrée par
+    échéance, ordre chronologique) et mesures des services (ordre d'arrivée)
+    Les mesures système s'ajoutent aussi aux échéances en attente de journalisation (pending)
+    """
+    system_samples = [sample for sample in samples if sample.name != 'services']
+    services = [sample.result for sample in samples if sample.name == 'services']
+    ticks = group_by_tick(system_samples)
+    for tick, (results, collected_at) in ticks.items():
+        pending_results, pending_collected_at = pending.setdefault(tick, ({}, {}))
+        pending_results.update(results)
+        pending_collected_at.update(collected_at)
+    system_metrics = [
+        SystemMonitor.assemble_metrics(results, tick, collected_at)
+        for tick, (results, collected_at) in sorted(ticks.items())
+    ]
+    return system_metrics, services
+
+def settled_metrics(pending, until=None):
+    """
+    Retire de pending les échéances antérieures à until (toutes si None): métriques système
+    complètes de chaque échéance, dans l'ordre chronologique
+    """
+    settled = []
+    for tick in sorted(tick for tick in pending if until is None or tick < until):
+        results, collected_at = pending.pop(tick)
+        settled.append(SystemMonitor.assemble_metrics(results, tick, collected_at))
+    return settled
+
+def service_health(services):
+    """
+    Statuts transmis aux alertes et à la réparation: en mode événementiel, seuls les services
+    en panne (échec, arrêt inattendu) sont signalés; sinon tout service arrêté
+    """
+    failures = services.get('failures')
+    if failures is None:
+        return services['status']
+    return {service: service not in failures for service in services['status']}
+
+def make_transition_handler(alert_manager, healing_triggers):
+    """
+    Gestionnaire des transitions d'état reçues par ServiceWatcher (thread du watcher):
+    statut journalisé, puis alerte et redémarrage immédiats si le service tombe en panne
+    (échec ou arrêt inattendu; un arrêt demandé ou une sortie propre est seulement journalisé)
+    Appelé en même temps que le cycle: logger, AlertManager (anti-spam sous verrou) et
+    heal_service (un redémarrage à la fois par service) sont sûrs entre threads
+    """
+    def handle_transition(service, previous, state, event):
+        json_logger.log_metric('service_status', {
+            'service': service,
+            'status': 'active' if state in ACTIVE_STATES else 'inactive',
+            'active_state': state,
+            'source': 'event'
         })
+        if not is_failure(previous, state):
+            if previous in STOPPED_STATES and state not in STOPPED_STATES:
+                print(f"🟢 [événement] Service {service}: {previous} → {state}")
+            elif state in STOPPED_STATES:
+                print(f"⚪ [événement] Service {service}: {previous} → {state} (arrêt sans erreur)")
+            return
+        
+        print(f"🔴 [événement] Service {service}: {previous} → {state}")
+        alerts = alert_manager.check_services_alerts({service: False})
+        log_alerts_to_json(alerts, json_logger)
+        
+        if AUTO_HEALING_ENABLED:
+            action = healing_triggers.heal_service(service)
+            if action is not None:
+                print(display_healing_actions([action]))
+    
+    return handle_transition
+
+def shutdown(service_watcher=None):
+    """Arrêt ordonné (Ctrl+C ou erreur critique): watcher, file d'écriture, puis stores alimentés par le logger"""
+    if service_watcher is not None:
+        service_watcher.stop()
+    
+    # Vidage de la file d'écriture avant la fermeture des stores (dernier lot transmis aux observateurs)
+    json_logger.close()
+    if metric_store is not None:
+        metric_store.flush()
+    if rollups is not None:
+        rollups.close()
+    if event_store is not None:
+        event_store.close()
+    if event_counters is not None:
+        event_counters.close()
+    log_stats = json_logger.get_stats()
+    if log_stats['async']:
+        print(f"📝 Journal: {log_stats['written']} entrées écrites, {log_stats['dropped']} rejetées")
 
 def main():
     """Fonction principale de surveillance"""
     print("🚀 Démarrage du système de surveillance...")
+    check_legacy_log(LOG_FILE, LEGACY_LOG_FILE)
     json_logger.log_system_event('start', "Démarrage du système de surveillance")
     
     email_sender = None
@@ -118,8 +303,13 @@ def main():
     
     # Initialisation des modules de surveillance
     system_monitor = SystemMonitor()
-    service_monitor = ServiceMonitor(MONITORED_SERVICES)
-    alert_manager = AlertManager(CPU_THRESHOLD, MEMORY_THRESHOLD, DISK_THRESHOLD, NETWORK_THRESHOLD, email_sender)
+    if SERVICE_STATE_SOURCE == 'fake':
+        print("⚠️ État des services simulé (SERVICE_STATE_SOURCE=fake)")
+        service_monitor = ServiceMonitor(MONITORED_SERVICES, runner=FakeSystemctl(dict.fromkeys(MONITORED_SERVICES, 'active')))
+    else:
+        service_monitor = ServiceMonitor(MONITORED_SERVICES)
+    alert_manager = AlertManager(CPU_THRESHOLD, MEMORY_THRESHOLD, DISK_THRESHOLD, NETWORK_THRESHOLD, email_sender,
+                                 CPU_CORE_THRESHOLD, CPU_IOWAIT_THRESHOLD)
     
     # Initialisation des modules d'auto-réparation
     action_logger = ActionLogger(enabled=True, json_logger=json_logger)
@@ -127,60 +317,142 @@ def main():
     system_healer = SystemHealer(cleanup_paths=CLEANUP_PATHS)
     healing_triggers = AutoHealingTriggers(service_healer, system_healer, action_logger)
     
+    # Détection événementielle des pannes de services (journal systemd)
+    service_watcher = None
+    if SERVICE_WATCH_MODE == 'journal':
+        service_watcher = ServiceWatcher(
+            MONITORED_SERVICES, JournalEventSource(MONITORED_SERVICES),
+            make_transition_handler(alert_manager, healing_triggers)
+        )
+        service_watcher.seed(service_monitor.check_all_services_details())
+        service_watcher.start()
+        print(f"👂 Services suivis par le journal systemd (vérification complète toutes les {SERVICE_RESYNC_INTERVAL}s)")
+    last_resync = time.monotonic()
+    
+    def collect_services():
+        """États des services: watcher (aucune commande) ou appel groupé systemctl lors des resynchronisations"""
+        nonlocal last_resync
+        watching = service_watcher is not None and service_watcher.is_active()
+        if watching and time.monotonic() - last_resync < SERVICE_RESYNC_INTERVAL:
+            # Mode événementiel: états tenus à jour par le watcher, aucune commande lancée
+            return {'status': service_watcher.statuses(), 'states': None, 'failures': service_watcher.failures()}
+        services_status = service_monitor.check_all_services()
+        service_states = service_monitor.last_states
+        if watching:
+            service_watcher.seed(service_states)
+            last_resync = time.monotonic()
+            return {'status': services_status, 'states': service_states, 'failures': service_watcher.failures()}
+        return {'status': services_status, 'states': service_states, 'failures': None}
+    
     display_system_info(AUTO_HEALING_ENABLED, EMAIL_ALERTS_ENABLED)
     print("=" * 60)
     
     cycle_count = 0
+    # Échéances de collecte reçues mais pas encore journalisées: {échéance: (résultats, fins)}
+    pending_ticks = {}
     
-    try:
-        while True:
-            cycle_count += 1
-            print(f"\n🔄 Cycle de surveillance #{cycle_count}")
-            json_logger.log_system_event('monitoring_cycle', f"Cycle de surveillance #{cycle_count}")
-            
-            # Récupération des métriques
-            metrics = system_monitor.check_all_metrics()
-            services_status = service_monitor.check_all_services()
-            
-            # Vérification des alertes
-            system_alerts = alert_manager.check_thresholds(metrics)
-            service_alerts = alert_manager.check_services_alerts(services_status)
-            all_alerts = system_alerts + service_alerts
-            
-            # Auto-réparation si activée
-            healing_actions = []
-            if AUTO_HEALING_ENABLED:
-                healing_actions = healing_triggers.evaluate_and_heal(metrics, services_status)
-            
-            # Log en JSON (sans affichage console)
+    def run_cycle():
+        """
+        Cycle de surveillance: toutes les mesures reçues depuis le cycle précédent, chacune vérifiée
+        une seule fois, puis auto-réparation sur les dernières valeurs mesurées et affichage
+        Une entrée système par échéance de collecte, journalisée (horodatée à l'échéance) une fois
+        tous ses collecteurs passés, pour conserver l'ordre chronologique du journal
+        """
+        nonlocal cycle_count
+        cycle_count += 1
+        schedule = cycle.schedule
+        print(f"\n🔄 Cycle de surveillance #{cycle_count}")
+        json_logger.log_system_event('monitoring_cycle', f"Cycle de surveillance #{cycle_count}", {
+            'lateness_ms': schedule.stats['last_lateness_ms'],
+            'overruns': schedule.stats['overruns'],
+            'skipped': schedule.stats['skipped']
+        })
+        
+        # Vérification des alertes sur chaque mesure (chaque collecteur à son intervalle)
+        settled = engine.settled_until()
+        system_metrics, service_samples = split_samples(engine.drain_samples(), pending_ticks)
+        all_alerts = []
+        latest_metrics = {}
+        for metrics in system_metrics:
+            all_alerts.extend(alert_manager.check_thresholds(metrics))
+            latest_metrics.update(metrics)
+        latest_services = None
+        for services in service_samples:
+            all_alerts.extend(alert_manager.check_services_alerts(service_health(services)))
+            log_services_to_json(services['status'], json_logger, services['states'])
+            latest_services = services
+        
+        # Auto-réparation si activée (dernières valeurs mesurées depuis le cycle précédent)
+        healing_actions = []
+        if AUTO_HEALING_ENABLED and (latest_metrics or latest_services):
+            healing_actions = healing_triggers.evaluate_and_heal(
+                latest_metrics, service_health(latest_services) if latest_services else {}
+            )
+        
+        # Log en JSON des échéances dont toutes les collectes sont terminées
+        for metrics in settled_metrics(pending_ticks, settled):
             log_metrics_to_json(metrics, json_logger)
-            log_services_to_json(services_status, json_logger)
-            log_alerts_to_json(all_alerts, json_logger)
-            
-            # Affichage des résultats (SEULEMENT ICI pour éviter les doublons)
-            display_system_metrics(metrics)
-            display_services_status(services_status)
-            
-            # Gestion des alertes
-            alerts_display = alert_manager.format_alerts_for_display(all_alerts)
-            print(alerts_display)
-            
-            # Affichage des actions d'auto-réparation
-            if healing_actions:
-                healing_display = display_healing_actions(healing_actions)
-                print(healing_display)
-            
-            print("-" * 60)
-            
-            # Affichage des statistiques occasionnellement
-            if cycle_count % 10 == 0:
-                stats = healing_triggers.get_healing_status()
-                stats_msg = f"Statistiques auto-réparation: {stats['service_stats']['successful_restarts']} services redémarrés, {stats['system_stats']['cleanup_actions']} nettoyages effectués"
-                json_logger.log_system_event('statistics', stats_msg)
-                print(f"📈 {stats_msg}")
+        log_alerts_to_json(all_alerts, json_logger)
+        
+        # Affichage des résultats (SEULEMENT ICI pour éviter les doublons)
+        if latest_metrics:
+            display_system_metrics(latest_metrics)
+        else:
+            print("⏳ Aucune nouvelle mesure système depuis le cycle précédent")
+        if latest_services:
+            display_services_status(latest_services['status'])
+        
+        # Gestion des alertes
+        alerts_display = alert_manager.format_alerts_for_display(all_alerts)
+        print(alerts_display)
+        
+        # Affichage des actions d'auto-réparation
+        if healing_actions:
+            healing_display = display_healing_actions(healing_actions)
+            print(healing_display)
+        
+        print("-" * 60)
+        
+        # Affichage des statistiques occasionnellement
+        if cycle_count % 10 == 0:
+            stats = healing_triggers.get_healing_status()
+            stats_msg = f"Statistiques auto-réparation: {stats['service_stats']['successful_restarts']} services redémarrés, {stats['system_stats']['cleanup_actions']} nettoyages effectués"
+            json_logger.log_system_event('statistics', stats_msg)
+            print(f"📈 {stats_msg}")
             
-            # Attente avant le prochain check
-            time.sleep(MONITORING_INTERVAL)
+            log_stats = json_logger.get_stats()
+            if log_stats['async']:
+                print(f"📝 Journal: {log_stats['pending']} entrées en file, {log_stats['dropped']} rejetées")
+            collector_stats = engine.get_stats()
+            print("⏱️ Collecteurs: " + ", ".join(
+                f"{name} {stats['last_duration_ms']} ms ({stats['errors']} erreurs)"
+                for name, stats in collector_stats.items() if name != 'cycle'
+            ))
+            cycle_stats = collector_stats['cycle']
+            print(f"⏰ Cadence: retard max {cycle_stats['max_lateness_ms']} ms, {cycle_stats['late']} cycles en retard, "
+                  f"{cycle_stats['overruns']} dépassements, {cycle_stats['skipped']} échéances sautées, "
+                  f"{cycle_stats['incomplete']} cycles sans toutes les collectes de l'échéance")
+            if service_watcher is not None:
+                watch_stats = service_watcher.get_stats()
+                print(f"👂 Services: {watch_stats['events']} événements, {watch_stats['transitions']} transitions, "
+                      f"latence max {watch_stats['max_latency_ms']} ms")
+            segment_stats = log_stats.get('segments')
+            if segment_stats and segment_stats['compressed_segments']:
+                print(f"🗜️ Compression: {segment_stats['compressed_segments']} segments, "
+                      f"ratio {segment_stats['compression_ratio']}x, "
+                      f"CPU {segment_stats['compression_cpu_seconds']}s")
+    
+    # Moteur de collecte: chaque vérification tourne à son intervalle, le cycle à MONITORING_INTERVAL
+    collectors = [
+        Collector(name, check, COLLECTOR_INTERVALS.get(name, MONITORING_INTERVAL))
+        for name, check in system_monitor.collectors().items()
+    ]
+    collectors.append(Collector('services', collect_services, COLLECTOR_INTERVALS.get('services', MONITORING_INTERVAL)))
+    engine = CollectionEngine(collectors, align=SCHEDULE_ALIGN, missed=SCHEDULE_MISSED_TICKS)
+    cycle = Collector('cycle', run_cycle, MONITORING_INTERVAL)
+    
+    try:
+        asyncio.run(engine.run(cycle))
             
     except KeyboardInterrupt:
         print("\n🛑 Arrêt du système de surveillance")
@@ -198,6 +470,15 @@ def main():
     except Exception as e:
         print(f"❌ Erreur critique: {e}")
         json_logger.log_system_event('error', f"Erreur critique: {e}")
+    
+    finally:
+        # Échéances en attente et mesures reçues après le dernier cycle: journalisées sans alerte ni réparation
+        system_metrics, service_samples = split_samples(engine.drain_samples(), pending_ticks)
+        for metrics in settled_metrics(pending_ticks):
+            log_metrics_to_json(metrics, json_logger)
+        for services in service_samples:
+            log_services_to_json(services['status'], json_logger, services['states'])
+        shutdown(service_watcher)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,99 @@
+import math
+import time
+
+# Traitement des échéances manquées (exécution plus longue que l'intervalle, machine suspendue)
+MISSED_TICK_POLICIES = ('skip', 'coalesce')
+
+
+class FixedRateSchedule:
+    """
+    Échéances à cadence fixe, sans dérive: la n-ième échéance est origine + n * intervalle,
+    quelle que soit la durée du travail effectué entre deux échéances
+    - attente mesurée sur l'horloge monotone (insensible aux corrections de l'heure système)
+    - échéances alignées sur les multiples de l'intervalle en heure murale (:00, :10, :20...),
+      de sorte que les relevés de plusieurs hôtes tombent sur la même grille
+    - échéances manquées: 'skip' reprend à la prochaine échéance à venir, 'coalesce' exécute
+      une seule fois immédiatement pour toutes les échéances manquées
+    Retard (début effectif - échéance), dépassements et échéances manquées sont comptabilisés
+    """
+
+    def __init__(self, interval, align=True, missed='skip', late_tolerance=0.05,
+                 clock=time.monotonic, wall_clock=time.time):
+        if missed not in MISSED_TICK_POLICIES:
+            raise ValueError(f"Politique d'échéances manquées inconnue: {missed}")
+        self.interval = float(interval)
+        self.align = align
+        self.missed = missed
+        self.late_tolerance = late_tolerance
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.stats = {
+            'ticks': 0, 'late': 0, 'overruns': 0, 'skipped': 0, 'coalesced': 0, 'clock_steps': 0,
+            'last_lateness_ms': None, 'max_lateness_ms': 0.0
+        }
+        self.deadline = None
+        self.tick_started = None
+        self._anchor()
+
+    def _anchor(self):
+        """Première échéance: prochain multiple de l'intervalle en heure murale (ou immédiate)"""
+        now = self.clock()
+        wall = self.wall_clock()
+        self.wall_offset = wall - now
+        if self.align:
+            self.deadline = now + (math.ceil(wall / self.interval) * self.interval - wall)
+        else:
+            self.deadline = now
+
+    def delay(self):
+        """Secondes à attendre avant l'échéance courante (0 si elle est passée)"""
+        return max(0.0, self.deadline - self.clock())
+
+    def tick_time(self):
+        """Heure murale (epoch) de l'échéance courante: horodatage commun à tous les hôtes"""
+        return self.deadline + self.wall_offset
+
+    def start_tick(self):
+        """Début du travail de l'échéance courante; retourne le retard en secondes"""
+        self.tick_started = self.clock()
+        lateness = max(0.0, self.tick_started - self.deadline)
+        lateness_ms = round(lateness * 1000, 2)
+        self.stats['ticks'] += 1
+        self.stats['last_lateness_ms'] = lateness_ms
+        self.stats['max_lateness_ms'] = max(self.stats['max_lateness_ms'], lateness_ms)
+        if lateness > self.late_tolerance:
+            self.stats['late'] += 1
+        return lateness
+
+    def finish_tick(self):
+        """
+        Fin du travail: calcule l'échéance suivante sur la grille
+        Retourne le nombre d'échéances manquées (travail plus long que l'intervalle)
+        """
+        now = self.clock()
+        missed = max(0, math.floor((now - self.deadline) / self.interval))
+        if missed:
+            self.stats['overruns'] += 1
+            if self.missed == 'skip':
+                self.stats['skipped'] += missed
+                self.deadline += (missed + 1) * self.interval
+            else:
+                # Une seule exécution immédiate, sur la dernière échéance manquée, tient lieu de toutes
+                self.stats['coalesced'] += missed - 1
+                self.deadline += missed * self.interval
+        else:
+            self.deadline += self.interval
+
+        # Correction de l'heure murale: suivie si faible (NTP), sinon réalignement de la grille
+        wall_offset = self.wall_clock() - now
+        if abs(wall_offset - self.wall_offset) < self.interval / 2:
+            if self.align:
+                self.deadline -= wall_offset - self.wall_offset
+            self.wall_offset = wall_offset
+        else:
+            self.stats['clock_steps'] += 1
+            self._anchor()
+        return missed
+
+    def get_stats(self):
+        return dict(self.stats)
@@ -1,27 +1,164 @@
 import subprocess
 
+# Propriétés lues par l'appel groupé 'systemctl show' (un bloc par unité, dans l'ordre demandé)
+SHOW_PROPERTIES = ('Id', 'LoadState', 'ActiveState', 'SubState', 'NRestarts', 'MainPID', 'MemoryCurrent')
+
+# États considérés comme actifs (même règle que 'systemctl is-active')
+ACTIVE_STATES = ('active', 'reloading')
+
+# Valeur de MemoryCurrent lorsque la comptabilité mémoire est désactivée (anciennes versions)
+UINT64_MAX = 2 ** 64 - 1
+
+
+def run_command(args, timeout):
+    """Exécute une commande; retourne (code de retour, sortie standard)"""
+    result = subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+    return result.returncode, result.stdout
+
+
+def _int_property(value):
+    """Valeur numérique d'une propriété systemd (None si absente ou non renseignée)"""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return None if number == UINT64_MAX else number
+
+
+def parse_show_output(output):
+    """Découpe la sortie de 'systemctl show' en un dict de propriétés par bloc (ordre conservé)"""
+    blocks = []
+    for chunk in output.strip().split('\n\n'):
+        properties = {}
+        for line in chunk.splitlines():
+            key, separator, value = line.partition('=')
+            if separator:
+                properties[key] = value
+        if properties:
+            blocks.append(properties)
+    return blocks
+
+
+def service_state(properties):
+    """État d'un service à partir des propriétés systemd"""
+    memory = _int_property(properties.get('MemoryCurrent'))
+    main_pid = _int_property(properties.get('MainPID'))
+    active_state = properties.get('ActiveState', 'unknown')
+    return {
+        'active': active_state in ACTIVE_STATES,
+        'unit': properties.get('Id'),
+        'load_state': properties.get('LoadState'),
+        'active_state': active_state,
+        'sub_state': properties.get('SubState'),
+        'n_restarts': _int_property(properties.get('NRestarts')),
+        'main_pid': main_pid or None,
+        'memory_mb': round(memory / (1024 * 1024), 1) if memory is not None else None
+    }
+
+
+class FakeSystemctl:
+    """
+    Double de systemctl pour le développement et les hôtes sans systemd
+    S'utilise comme runner de ServiceMonitor; répond à 'show' et 'is-active'
+    à partir d'états définis par set_state, et conserve les appels reçus
+    """
+
+    def __init__(self, states=None):
+        self.units = {}
+        self.calls = []
+        for unit, active_state in (states or {}).items():
+            self.set_state(unit, active_state)
+
+    def set_state(self, unit, active_state='active', sub_state=None, n_restarts=0, main_pid=None, memory=None):
+        """Définit l'état simulé d'une unité (memory en octets)"""
+        running = active_state in ACTIVE_STATES
+        self.units[unit] = {
+            'Id': unit if '.' in unit else f"{unit}.service",
+            'LoadState': 'loaded',
+            'ActiveState': active_state,
+            'SubState': sub_state or ('running' if running else 'dead'),
+            'NRestarts': str(n_restarts),
+            'MainPID': str(main_pid if main_pid is not None else (1000 + len(self.units) if running else 0)),
+            'MemoryCurrent': str(memory) if memory is not None else '[not set]'
+        }
+
+    def _properties(self, unit):
+        properties = self.units.get(unit)
+        if properties is None:
+            return {'Id': unit if '.' in unit else f"{unit}.service", 'LoadState': 'not-found',
+                    'ActiveState': 'inactive', 'SubState': 'dead', 'NRestarts': '0', 'MainPID': '0',
+                    'MemoryCurrent': '[not set]'}
+        return properties
+
+    def __call__(self, args, timeout):
+        self.calls.append(list(args))
+        command = args[1]
+        units = [arg for arg in args[2:] if not arg.startswith('-')]
+
+        if command == 'is-active':
+            states = [self._properties(unit)['ActiveState'] for unit in units]
+            returncode = 0 if any(state in ACTIVE_STATES for state in states) else 3
+            return returncode, ''.join(f"{state}\n" for state in states)
+
+        if command == 'show':
+            names = SHOW_PROPERTIES
+            for arg in args:
+                if arg.startswith('--property='):
+                    names = arg[len('--property='):].split(',')
+            blocks = []
+            for unit in units:
+                properties = self._properties(unit)
+                blocks.append(''.join(f"{name}={properties[name]}\n" for name in names if name in properties))
+            return 0, '\n'.join(blocks)
+
+        return 1, ''
+
+
 class ServiceMonitor:
-    def __init__(self, services_to_monitor):
+    def __init__(self, services_to_monitor, runner=None, timeout=10):
         self.services = services_to_monitor
-    
+        # Exécution des commandes systemctl: injectable (FakeSystemctl) pour les tests et le développement
+        self.runner = runner or run_command
+        self.timeout = timeout
+        self.last_states = {}
+
     def check_service(self, service_name):
         """Vérifie l'état d'un service systemd"""
         try:
-            result = subprocess.run(
-                ['systemctl', 'is-active', service_name],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return result.returncode == 0
+            returncode, _ = self.runner(['systemctl', 'is-active', service_name], self.timeout)
+            return returncode == 0
         except subprocess.TimeoutExpired:
             return False
         except Exception as e:
             return False
-    
+
+    def check_all_services_details(self):
+        """
+        État détaillé de tous les services configurés, en un seul appel 'systemctl show'
+        (ActiveState, SubState, NRestarts, MainPID, mémoire); repli unité par unité si
+        l'appel groupé échoue (unité invalide, systemctl indisponible)
+        """
+        if not self.services:
+            return {}
+
+        args = ['systemctl', 'show', f"--property={','.join(SHOW_PROPERTIES)}", '--'] + list(self.services)
+        try:
+            returncode, output = self.runner(args, self.timeout)
+            blocks = parse_show_output(output) if returncode == 0 else []
+        except Exception:
+            blocks = []
+
+        if len(blocks) == len(self.services):
+            states = {service: service_state(properties) for service, properties in zip(self.services, blocks)}
+        else:
+            states = {}
+            for service in self.services:
+                active = self.check_service(service)
+                states[service] = service_state({'ActiveState': 'active' if active else 'inactive'})
+
+        self.last_states = states
+        return states
+
     def check_all_services(self):
         """Vérifie tous les services configurés"""
-        results = {}
-        for service in self.services:
-            results[service] = self.check_service(service)
-        return results
\ No newline at end of file
+        return {service: state['active'] for service, state in self.check_all_services_details().items()}
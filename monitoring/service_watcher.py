@@ -0,0 +1,238 @@
+import json
+import queue
+import subprocess
+import threading
+import time
+from monitoring.service_monitor import ACTIVE_STATES
+
+# Messages de systemd (MESSAGE_ID du journal) -> état atteint par l'unité
+UNIT_MESSAGE_STATES = {
+    '7d4958e842da4a758f6c1cdc7b36dcc5': 'activating',    # démarrage en cours
+    '39f53479d3a045ac8e11786248231fbf': 'active',        # démarrée
+    '7b05ebc668384222baa8881179cfda54': 'active',        # rechargée
+    '5eb03494b6584870a536b337290809b3': 'activating',    # redémarrage automatique planifié
+    'de5b426a63be47a7b6ac3eaac82e2f6f': 'deactivating',  # arrêt en cours
+    '9d1aaa27d60140bd96365438aad20286': 'inactive',      # arrêtée
+    '7ad2d189f7e94e70a38c781354912448': 'inactive',      # terminée avec succès (sortie propre, arrêt demandé)
+    'be02cf6855d2428ba40df7e9d022f03d': 'failed',        # échec du démarrage
+    'd9b373ed55a64feb8242e02dbe79a49c': 'failed'         # arrêt sur erreur
+}
+
+# États d'une unité arrêtée (statut 'inactive' du service)
+STOPPED_STATES = ('failed', 'inactive')
+
+# État d'échec: alerte et réparation (comme un arrêt inattendu, voir is_failure)
+DOWN_STATES = ('failed',)
+
+
+def is_failure(previous, state):
+    """
+    Transition nécessitant alerte et réparation: échec, ou arrêt inattendu (unité active devenue
+    inactive sans passer par 'deactivating', donc sans demande d'arrêt)
+    Sortie propre d'une unité oneshot (activating -> inactive) et arrêt demandé
+    (deactivating -> inactive) ne sont pas des pannes
+    """
+    return state in DOWN_STATES or (state == 'inactive' and previous in ACTIVE_STATES)
+
+
+def unit_name(service):
+    """Nom complet de l'unité systemd d'un service (cron -> cron.service)"""
+    return service if '.' in service else f"{service}.service"
+
+
+def parse_journal_entry(line):
+    """
+    Transition d'état d'une unité à partir d'une ligne de 'journalctl -o json'
+    Retourne {'unit', 'active_state', 'timestamp', 'message'} ou None (autre message)
+    """
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    state = UNIT_MESSAGE_STATES.get(entry.get('MESSAGE_ID'))
+    unit = entry.get('UNIT')
+    if state is None or not unit:
+        return None
+    try:
+        timestamp = int(entry['__REALTIME_TIMESTAMP']) / 1e6
+    except (KeyError, TypeError, ValueError):
+        timestamp = time.time()
+    message = entry.get('MESSAGE')
+    return {
+        'unit': unit,
+        'active_state': state,
+        'timestamp': timestamp,
+        'message': message if isinstance(message, str) else ''
+    }
+
+
+class JournalEventSource:
+    """
+    Suit le journal systemd (journalctl -f -o json) restreint aux messages de PID 1
+    concernant les unités surveillées: aucune commande n'est lancée tant qu'aucun service ne change d'état
+    """
+
+    def __init__(self, services, popen=subprocess.Popen, retry_delay=5.0):
+        self.units = [unit_name(service) for service in services]
+        self.popen = popen
+        self.retry_delay = retry_delay
+        self.process = None
+        self.closed = False
+
+    def command(self):
+        """Commande journalctl (plusieurs valeurs d'un même champ: OU logique)"""
+        return (['journalctl', '--follow', '--output=json', '--lines=0', '_PID=1']
+                + [f"UNIT={unit}" for unit in self.units])
+
+    def events(self):
+        """
+        Transitions d'état au fil de l'eau (relance de journalctl s'il s'arrête)
+        Lève OSError si journalctl ne peut pas être lancé ou échoue sans rien lire
+        """
+        while not self.closed:
+            self.process = self.popen(self.command(), stdout=subprocess.PIPE,
+                                      stderr=subprocess.DEVNULL, text=True, bufsize=1)
+
+            received = False
+            for line in self.process.stdout:
+                received = True
+                event = parse_journal_entry(line)
+                if event is not None:
+                    yield event
+
+            if self.closed:
+                return
+            returncode = self.process.wait()
+            if not received and returncode != 0:
+                raise OSError(f"journalctl a échoué (code {returncode})")
+            print(f"⚠️ journalctl interrompu: reprise dans {self.retry_delay}s")
+            time.sleep(self.retry_delay)
+
+    def close(self):
+        self.closed = True
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+
+
+class FakeEventSource:
+    """Source d'événements simulée (tests, hôtes sans systemd): emit() publie une transition"""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def emit(self, service, active_state, message=''):
+        self.queue.put({
+            'unit': unit_name(service),
+            'active_state': active_state,
+            'timestamp': time.time(),
+            'message': message
+        })
+
+    def events(self):
+        while True:
+            event = self.queue.get()
+            if event is None:
+                return
+            yield event
+
+    def close(self):
+        self.queue.put(None)
+
+
+class ServiceWatcher:
+    """
+    Surveillance événementielle des services
+    Les transitions reçues de la source (journal systemd ou source simulée) sont transmises
+    dès leur réception à on_transition(service, état précédent, nouvel état, événement),
+    dans un thread dédié; la scrutation périodique ne sert plus que de resynchronisation
+    Les services en panne (is_failure) sont suivis jusqu'à leur redémarrage ou un arrêt demandé
+    """
+
+    def __init__(self, services, source, on_transition):
+        self.units = {unit_name(service): service for service in services}
+        self.source = source
+        self.on_transition = on_transition
+        self.lock = threading.Lock()
+        self.states = {}
+        self.down = set()
+        self.thread = None
+        self.failed = None
+        self.stats = {'events': 0, 'transitions': 0, 'last_latency_ms': None, 'max_latency_ms': 0.0}
+
+    def seed(self, service_states):
+        """États de référence (ServiceMonitor.check_all_services_details)"""
+        with self.lock:
+            for service, state in service_states.items():
+                active_state = state['active_state']
+                self.states[service] = active_state
+                # Unité inactive à la resynchronisation: panne déjà suivie conservée, sinon arrêt voulu
+                if active_state in DOWN_STATES:
+                    self.down.add(service)
+                elif active_state not in STOPPED_STATES:
+                    self.down.discard(service)
+
+    def statuses(self):
+        """Statut de chaque service connu ({service: bool}, False pour les états STOPPED_STATES)"""
+        with self.lock:
+            return {service: state not in STOPPED_STATES for service, state in self.states.items()}
+
+    def failures(self):
+        """Services en panne (échec ou arrêt inattendu): seuls concernés par alertes et réparation"""
+        with self.lock:
+            return set(self.down)
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name="service-watcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.source.close()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+
+    def is_active(self):
+        """Vrai tant que la source d'événements fonctionne (sinon: scrutation périodique)"""
+        return self.thread is not None and self.failed is None
+
+    def _run(self):
+        try:
+            for event in self.source.events():
+                self.handle(event)
+        except Exception as e:
+            self.failed = e
+            print(f"❌ Suivi événementiel des services indisponible: {e}")
+            print("⚠️ Retour à la scrutation des services à chaque collecte")
+
+    def handle(self, event):
+        """Applique un événement; le gestionnaire n'est appelé que sur un changement d'état"""
+        service = self.units.get(event['unit'])
+        if service is None:
+            return
+        state = event['active_state']
+
+        with self.lock:
+            self.stats['events'] += 1
+            previous = self.states.get(service)
+            if previous == state:
+                return
+            self.states[service] = state
+            if is_failure(previous, state):
+                self.down.add(service)
+            else:
+                self.down.discard(service)
+            self.stats['transitions'] += 1
+            latency = round((time.time() - event['timestamp']) * 1000, 2)
+            self.stats['last_latency_ms'] = latency
+            self.stats['max_latency_ms'] = max(self.stats['max_latency_ms'], latency)
+
+        try:
+            self.on_transition(service, previous, state, event)
+        except Exception as e:
+            print(f"❌ Erreur lors du traitement de la transition de {service}: {e}")
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats)
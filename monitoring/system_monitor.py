@@ -1,14 +1,88 @@
+import time
 import psutil
 from datetime import datetime
 
+# Temps déjà inclus dans user/nice sous Linux: exclus du total pour ne pas les compter deux fois
+CPU_GUEST_FIELDS = ('guest', 'guest_nice')
+
+# Temps d'inactivité (le reste est compté comme occupé)
+CPU_IDLE_FIELDS = ('idle', 'iowait')
+
+# Répartition publiée (champs présents selon la plateforme)
+CPU_BREAKDOWN_FIELDS = ('user', 'nice', 'system', 'iowait', 'irq', 'softirq', 'steal')
+
+# Écart minimal entre deux relevés pour un pourcentage significatif (premier relevé uniquement)
+MIN_CPU_SAMPLE_SECONDS = 0.1
+
+
+def cpu_usage(previous, current):
+    """
+    Utilisation entre deux relevés de psutil.cpu_times (un cœur ou l'ensemble)
+    Retourne {'percent': occupé en %, <champ>: part du temps en %} ou None si aucun temps écoulé
+    """
+    deltas = {
+        field: max(getattr(current, field) - getattr(previous, field), 0.0)
+        for field in current._fields if field not in CPU_GUEST_FIELDS
+    }
+    total = sum(deltas.values())
+    if total <= 0:
+        return None
+    idle = sum(deltas.get(field, 0.0) for field in CPU_IDLE_FIELDS)
+    usage = {'percent': round(100.0 * (total - idle) / total, 1)}
+    for field in CPU_BREAKDOWN_FIELDS:
+        if field in deltas:
+            usage[field] = round(100.0 * deltas[field] / total, 1)
+    return usage
+
+
+def sum_cpu_times(per_core):
+    """Temps cumulés de tous les cœurs (même type que les relevés par cœur)"""
+    first = per_core[0]
+    return type(first)(*(sum(times[i] for times in per_core) for i in range(len(first))))
+
+
 class SystemMonitor:
     def __init__(self):
         self.last_network_io = psutil.net_io_counters()
         self.last_check = datetime.now()
+        self.last_cpu_times = psutil.cpu_times(percpu=True)
+        self.last_cpu_sample = time.monotonic()
+        self.last_cpu_usage = None
     
     def check_cpu(self):
-        """Vérifie l'utilisation du CPU"""
-        return psutil.cpu_percent(interval=1)
+        """Vérifie l'utilisation du CPU (pourcentage global, sans attente)"""
+        return self.check_cpu_details()['percent']
+    
+    def check_cpu_details(self):
+        """
+        Utilisation du CPU depuis le relevé précédent, calculée sur les compteurs cumulés du noyau
+        Retourne le pourcentage global, la répartition (user/system/iowait/steal...) et le
+        pourcentage de chaque cœur; aucun blocage, hormis une courte attente au tout premier relevé
+        """
+        elapsed = time.monotonic() - self.last_cpu_sample
+        if self.last_cpu_usage is None and elapsed < MIN_CPU_SAMPLE_SECONDS:
+            time.sleep(MIN_CPU_SAMPLE_SECONDS - elapsed)
+        
+        current = psutil.cpu_times(percpu=True)
+        previous = self.last_cpu_times
+        self.last_cpu_times = current
+        self.last_cpu_sample = time.monotonic()
+        
+        if len(current) != len(previous):
+            # Cœurs ajoutés ou retirés: nouveau relevé de référence, dernières valeurs conservées
+            return self.last_cpu_usage or {'percent': 0.0, 'per_core': []}
+        
+        usage = cpu_usage(sum_cpu_times(previous), sum_cpu_times(current))
+        if usage is None:
+            # Deux relevés trop rapprochés: aucune évolution mesurable
+            return self.last_cpu_usage or {'percent': 0.0, 'per_core': []}
+        
+        usage['per_core'] = [
+            (core_usage or {'percent': 0.0})['percent']
+            for core_usage in map(cpu_usage, previous, current)
+        ]
+        self.last_cpu_usage = usage
+        return usage
     
     def check_memory(self):
         """Vérifie l'utilisation de la mémoire"""
@@ -39,12 +113,41 @@ class SystemMonitor:
             'bytes_recv': current_io.bytes_recv
         }
     
+    def collectors(self):
+        """Vérifications indépendantes, par nom (moteur de collecte: un intervalle pour chacune)"""
+        return {
+            'cpu': self.check_cpu_details,
+            'memory': self.check_memory,
+            'disk': self.check_disk,
+            'network': self.check_network
+        }
+
+    @staticmethod
+    def assemble_metrics(results, tick=None, collected_at=None):
+        """
+        Métriques système à partir des résultats de tout ou partie des vérifications
+        tick: échéance de collecte commune à ces résultats (epoch), sinon heure courante
+        collected_at: fin de chaque vérification (epoch), conservée dans 'collected_at'
+        Seules les métriques présentes dans results figurent dans le dict retourné
+        """
+        moment = datetime.now() if tick is None else datetime.fromtimestamp(tick)
+        metrics = {'timestamp': moment.strftime("%Y-%m-%d %H:%M:%S")}
+        if tick is not None:
+            metrics['tick'] = tick
+        cpu = results.get('cpu')
+        if cpu is not None:
+            metrics['cpu'] = cpu['percent']
+            metrics['cpu_details'] = cpu
+        for name in ('memory', 'disk', 'network'):
+            if name in results:
+                metrics[name] = results[name]
+        if collected_at:
+            metrics['collected_at'] = {
+                name: datetime.fromtimestamp(when).isoformat(timespec='milliseconds')
+                for name, when in collected_at.items()
+            }
+        return metrics
+
     def check_all_metrics(self):
         """Vérifie toutes les métriques système"""
-        return {
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'cpu': self.check_cpu(),
-            'memory': self.check_memory(),
-            'disk': self.check_disk(),
-            'network': self.check_network()
-        }
\ No newline at end of file
+        return self.assemble_metrics({name: check() for name, check in self.collectors().items()})
\ No newline at end of file
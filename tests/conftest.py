@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Racine du dépôt importable sans installation (modules lancés depuis la racine, comme main.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from utils import migrate_log
+from utils.log_reader import load_log_records
+from utils.metric_store import MetricStore
+
+
+def system_metric(timestamp, cpu):
+    return {
+        'timestamp': timestamp,
+        'event_type': 'metric',
+        'metric_type': 'system',
+        'values': {
+            'cpu_percent': cpu, 'memory_percent': 40.0, 'disk_percent': 60.0,
+            'network_sent_mb': 1.0, 'network_recv_mb': 2.0, 'total_network_mb': 3.0
+        },
+        'metadata': {'timestamp': timestamp[:19].replace('T', ' ')}
+    }
+
+
+# Ancien log: entrées sur deux jours (deux segments quotidiens)
+LEGACY_RECORDS = [
+    system_metric('2024-03-01T23:59:00', 10.0),
+    {
+        'timestamp': '2024-03-01T23:59:30', 'event_type': 'alert', 'alert_type': 'high_cpu',
+        'severity': 'CRITIQUE', 'message': 'CRITIQUE - CPU élevé: 95.0% (seuil: 80%)',
+        'details': {'value': 95.0, 'threshold': 80}
+    },
+    system_metric('2024-03-02T00:00:00', 20.0),
+    {
+        'timestamp': '2024-03-02T00:00:10', 'event_type': 'action', 'action_type': 'restart_service',
+        'status': 'success', 'service': 'nginx', 'message': 'Service redémarré', 'details': {}
+    },
+    system_metric('2024-03-02T00:01:00', 30.0),
+]
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    """Migration isolée dans tmp_path: magasin de métriques seul, log segmenté par jour"""
+    monkeypatch.setattr(migrate_log, 'METRIC_STORE_ENABLED', True)
+    monkeypatch.setattr(migrate_log, 'METRIC_STORE_PATH', str(tmp_path / 'metrics'))
+    monkeypatch.setattr(migrate_log, 'ROLLUPS_ENABLED', False)
+    monkeypatch.setattr(migrate_log, 'LOG_SQLITE_ENABLED', False)
+    monkeypatch.setattr(migrate_log, 'EVENT_COUNTERS_ENABLED', False)
+    monkeypatch.setattr(migrate_log, 'LOG_SEGMENT_PERIOD', 'daily')
+    monkeypatch.setattr(migrate_log, 'LOG_FSYNC', 'never')
+    return tmp_path
+
+
+def write_legacy_log(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+
+
+def test_round_trip_preserves_every_record(stores):
+    source = stores / 'monitoring.json'
+    dest = stores / 'monitoring.jsonl'
+    write_legacy_log(source, LEGACY_RECORDS)
+
+    count = migrate_log.migrate(str(source), str(dest), batch_size=2)
+
+    assert count == len(LEGACY_RECORDS)
+    assert load_log_records(str(dest)) == LEGACY_RECORDS
+    assert load_log_records(str(dest), start='2024-03-02T00:00:00') == LEGACY_RECORDS[2:]
+
+
+def test_round_trip_feeds_the_metric_store(stores):
+    source = stores / 'monitoring.json'
+    write_legacy_log(source, LEGACY_RECORDS)
+
+    migrate_log.migrate(str(source), str(stores / 'monitoring.jsonl'), batch_size=2)
+
+    store = MetricStore(str(stores / 'metrics'))
+    columns = store.read_range()
+    assert list(columns['cpu_percent']) == [10.0, 20.0, 30.0]
+    assert store.is_sorted()
+
+
+def test_rejects_a_source_that_is_not_an_array(stores):
+    source = stores / 'monitoring.jsonl'
+    source.write_text(json.dumps(LEGACY_RECORDS[0]) + '\n', encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        migrate_log.migrate(str(source), str(stores / 'dest.jsonl'))
+
+
+def test_existing_store_requires_rebuild(stores):
+    store = MetricStore(str(stores / 'metrics'))
+    store.append('2024-03-03T00:00:00', {'cpu_percent': 50.0})
+    store.flush()
+    source = stores / 'monitoring.json'
+    write_legacy_log(source, LEGACY_RECORDS)
+
+    with pytest.raises(ValueError):
+        migrate_log.migrate(str(source), str(stores / 'monitoring.jsonl'))
+
+    migrate_log.migrate(str(source), str(stores / 'monitoring.jsonl'), rebuild_stores=True)
+
+    merged = MetricStore(str(stores / 'metrics'))
+    assert list(merged.read_range()['cpu_percent']) == [10.0, 20.0, 30.0, 50.0]
+    assert merged.is_sorted()
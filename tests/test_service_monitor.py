@@ -0,0 +1,100 @@
+from monitoring.service_monitor import FakeSystemctl, ServiceMonitor, parse_show_output, service_state
+
+
+class FailingShow(FakeSystemctl):
+    """systemctl dont l'appel groupé 'show' échoue (unité invalide): repli sur is-active"""
+
+    def __call__(self, args, timeout):
+        if args[1] == 'show':
+            self.calls.append(list(args))
+            return 1, ''
+        return FakeSystemctl.__call__(self, args, timeout)
+
+
+def test_details_use_one_batched_show_call():
+    systemctl = FakeSystemctl({'nginx': 'active', 'cron': 'failed'})
+    monitor = ServiceMonitor(['nginx', 'cron'], runner=systemctl)
+
+    states = monitor.check_all_services_details()
+
+    assert len(systemctl.calls) == 1
+    assert systemctl.calls[0][:2] == ['systemctl', 'show']
+    assert states['nginx']['active'] is True
+    assert states['nginx']['unit'] == 'nginx.service'
+    assert states['nginx']['sub_state'] == 'running'
+    assert states['nginx']['main_pid'] is not None
+    assert states['cron']['active'] is False
+    assert states['cron']['active_state'] == 'failed'
+    assert states['cron']['main_pid'] is None
+    assert monitor.last_states == states
+
+
+def test_details_parse_numeric_properties():
+    systemctl = FakeSystemctl()
+    systemctl.set_state('nginx', 'active', n_restarts=3, main_pid=4242, memory=50 * 1024 * 1024)
+    systemctl.set_state('cron', 'active')
+    monitor = ServiceMonitor(['nginx', 'cron'], runner=systemctl)
+
+    states = monitor.check_all_services_details()
+
+    assert states['nginx']['n_restarts'] == 3
+    assert states['nginx']['main_pid'] == 4242
+    assert states['nginx']['memory_mb'] == 50.0
+    # Comptabilité mémoire désactivée: '[not set]'
+    assert states['cron']['memory_mb'] is None
+
+
+def test_unknown_unit_is_reported_inactive():
+    systemctl = FakeSystemctl({'nginx': 'active'})
+    monitor = ServiceMonitor(['nginx', 'missing'], runner=systemctl)
+
+    states = monitor.check_all_services_details()
+
+    assert len(systemctl.calls) == 1
+    assert states['missing']['load_state'] == 'not-found'
+    assert states['missing']['active'] is False
+
+
+def test_falls_back_to_is_active_when_show_fails():
+    systemctl = FailingShow({'nginx': 'active', 'cron': 'inactive'})
+    monitor = ServiceMonitor(['nginx', 'cron'], runner=systemctl)
+
+    states = monitor.check_all_services_details()
+
+    assert [call[1] for call in systemctl.calls] == ['show', 'is-active', 'is-active']
+    assert states['nginx']['active'] is True
+    assert states['nginx']['active_state'] == 'active'
+    assert states['cron']['active'] is False
+
+
+def test_falls_back_when_runner_raises():
+    def runner(args, timeout):
+        raise FileNotFoundError('systemctl')
+
+    monitor = ServiceMonitor(['nginx'], runner=runner)
+
+    assert monitor.check_all_services() == {'nginx': False}
+
+
+def test_check_all_services_returns_statuses():
+    systemctl = FakeSystemctl({'nginx': 'active', 'cron': 'reloading', 'ssh': 'inactive'})
+    monitor = ServiceMonitor(['nginx', 'cron', 'ssh'], runner=systemctl)
+
+    assert monitor.check_all_services() == {'nginx': True, 'cron': True, 'ssh': False}
+
+
+def test_no_service_runs_no_command():
+    systemctl = FakeSystemctl()
+    monitor = ServiceMonitor([], runner=systemctl)
+
+    assert monitor.check_all_services_details() == {}
+    assert systemctl.calls == []
+
+
+def test_parse_show_output_keeps_block_order():
+    output = "Id=a.service\nActiveState=active\n\nId=b.service\nActiveState=failed\n"
+
+    blocks = parse_show_output(output)
+
+    assert [block['Id'] for block in blocks] == ['a.service', 'b.service']
+    assert service_state(blocks[1])['active'] is False
@@ -0,0 +1,160 @@
+import json
+import queue
+
+import pytest
+
+from monitoring.service_watcher import FakeEventSource, ServiceWatcher, is_failure, parse_journal_entry
+
+# Délai maximal d'attente d'une transition traitée par le thread du watcher (secondes)
+TIMEOUT = 2.0
+
+
+class BrokenSource:
+    """Source d'événements indisponible (journalctl absent)"""
+
+    def events(self):
+        raise OSError("journalctl introuvable")
+        yield
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def watcher():
+    transitions = queue.Queue()
+    source = FakeEventSource()
+    watcher = ServiceWatcher(
+        ['nginx', 'cron'], source,
+        lambda service, previous, state, event: transitions.put((service, previous, state))
+    )
+    watcher.seed({'nginx': {'active_state': 'active'}, 'cron': {'active_state': 'active'}})
+    watcher.start()
+    yield watcher, source, transitions
+    watcher.stop()
+
+
+@pytest.mark.parametrize('previous, state, expected', [
+    ('active', 'failed', True),
+    ('activating', 'failed', True),
+    ('active', 'inactive', True),            # arrêt inattendu (sans 'deactivating')
+    ('deactivating', 'inactive', False),     # arrêt demandé
+    ('activating', 'inactive', False),       # sortie propre d'une unité oneshot
+    ('inactive', 'active', False),
+    (None, 'active', False),
+])
+def test_is_failure(previous, state, expected):
+    assert is_failure(previous, state) is expected
+
+
+def test_parse_journal_entry():
+    line = json.dumps({
+        'MESSAGE_ID': 'be02cf6855d2428ba40df7e9d022f03d',
+        'UNIT': 'nginx.service',
+        '__REALTIME_TIMESTAMP': '1700000000000000',
+        'MESSAGE': 'nginx.service: Failed with result exit-code.'
+    })
+
+    event = parse_journal_entry(line)
+
+    assert event['unit'] == 'nginx.service'
+    assert event['active_state'] == 'failed'
+    assert event['timestamp'] == 1700000000.0
+
+
+def test_parse_journal_entry_ignores_other_messages():
+    assert parse_journal_entry(json.dumps({'MESSAGE_ID': 'autre', 'UNIT': 'nginx.service'})) is None
+    assert parse_journal_entry('{"MESSAGE_ID": ') is None
+
+
+def test_failure_is_reported_and_cleared_on_restart(watcher):
+    watcher, source, transitions = watcher
+
+    source.emit('nginx', 'failed')
+    assert transitions.get(timeout=TIMEOUT) == ('nginx', 'active', 'failed')
+    assert watcher.failures() == {'nginx'}
+    assert watcher.statuses() == {'nginx': False, 'cron': True}
+
+    source.emit('nginx', 'activating')
+    source.emit('nginx', 'active')
+    assert transitions.get(timeout=TIMEOUT) == ('nginx', 'failed', 'activating')
+    assert transitions.get(timeout=TIMEOUT) == ('nginx', 'activating', 'active')
+    assert watcher.failures() == set()
+    assert watcher.statuses()['nginx'] is True
+
+
+def test_requested_stop_is_not_a_failure(watcher):
+    watcher, source, transitions = watcher
+
+    source.emit('cron', 'deactivating')
+    source.emit('cron', 'inactive')
+    assert transitions.get(timeout=TIMEOUT) == ('cron', 'active', 'deactivating')
+    assert transitions.get(timeout=TIMEOUT) == ('cron', 'deactivating', 'inactive')
+    assert watcher.failures() == set()
+    assert watcher.statuses()['cron'] is False
+
+
+def test_unexpected_deactivation_is_a_failure(watcher):
+    watcher, source, transitions = watcher
+
+    source.emit('cron', 'inactive')
+    assert transitions.get(timeout=TIMEOUT) == ('cron', 'active', 'inactive')
+    assert watcher.failures() == {'cron'}
+
+
+def test_repeated_state_and_unknown_unit_call_no_handler(watcher):
+    watcher, source, transitions = watcher
+
+    source.emit('nginx', 'active')
+    source.emit('ssh', 'failed')
+    source.emit('cron', 'failed')
+    # Les événements sont traités dans l'ordre: seule la dernière transition est transmise
+    assert transitions.get(timeout=TIMEOUT) == ('cron', 'active', 'failed')
+    assert transitions.empty()
+    stats = watcher.get_stats()
+    assert stats['events'] == 2
+    assert stats['transitions'] == 1
+
+
+def test_handler_error_does_not_stop_the_watcher():
+    transitions = queue.Queue()
+
+    def on_transition(service, previous, state, event):
+        transitions.put(state)
+        if state == 'failed':
+            raise RuntimeError("gestionnaire en erreur")
+
+    source = FakeEventSource()
+    watcher = ServiceWatcher(['nginx'], source, on_transition)
+    watcher.seed({'nginx': {'active_state': 'active'}})
+    watcher.start()
+    try:
+        source.emit('nginx', 'failed')
+        source.emit('nginx', 'active')
+        assert transitions.get(timeout=TIMEOUT) == 'failed'
+        assert transitions.get(timeout=TIMEOUT) == 'active'
+        assert watcher.is_active()
+    finally:
+        watcher.stop()
+
+
+def test_seed_keeps_tracked_failure_until_restart():
+    watcher = ServiceWatcher(['nginx'], FakeEventSource(), lambda *args: None)
+    watcher.handle({'unit': 'nginx.service', 'active_state': 'failed', 'timestamp': 0.0, 'message': ''})
+    assert watcher.failures() == {'nginx'}
+
+    # Resynchronisation: l'unité en échec est devenue 'inactive' (reset-failed), panne conservée
+    watcher.seed({'nginx': {'active_state': 'inactive'}})
+    assert watcher.failures() == {'nginx'}
+
+    watcher.seed({'nginx': {'active_state': 'active'}})
+    assert watcher.failures() == set()
+
+
+def test_unavailable_source_falls_back_to_polling():
+    watcher = ServiceWatcher(['nginx'], BrokenSource(), lambda *args: None)
+    watcher.start()
+    watcher.thread.join(timeout=TIMEOUT)
+
+    assert isinstance(watcher.failed, OSError)
+    assert not watcher.is_active()
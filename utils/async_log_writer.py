@@ -0,0 +1,112 @@
+import queue
+import threading
+import time
+
+
+class AsyncLogWriter:
+    """
+    Écrivain asynchrone pour le logger JSON
+    Les entrées sont placées dans une file bornée puis écrites par lots
+    par un thread dédié (seuil de taille ou de temps)
+    """
+
+    def __init__(self, write_batch, max_queue_size=10000, batch_size=200, flush_interval=1.0):
+        self.write_batch = write_batch
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.stats_lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.errors = 0
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="async-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record):
+        """
+        Ajoute une entrée dans la file sans jamais bloquer l'appelant
+        Retourne False si la file est pleine (entrée rejetée)
+        """
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.stats_lock:
+                self.dropped += 1
+            return False
+
+        with self.stats_lock:
+            self.enqueued += 1
+        return True
+
+    def _next_batch(self):
+        """Attend la première entrée puis accumule jusqu'au seuil de taille ou de temps"""
+        try:
+            batch = [self.queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0 and not self._stop_event.is_set():
+                    batch.append(self.queue.get(timeout=remaining))
+                else:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        """Écrit un lot et met à jour les compteurs"""
+        try:
+            self.write_batch(batch)
+            with self.stats_lock:
+                self.written += len(batch)
+                self.batches += 1
+        except Exception as e:
+            with self.stats_lock:
+                self.errors += 1
+            print(f"Error writing log batch: {e}")
+        finally:
+            for _ in batch:
+                self.queue.task_done()
+
+    def _run(self):
+        """Boucle du thread d'écriture"""
+        while not self._stop_event.is_set():
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+        # Vidage final après la demande d'arrêt
+        while True:
+            batch = self._next_batch() if not self.queue.empty() else []
+            if not batch:
+                break
+            self._write(batch)
+
+    def flush(self):
+        """Bloque jusqu'à ce que toutes les entrées en file soient écrites"""
+        if self._thread.is_alive():
+            self.queue.join()
+
+    def close(self, timeout=10.0):
+        """Vide la file puis arrête le thread d'écriture"""
+        self._stop_event.set()
+        self._thread.join(timeout)
+
+    def get_stats(self):
+        """Retourne les compteurs de l'écrivain"""
+        with self.stats_lock:
+            return {
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'pending': self.queue.qsize(),
+                'batches': self.batches,
+                'errors': self.errors
+            }
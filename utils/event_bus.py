@@ -0,0 +1,77 @@
+import queue
+import threading
+
+
+class Subscription:
+    """
+    Abonnement au bus d'événements: file bornée propre à chaque abonné
+    Si l'abonné prend trop de retard, les entrées sont abandonnées et overflowed est levé
+    (l'abonné doit alors se resynchroniser depuis le log)
+    """
+
+    def __init__(self, bus, max_pending=10000):
+        self.bus = bus
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.overflowed = False
+        self.dropped = 0
+
+    def put(self, records):
+        try:
+            self.queue.put_nowait(records)
+        except queue.Full:
+            self.overflowed = True
+            self.dropped += len(records)
+
+    def get(self, timeout=None):
+        """Attend le prochain lot puis retourne toutes les entrées en attente ([] si délai dépassé)"""
+        try:
+            records = list(self.queue.get(timeout=timeout))
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                records.extend(self.queue.get_nowait())
+            except queue.Empty:
+                return records
+
+    def clear(self):
+        """Vide la file et réarme l'indicateur de débordement"""
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+        self.overflowed = False
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """
+    Canal publication/abonnement en mémoire entre la surveillance et le tableau de bord
+    (même processus); publish ne bloque jamais le producteur
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = []
+
+    def subscribe(self, max_pending=10000):
+        subscription = Subscription(self, max_pending)
+        with self.lock:
+            self.subscriptions = self.subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions = [s for s in self.subscriptions if s is not subscription]
+
+    def publish(self, records):
+        """Diffuse un lot d'entrées à tous les abonnés (sans effet s'il n'y en a aucun)"""
+        for subscription in self.subscriptions:
+            subscription.put(records)
+
+
+# Bus partagé par les composants d'un même processus (main.py)
+event_bus = EventBus()
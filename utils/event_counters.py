@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from utils.rollups import bucket_start
+from utils.sqlite_event_store import SUBTYPE_FIELDS
+
+# Types d'événements comptés (les événements système, un par cycle, n'alimentent aucun graphique)
+COUNTED_EVENT_TYPES = ('alert', 'action')
+
+# Dimensions d'une cellule de comptage, après le type d'événement
+COUNTER_DIMENSIONS = ('type', 'service', 'severity', 'status')
+
+
+def counters_path(log_file):
+    """Chemin du fichier des compteurs associé à un log"""
+    base, _ = os.path.splitext(log_file)
+    return base + '.counters.json'
+
+
+def event_cell(record):
+    """Cellule (event_type, type, service, severity, status) d'une alerte ou action; None sinon"""
+    event_type = record.get('event_type')
+    if event_type not in COUNTED_EVENT_TYPES:
+        return None
+    field = SUBTYPE_FIELDS[event_type]
+    details = record.get('details') or {}
+    return (
+        event_type,
+        record.get(field),
+        record.get('service') or details.get('service'),
+        record.get('severity'),
+        record.get('status')
+    )
+
+
+class EventCounters:
+    """
+    Compteurs d'événements (alertes, actions) maintenus à l'écriture
+    - totaux par cellule (type d'événement, sous-type, service, gravité, statut)
+    - mêmes compteurs par intervalle de temps (1h par défaut) pour les vues par fenêtre
+    Persistés à côté du log (<log>.counters.json): un graphique lit O(#catégories) valeurs
+    au lieu de parcourir tout l'historique
+    """
+
+    def __init__(self, path=None, bucket_seconds=3600, retention_days=30, persist_interval=2.0):
+        self.path = path
+        self.bucket_seconds = bucket_seconds
+        self.retention_days = retention_days
+        self.persist_interval = persist_interval
+        self.lock = threading.Lock()
+        self.totals = {}
+        self.buckets = {}
+        self.dirty = False
+        self._last_persist = time.monotonic()
+
+    def add(self, record):
+        """Compte un événement (sans effet pour les métriques et les événements système)"""
+        cell = event_cell(record)
+        if cell is None:
+            return
+        key = bucket_start(record['timestamp'], self.bucket_seconds).isoformat()
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = {}
+            self._prune(key)
+        self.totals[cell] = self.totals.get(cell, 0) + 1
+        bucket[cell] = bucket.get(cell, 0) + 1
+        self.dirty = True
+
+    def _prune(self, newest):
+        """Supprime les intervalles plus anciens que la rétention"""
+        if not self.retention_days:
+            return
+        cutoff = (datetime.fromisoformat(newest) - timedelta(days=self.retention_days)).isoformat()
+        for key in [key for key in self.buckets if key < cutoff]:
+            del self.buckets[key]
+
+    def ingest(self, records):
+        """Observateur du logger: compte les événements d'un lot, persistance au plus tous les persist_interval"""
+        with self.lock:
+            for record in records:
+                self.add(record)
+            if self.path and self.dirty and time.monotonic() - self._last_persist >= self.persist_interval:
+                self._save()
+
+    def counts(self, event_type, by, since=None, where=None):
+        """
+        Nombre d'événements d'un type regroupés selon des dimensions (ex: ('service',))
+        since: timestamp ISO; seuls les intervalles à partir de celui qui le contient sont comptés
+        where: filtres d'égalité {dimension: valeur}
+        Retourne {tuple des valeurs des dimensions: nombre}
+        """
+        positions = [COUNTER_DIMENSIONS.index(name) + 1 for name in by]
+        filters = [(COUNTER_DIMENSIONS.index(name) + 1, value) for name, value in (where or {}).items()]
+
+        with self.lock:
+            if since is None:
+                sources = [self.totals]
+            else:
+                first = bucket_start(since, self.bucket_seconds).isoformat()
+                sources = [bucket for key, bucket in self.buckets.items() if key >= first]
+
+            result = {}
+            for cells in sources:
+                for cell, count in cells.items():
+                    if cell[0] != event_type:
+                        continue
+                    if any(cell[position] != value for position, value in filters):
+                        continue
+                    group = tuple(cell[position] for position in positions)
+                    result[group] = result.get(group, 0) + count
+        return result
+
+    def total(self, event_type, since=None):
+        """Nombre total d'événements d'un type (depuis un timestamp ISO optionnel)"""
+        return self.counts(event_type, (), since).get((), 0)
+
+    def copy(self):
+        """Copie figée des compteurs, prise sous verrou (sans fichier associé)"""
+        with self.lock:
+            counters = EventCounters(None, self.bucket_seconds, self.retention_days)
+            counters.totals = dict(self.totals)
+            counters.buckets = {key: dict(cells) for key, cells in self.buckets.items()}
+        return counters
+
+    def reset(self):
+        """Remet les compteurs à zéro"""
+        with self.lock:
+            self.totals = {}
+            self.buckets = {}
+            self.dirty = True
+
+    def _save(self):
+        """Écrit les compteurs (remplacement atomique, appelé sous verrou)"""
+        data = {
+            'bucket_seconds': self.bucket_seconds,
+            'totals': [list(cell) + [count] for cell, count in self.totals.items()],
+            'buckets': {
+                key: [list(cell) + [count] for cell, count in cells.items()]
+                for key, cells in self.buckets.items()
+            }
+        }
+        tmp_file = self.path + '.tmp'
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_file, self.path)
+        except OSError as e:
+            print(f"Error writing event counters: {e}")
+            return
+        self.dirty = False
+        self._last_persist = time.monotonic()
+
+    def save(self):
+        """Persiste les compteurs s'ils ont changé"""
+        with self.lock:
+            if self.path and self.dirty:
+                self._save()
+
+    def close(self):
+        self.save()
+
+    def rebuild(self, records):
+        """Recalcule les compteurs depuis des entrées existantes (log antérieur aux compteurs)"""
+        with self.lock:
+            self.totals = {}
+            self.buckets = {}
+            for record in records:
+                self.add(record)
+            if self.path:
+                self._save()
+
+    @classmethod
+    def load(cls, path, **options):
+        """Charge des compteurs persistés (None si le fichier est absent ou illisible)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        counters = cls(path, bucket_seconds=data.get('bucket_seconds', 3600), **options)
+        # Cellules d'autres types (événements système des fichiers antérieurs) ignorées
+        counters.totals = {tuple(row[:-1]): row[-1] for row in data.get('totals', [])
+                           if row[0] in COUNTED_EVENT_TYPES}
+        counters.buckets = {
+            key: {tuple(row[:-1]): row[-1] for row in rows if row[0] in COUNTED_EVENT_TYPES}
+            for key, rows in data.get('buckets', {}).items()
+        }
+        return counters
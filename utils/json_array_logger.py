@@ -1,37 +1,75 @@
+import itertools
 import json
 import os
-import re
-from datetime import datetime
+import time
 from threading import Lock
+from utils.log_reader import detect_log_format
+from utils.async_log_writer import AsyncLogWriter
+from utils.log_segments import SEGMENT_PERIODS, SegmentManager, RetentionWorker
+from utils.log_index import LogIndexWriter
+from utils.log_records import (
+    MetricRecord, AlertRecord, ActionRecord, SystemRecord,
+    remove_emojis, serialize_record, record_to_dict
+)
+
+FSYNC_POLICIES = ('never', 'always', 'interval')
 
 class JSONArrayLogger:
-    """Logger simple pour tableau JSON avec verrouillage"""
+    """
+    Logger JSON avec verrouillage
+    - 'jsonl': ajout en fin de fichier, une entrée par ligne (coût constant par écriture)
+    - 'array': ancien format, tableau JSON réécrit à chaque entrée
+    En mode asynchrone, les écritures sont déléguées à un thread par lots
+    En mode segmenté ('hourly'/'daily'), le format 'jsonl' est découpé en fichiers
+    par période, référencés dans un manifeste, avec rétention en arrière-plan
+    Le format 'jsonl' maintient un index annexe (offsets par minute et par type d'entrée)
+    Les méthodes log_* construisent des entrées typées (utils.log_records), sérialisées à l'écriture
+    """
     
-    def __init__(self, log_file="logs/monitoring.json"):
+    def __init__(self, log_file="logs/monitoring.jsonl", log_format="jsonl",
+                 fsync_policy="interval", fsync_interval=5.0, async_mode=False,
+                 queue_size=10000, batch_size=200, flush_interval=1.0,
+                 segment_period=None, retention_days=0, retention_max_bytes=0,
+                 retention_interval=300, compression='none'):
         self.log_file = log_file
         self.lock = Lock()
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        self.fsync_policy = fsync_policy if fsync_policy in FSYNC_POLICIES else 'interval'
+        self.fsync_interval = fsync_interval
+        self._last_fsync = time.monotonic()
+        self._file = None
+        self._file_key = None
+        self._file_offset = 0
+        self.observers = []
+        self.listeners = []
+        os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+        
+        existing_format = detect_log_format(log_file)
+        if log_format == 'jsonl' and existing_format == 'array':
+            # On ne mélange jamais les deux formats dans un même fichier
+            print(f"⚠️ {log_file} est au format tableau JSON: format 'array' conservé")
+            log_format = 'array'
+        self.log_format = log_format
         
-        if not os.path.exists(log_file) or os.path.getsize(log_file) == 0:
+        if self.log_format == 'array' and existing_format is None:
             with open(log_file, 'w', encoding='utf-8') as f:
                 json.dump([], f, indent=2, ensure_ascii=False)
+        
+        self.index = LogIndexWriter(log_file) if self.log_format == 'jsonl' else None
+        self.segments = None
+        self.retention_worker = None
+        if self.log_format == 'jsonl' and segment_period in SEGMENT_PERIODS:
+            self.segments = SegmentManager(log_file, segment_period)
+            self.retention_worker = RetentionWorker(
+                self.segments, retention_days, retention_max_bytes, retention_interval, compression
+            )
+        
+        self.writer = None
+        if async_mode:
+            self.writer = AsyncLogWriter(self._write_records, queue_size, batch_size, flush_interval)
     
     def _remove_emojis(self, text):
         """Supprime les emojis d'un texte"""
-        if not isinstance(text, str):
-            return text
-        
-        emoji_pattern = re.compile(
-            "["
-            u"\U0001F600-\U0001F64F"
-            u"\U0001F300-\U0001F5FF"
-            u"\U0001F680-\U0001F6FF"
-            u"\U0001F1E0-\U0001F1FF"
-            u"\U00002702-\U000027B0"
-            u"\U000024C2-\U0001F251"
-            "]+", flags=re.UNICODE
-        )
-        return emoji_pattern.sub(r'', text)
+        return remove_emojis(text)
     
     def _clean_log_data(self, log_data):
         """Nettoie les emojis des données de log"""
@@ -49,9 +87,153 @@ class JSONArrayLogger:
             return log_data
     
     def _append_log(self, log_data):
-        """Ajoute une entrée au tableau JSON (sans emojis)"""
-        cleaned_log_data = self._clean_log_data(log_data)
+        """Ajoute une entrée dict au log (sans emojis)"""
+        self._append_record(self._clean_log_data(log_data))
+    
+    def _append_record(self, record):
+        """Ajoute une entrée déjà nettoyée (typée ou dict)"""
+        for listener in self.listeners:
+            try:
+                listener([record])
+            except Exception as e:
+                print(f"Error in log listener: {e}")
+        
+        if self.writer is not None:
+            self.writer.submit(record)
+        else:
+            try:
+                self._write_records([record])
+            except Exception as e:
+                print(f"Error writing to JSON log: {e}")
+    
+    def _write_records(self, records):
+        """
+        Écrit un lot d'entrées déjà nettoyées
+        Les observateurs ne reçoivent que les entrées effectivement écrites; une erreur d'écriture
+        est propagée à l'appelant (comptée par l'écrivain asynchrone)
+        """
+        written = []
+        try:
+            if self.log_format == 'jsonl':
+                self._append_jsonl(records, written)
+            else:
+                self._append_array(records)
+                written = records
+        finally:
+            if written:
+                self._notify_observers(written)
+    
+    def _notify_observers(self, records):
+        """Transmet des entrées écrites aux observateurs (index, magasins, compteurs)"""
+        for observer in self.observers:
+            try:
+                observer(records)
+            except Exception as e:
+                print(f"Error in log observer: {e}")
+    
+    def import_records(self, records):
+        """Écrit directement des entrées existantes (horodatage conservé), sans passer par la file"""
+        self.flush()
+        self._write_records([self._clean_log_data(record) for record in records])
+    
+    def add_observer(self, observer):
+        """Enregistre un observateur appelé avec chaque lot d'entrées écrites"""
+        self.observers.append(observer)
+    
+    def add_listener(self, listener):
+        """
+        Enregistre un auditeur appelé avec chaque nouvelle entrée dès sa création,
+        avant écriture (diffusion en direct; doit rester non bloquant)
+        """
+        self.listeners.append(listener)
+    
+    def _append_jsonl(self, records, written):
+        """
+        Ajoute les lignes en fin de fichier (ou du segment correspondant)
+        Chaque groupe écrit avec succès est ajouté à written; en cas d'échec, la ligne partielle
+        éventuelle est retirée et l'erreur propagée (offsets de l'index inchangés)
+        """
+        with self.lock:
+            if self.segments is None:
+                groups = [(None, records)]
+            else:
+                groups = itertools.groupby(
+                    records, key=lambda record: self.segments.segment_key(record['timestamp'])
+                )
+            
+            for key, group in groups:
+                group = list(group)
+                self._select_file(key)
+                
+                lines = [(serialize_record(record) + '\n').encode('utf-8') for record in group]
+                start = self._file_offset
+                try:
+                    self._file.write(b''.join(lines))
+                    self._file.flush()
+                    self._sync()
+                except Exception:
+                    self._abort_write(start)
+                    raise
+                
+                # Offsets calculés une fois les lignes vidées sur disque
+                entries = []
+                for record, line in zip(group, lines):
+                    entries.append((record, self._file_offset))
+                    self._file_offset += len(line)
+                written.extend(group)
+                self.index.add(self._file.name, entries)
+    
+    def _abort_write(self, start):
+        """
+        Après un échec d'écriture: ferme le fichier et le tronque à sa taille d'avant l'écriture,
+        la prochaine écriture repartant de la taille réelle (appelé sous verrou)
+        """
+        path = self._file.name
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        self._file = None
+        self._file_key = None
+        try:
+            os.truncate(path, start)
+        except OSError as e:
+            print(f"Error truncating JSON log after failed write: {e}")
+    
+    def _select_file(self, key):
+        """Ouvre le fichier cible (log unique ou segment) si nécessaire (appelé sous verrou)"""
+        if self._file is not None and key == self._file_key:
+            return
         
+        self._close_file()
+        path = self.log_file if key is None else self.segments.open_segment(key)
+        self._file = open(path, 'ab')
+        self._file_offset = os.fstat(self._file.fileno()).st_size
+        self._file_key = key
+    
+    def _close_file(self):
+        """Ferme le fichier ouvert après écriture sur disque (appelé sous verrou)"""
+        if self._file is None:
+            return
+        
+        self._file.flush()
+        if self.fsync_policy != 'never':
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        self._file_key = None
+    
+    def _sync(self):
+        """Applique la politique fsync (appelé sous verrou)"""
+        if self.fsync_policy == 'never':
+            return
+        now = time.monotonic()
+        if self.fsync_policy == 'always' or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+    
+    def _append_array(self, records):
+        """Ajoute les entrées au tableau JSON (réécriture complète du fichier)"""
         with self.lock:
             try:
                 if os.path.getsize(self.log_file) > 0:
@@ -60,61 +242,55 @@ class JSONArrayLogger:
                 else:
                     logs = []
                 
-                logs.append(cleaned_log_data)
+                logs.extend(record_to_dict(record) for record in records)
                 
                 with open(self.log_file, 'w', encoding='utf-8') as f:
                     json.dump(logs, f, indent=2, ensure_ascii=False)
                     
             except json.JSONDecodeError:
-                logs = [cleaned_log_data]
+                logs = [record_to_dict(record) for record in records]
                 with open(self.log_file, 'w', encoding='utf-8') as f:
                     json.dump(logs, f, indent=2, ensure_ascii=False)
-            except Exception as e:
-                print(f"Error writing to JSON log: {e}")
     
-    def log_metric(self, metric_type, values, metadata=None):
-        """Log une métrique système (SANS affichage console)"""
-        log_data = {
-            'timestamp': datetime.now().isoformat(),
-            'event_type': 'metric',
-            'metric_type': metric_type,
-            'values': values,
-            'metadata': metadata or {}
-        }
-        self._append_log(log_data)
+    def log_metric(self, metric_type, values, metadata=None, timestamp=None):
+        """
+        Log une métrique système (SANS affichage console)
+        timestamp: heure de la mesure (epoch), sinon heure de l'appel
+        """
+        self._append_record(MetricRecord(metric_type, values, metadata, timestamp))
     
     def log_alert(self, alert_type, severity, message, details=None):
         """Log une alerte (SANS affichage console)"""
-        log_data = {
-            'timestamp': datetime.now().isoformat(),
-            'event_type': 'alert',
-            'alert_type': alert_type,
-            'severity': severity,
-            'message': message,
-            'details': details or {}
-        }
-        self._append_log(log_data)
+        self._append_record(AlertRecord(alert_type, severity, message, details))
     
     def log_action(self, action_type, status, service=None, message="", details=None):
         """Log une action d'auto-réparation (SANS affichage console)"""
-        log_data = {
-            'timestamp': datetime.now().isoformat(),
-            'event_type': 'action',
-            'action_type': action_type,
-            'status': status,
-            'service': service,
-            'message': message,
-            'details': details or {}
-        }
-        self._append_log(log_data)
+        self._append_record(ActionRecord(action_type, status, service, message, details))
     
     def log_system_event(self, event_type, message, details=None):
         """Log un événement système (SANS affichage console)"""
-        log_data = {
-            'timestamp': datetime.now().isoformat(),
-            'event_type': 'system',
-            'system_event_type': event_type,
-            'message': message,
-            'details': details or {}
-        }
-        self._append_log(log_data)
\ No newline at end of file
+        self._append_record(SystemRecord(event_type, message, details))
+    
+    def flush(self):
+        """Attend l'écriture de toutes les entrées en file (mode asynchrone)"""
+        if self.writer is not None:
+            self.writer.flush()
+    
+    def get_stats(self):
+        """Retourne les compteurs d'écriture (mode asynchrone) et de rétention/compression"""
+        stats = self.writer.get_stats() if self.writer is not None else {}
+        stats['async'] = self.writer is not None
+        if self.retention_worker is not None:
+            stats['segments'] = self.retention_worker.get_stats()
+        return stats
+    
+    def close(self):
+        """Vide la file d'écriture, force l'écriture sur disque et ferme le fichier"""
+        if self.writer is not None:
+            self.writer.close()
+        
+        if self.retention_worker is not None:
+            self.retention_worker.stop()
+        
+        with self.lock:
+            self._close_file()
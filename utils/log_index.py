@@ -0,0 +1,213 @@
+import io
+import itertools
+import json
+import os
+import threading
+from utils.log_reader import log_files, iter_file_records, open_log_file, resolve_log_path
+
+# Clé d'index par type d'entrée, pour lesquels on retient la dernière entrée par valeur
+LATEST_KEYS = {
+    'metric:service_status': lambda record: record['values'].get('service')
+}
+
+
+def index_path(data_file):
+    """Chemin de l'index associé à un fichier de données"""
+    return data_file + '.idx'
+
+
+def latest_path(log_file):
+    """Chemin du fichier des dernières entrées par clé"""
+    base, _ = os.path.splitext(log_file)
+    return base + '.latest.json'
+
+
+def record_kind(record):
+    """Type indexé d'une entrée: event_type, ou metric:<metric_type> pour les métriques"""
+    event_type = record.get('event_type')
+    if event_type == 'metric':
+        return f"metric:{record.get('metric_type')}"
+    return event_type
+
+
+def record_bucket(timestamp):
+    """Intervalle d'indexation d'un timestamp ISO (à la minute)"""
+    return timestamp[:16]
+
+
+class LogIndexWriter:
+    """
+    Index annexe maintenu par le logger à l'écriture
+    - <segment>.idx: une ligne 'type<TAB>minute<TAB>offset,offset,...' par groupe écrit
+    - <log>.latest.json: offset de la dernière entrée par clé (ex: statut par service)
+    """
+
+    def __init__(self, log_file):
+        self.log_file = log_file
+        self.log_dir = os.path.dirname(log_file) or '.'
+        self.latest_file = latest_path(log_file)
+        self.lock = threading.Lock()
+        self.latest = {}
+        if os.path.exists(self.latest_file):
+            try:
+                with open(self.latest_file, 'r', encoding='utf-8') as f:
+                    self.latest = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                self.latest = {}
+
+    def add(self, data_file, entries):
+        """
+        Indexe des entrées déjà écrites et vidées sur disque
+        entries: liste de (entrée, offset en octets dans data_file)
+        """
+        groups = {}
+        latest_changed = False
+        for record, offset in entries:
+            kind = record_kind(record)
+            groups.setdefault((kind, record_bucket(record.get('timestamp', ''))), []).append(offset)
+
+            key_of = LATEST_KEYS.get(kind)
+            if key_of is not None:
+                key = key_of(record)
+                if key is not None:
+                    self.latest.setdefault(kind, {})[key] = {
+                        'file': os.path.basename(data_file),
+                        'offset': offset
+                    }
+                    latest_changed = True
+
+        lines = ''.join(
+            f"{kind}\t{bucket}\t{','.join(str(offset) for offset in offsets)}\n"
+            for (kind, bucket), offsets in groups.items()
+        )
+
+        with self.lock:
+            with open(index_path(data_file), 'a', encoding='utf-8') as f:
+                f.write(lines)
+            if latest_changed:
+                tmp_file = self.latest_file + '.tmp'
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.latest, f, ensure_ascii=False)
+                os.replace(tmp_file, self.latest_file)
+
+
+def has_index(log_file):
+    """Indique si le fichier de log courant dispose d'un index annexe"""
+    return any(os.path.exists(index_path(path)) for path in log_files(log_file)[-1:])
+
+
+def _read_index(data_file, kinds, first_bucket=None, last_bucket=None):
+    """Lit les offsets de l'index d'un fichier (None si l'index est absent)"""
+    path = index_path(data_file)
+    if not os.path.exists(path):
+        return None
+
+    offsets = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            kind, _, rest = line.partition('\t')
+            if kind not in kinds:
+                continue
+            bucket, _, values = rest.partition('\t')
+            if first_bucket is not None and bucket < first_bucket:
+                continue
+            if last_bucket is not None and bucket > last_bucket:
+                continue
+            offsets.extend(int(value) for value in values.split(','))
+    offsets.sort()
+    return offsets
+
+
+def _read_at(f, offset):
+    """Lit l'entrée située à un offset donné"""
+    f.seek(offset)
+    return json.loads(f.readline())
+
+
+def _iter_file(data_file, kinds, start, end, newest_first):
+    """Entrées d'un fichier correspondant aux types et à l'intervalle demandés"""
+    offsets = _read_index(
+        data_file, kinds,
+        record_bucket(start) if start else None,
+        record_bucket(end) if end else None
+    )
+
+    if offsets is None:
+        # Pas d'index (fichier ancien): parcours complet
+        records = [record for record in iter_file_records(data_file) if record_kind(record) in kinds]
+        yield from (reversed(records) if newest_first else records)
+        return
+
+    with open_log_file(data_file, binary=True) as f:
+        if newest_first and isinstance(f, io.BufferedReader):
+            offsets.reverse()
+        records = _read_offsets(f, offsets)
+        if newest_first and not isinstance(f, io.BufferedReader):
+            # Segment compressé: lecture dans l'ordre (pas de retour arrière), puis inversion
+            records = reversed(list(records))
+        yield from records
+
+
+def _read_offsets(f, offsets):
+    """Lit les entrées aux offsets donnés"""
+    for offset in offsets:
+        try:
+            yield _read_at(f, offset)
+        except (json.JSONDecodeError, ValueError):
+            continue
+
+
+def iter_query_records(log_file, kinds, start=None, end=None, newest_first=False):
+    """
+    Itère sur les entrées des types demandés entre start et end (timestamps ISO)
+    Générateur: les entrées sont lues au fur et à mesure, sans charger tout l'intervalle
+    """
+    kinds = set(kinds)
+    paths = log_files(log_file, start, end)
+    if newest_first:
+        paths = list(reversed(paths))
+
+    for path in paths:
+        for record in _iter_file(path, kinds, start, end, newest_first):
+            timestamp = record.get('timestamp', '')
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp > end:
+                continue
+            yield record
+
+
+def query_records(log_file, kinds, start=None, end=None, limit=None, newest_first=False):
+    """
+    Retourne les entrées des types demandés (ex: ['alert'], ['metric:service_status'])
+    entre start et end (timestamps ISO), en lisant uniquement les offsets indexés
+    """
+    records = iter_query_records(log_file, kinds, start, end, newest_first)
+    return list(records if limit is None else itertools.islice(records, limit))
+
+
+def latest_records(log_file, kind='metric:service_status'):
+    """
+    Retourne la dernière entrée par clé (ex: dernier statut de chaque service)
+    None si aucun index des dernières entrées n'existe
+    """
+    path = latest_path(log_file)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            latest = json.load(f).get(kind, {})
+    except (json.JSONDecodeError, OSError):
+        return None
+
+    log_dir = os.path.dirname(log_file) or '.'
+    results = {}
+    for key, location in latest.items():
+        data_file = resolve_log_path(os.path.join(log_dir, location['file']))
+        try:
+            with open_log_file(data_file, binary=True) as f:
+                results[key] = _read_at(f, location['offset'])
+        except (OSError, json.JSONDecodeError, ValueError):
+            continue
+    return results
@@ -0,0 +1,266 @@
+import gzip
+import json
+import lzma
+import os
+from utils.log_segments import manifest_path, read_manifest, select_segments
+
+
+# Extensions des segments compressés -> module de décompression
+COMPRESSED_EXTENSIONS = {'.gz': gzip, '.xz': lzma}
+
+
+def open_log_file(log_file, binary=False):
+    """Ouvre un fichier de log en lecture, compressé ou non (décompression à la volée)"""
+    codec = COMPRESSED_EXTENSIONS.get(os.path.splitext(log_file)[1])
+    opener = open if codec is None else codec.open
+    if binary:
+        return opener(log_file, 'rb')
+    return opener(log_file, 'rt', encoding='utf-8')
+
+
+def resolve_log_path(log_file):
+    """Retourne le chemin existant d'un fichier, éventuellement compressé depuis"""
+    for path in [log_file] + [log_file + extension for extension in COMPRESSED_EXTENSIONS]:
+        if os.path.exists(path):
+            return path
+    return log_file
+
+
+def detect_log_format(log_file):
+    """
+    Détecte le format d'un fichier de log
+    Retourne 'array' (tableau JSON), 'jsonl' (une entrée par ligne) ou None si vide/absent
+    """
+    if not os.path.exists(log_file) or os.path.getsize(log_file) == 0:
+        return None
+
+    with open_log_file(log_file) as f:
+        while True:
+            char = f.read(1)
+            if not char:
+                return None
+            if not char.isspace():
+                return 'array' if char == '[' else 'jsonl'
+
+
+def check_legacy_log(log_file, legacy_file):
+    """
+    Signale un ancien log (tableau JSON) resté à l'emplacement par défaut précédent
+    L'historique qu'il contient n'est ni lu ni affiché tant qu'il n'a pas été migré
+    Retourne True si un ancien log a été trouvé
+    """
+    if os.path.abspath(log_file) == os.path.abspath(legacy_file) or detect_log_format(legacy_file) is None:
+        return False
+
+    if detect_log_format(log_file) is None:
+        print("=" * 60)
+        print(f"⚠️ ATTENTION: ancien log trouvé ({legacy_file}), le log actuel ({log_file}) est vide")
+        print("⚠️ Son historique n'apparaîtra pas dans le tableau de bord tant qu'il n'est pas migré:")
+        print(f"      python -m utils.migrate_log {legacy_file} --dest {log_file}")
+        print(f"⚠️ Pour continuer à l'utiliser tel quel: LOG_FILE={legacy_file}")
+        print("=" * 60)
+    else:
+        print(f"⚠️ Ancien log {legacy_file} toujours présent: migrez-le (python -m utils.migrate_log) "
+              f"ou renommez-le s'il l'a déjà été")
+    return True
+
+
+JSON_SEPARATORS = ' \t\r\n,'
+
+
+def iter_json_array(f, chunk_size=1 << 16):
+    """
+    Analyse incrémentale d'un tableau JSON d'objets depuis un fichier texte ouvert
+    La mémoire utilisée est bornée par la taille d'un bloc et d'une entrée
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    eof = False
+
+    while True:
+        # Saute les blancs et séparateurs, en relisant un bloc si nécessaire
+        while True:
+            while position < len(buffer) and buffer[position] in JSON_SEPARATORS:
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            buffer = f.read(chunk_size)
+            position = 0
+            eof = not buffer
+
+        if position >= len(buffer):
+            return
+
+        if not started:
+            if buffer[position] != '[':
+                raise ValueError("Le fichier ne contient pas un tableau JSON")
+            started = True
+            position += 1
+            continue
+
+        if buffer[position] == ']':
+            return
+
+        try:
+            record, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Entrée coupée par la fin du bloc: on complète le tampon
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        yield record
+
+
+def iter_file_records(log_file):
+    """Itère sur les entrées d'un fichier unique, quel que soit son format"""
+    log_format = detect_log_format(log_file)
+
+    if log_format == 'array':
+        with open_log_file(log_file) as f:
+            yield from iter_json_array(f)
+    elif log_format == 'jsonl':
+        with open_log_file(log_file) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Ligne incomplète (écriture en cours ou arrêt brutal): ignorée
+                    continue
+
+
+def log_files(log_file, start=None, end=None):
+    """
+    Retourne les fichiers à lire pour l'intervalle demandé
+    Log segmenté: seuls les segments du manifeste couvrant l'intervalle
+    """
+    manifest = read_manifest(log_file)
+    if manifest is None:
+        return [log_file]
+    return select_segments(log_file, manifest, start, end)
+
+
+def iter_log_records(log_file, start=None, end=None):
+    """
+    Itère sur les entrées d'un log (fichier unique ou segmenté)
+    start/end: timestamps ISO optionnels pour filtrer les entrées
+    """
+    for path in log_files(log_file, start, end):
+        for record in iter_file_records(path):
+            timestamp = record.get('timestamp', '')
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp > end:
+                continue
+            yield record
+
+
+def load_log_records(log_file, start=None, end=None):
+    """Charge les entrées d'un log dans une liste"""
+    return list(iter_log_records(log_file, start, end))
+
+
+def log_mtime(log_file):
+    """Date de dernière modification du log (manifeste et dernier segment inclus)"""
+    paths = [manifest_path(log_file)] + log_files(log_file)[-1:]
+    return max((os.path.getmtime(path) for path in paths if os.path.exists(path)), default=0)
+
+
+def _plain_name(path):
+    """Nom d'un fichier de log sans extension de compression"""
+    base, extension = os.path.splitext(os.path.basename(path))
+    return base if extension in COMPRESSED_EXTENSIONS else os.path.basename(path)
+
+
+def _read_lines_from(path, offset):
+    """
+    Lit les lignes complètes ajoutées après offset (octets du flux décompressé)
+    Retourne (entrées, nouvel offset); une ligne en cours d'écriture est laissée pour la lecture suivante
+    """
+    with open_log_file(path, binary=True) as f:
+        f.seek(offset)
+        data = f.read()
+
+    end = data.rfind(b'\n') + 1
+    records = []
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records, offset + end
+
+
+class LogTailReader:
+    """
+    Lecture incrémentale d'un log JSON Lines (fichier unique ou segmenté)
+    Conserve un offset par fichier et n'analyse que les lignes ajoutées depuis la lecture précédente
+    Rechargement complet si un fichier est remplacé (rotation), tronqué ou supprimé (rétention),
+    et pour l'ancien format tableau (réécrit à chaque entrée)
+    """
+
+    def __init__(self, log_file):
+        self.log_file = log_file
+        self.positions = {}
+
+    def reset(self):
+        """Oublie les offsets: la prochaine lecture sera complète"""
+        self.positions = {}
+
+    def _needs_reload(self, paths):
+        """Détecte rotation, troncature ou suppression d'un fichier déjà lu"""
+        for name, (path, inode, offset) in self.positions.items():
+            current = paths.get(name)
+            if current is None or not os.path.exists(current):
+                return True
+            if current != path:
+                # Segment compressé depuis: même contenu, l'offset reste valable
+                continue
+            if os.path.splitext(path)[1] in COMPRESSED_EXTENSIONS:
+                continue
+            stat = os.stat(path)
+            if stat.st_ino != inode or stat.st_size < offset:
+                return True
+        return False
+
+    def read(self):
+        """
+        Retourne (entrées, rechargement)
+        rechargement=True: les entrées remplacent tout l'état; sinon elles s'y ajoutent
+        """
+        files = log_files(self.log_file)
+        if len(files) == 1 and detect_log_format(files[0]) == 'array':
+            self.positions = {}
+            return load_log_records(self.log_file), True
+
+        paths = {_plain_name(path): path for path in files}
+        reload = not self.positions or self._needs_reload(paths)
+        if reload:
+            self.positions = {}
+
+        records = []
+        for name, path in paths.items():
+            if not os.path.exists(path):
+                continue
+            stat = os.stat(path)
+            known_path, _, offset = self.positions.get(name, (None, None, 0))
+            if known_path == path:
+                # Segment compressé déjà lu (immuable) ou fichier sans ajout: rien à lire
+                if os.path.splitext(path)[1] in COMPRESSED_EXTENSIONS or stat.st_size == offset:
+                    continue
+            new_records, offset = _read_lines_from(path, offset)
+            records.extend(new_records)
+            self.positions[name] = (path, stat.st_ino, offset)
+
+        return records, reload
@@ -0,0 +1,147 @@
+import json
+import re
+import time
+from datetime import datetime
+
+# Motif compilé une seule fois pour tout le processus
+EMOJI_PATTERN = re.compile(
+    "["
+    u"\U0001F600-\U0001F64F"
+    u"\U0001F300-\U0001F5FF"
+    u"\U0001F680-\U0001F6FF"
+    u"\U0001F1E0-\U0001F1FF"
+    u"\U00002702-\U000027B0"
+    u"\U000024C2-\U0001F251"
+    "]+", flags=re.UNICODE
+)
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+def remove_emojis(text):
+    """Supprime les emojis d'un texte (sans regex pour les textes ASCII)"""
+    if not isinstance(text, str) or text.isascii():
+        return text
+    return EMOJI_PATTERN.sub('', text)
+
+
+def _clean_details(details):
+    """Nettoie le seul champ imbriqué susceptible de contenir des emojis (details.message)"""
+    if not details:
+        return {}
+    message = details.get('message')
+    if isinstance(message, str) and not message.isascii():
+        details = dict(details, message=remove_emojis(message))
+    return details
+
+
+class LogRecord:
+    """
+    Entrée de log compacte (__slots__), accessible comme un dict en lecture
+    Le timestamp ISO n'est formaté qu'au premier accès (thread d'écriture en mode asynchrone)
+    Les dicts values/details/metadata sont référencés, pas copiés: ne pas les modifier après l'appel
+    """
+
+    __slots__ = ('_created', '_timestamp')
+    event_type = None
+    fields = ()
+
+    def __init__(self, created=None):
+        # created: heure de l'événement (epoch) si elle précède l'enregistrement, sinon maintenant
+        self._created = time.time() if created is None else created
+        self._timestamp = None
+
+    @property
+    def timestamp(self):
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._created).isoformat()
+        return self._timestamp
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self):
+        """Représentation dict (format historique du log)"""
+        record = {'timestamp': self.timestamp, 'event_type': self.event_type}
+        for field in self.fields:
+            record[field] = getattr(self, field)
+        return record
+
+    def to_json(self):
+        """Sérialisation JSON compacte, champ par champ"""
+        parts = [f'{{"timestamp":"{self.timestamp}","event_type":"{self.event_type}"']
+        for field in self.fields:
+            parts.append(f',"{field}":{_encode(getattr(self, field))}')
+        parts.append('}')
+        return ''.join(parts)
+
+
+class MetricRecord(LogRecord):
+    __slots__ = ('metric_type', 'values', 'metadata')
+    event_type = 'metric'
+    fields = __slots__
+
+    def __init__(self, metric_type, values, metadata=None, created=None):
+        LogRecord.__init__(self, created)
+        self.metric_type = metric_type
+        self.values = values
+        self.metadata = metadata or {}
+
+
+class AlertRecord(LogRecord):
+    __slots__ = ('alert_type', 'severity', 'message', 'details')
+    event_type = 'alert'
+    fields = __slots__
+
+    def __init__(self, alert_type, severity, message, details=None):
+        LogRecord.__init__(self)
+        self.alert_type = alert_type
+        self.severity = severity
+        self.message = remove_emojis(message)
+        self.details = _clean_details(details)
+
+
+class ActionRecord(LogRecord):
+    __slots__ = ('action_type', 'status', 'service', 'message', 'details')
+    event_type = 'action'
+    fields = __slots__
+
+    def __init__(self, action_type, status, service=None, message="", details=None):
+        LogRecord.__init__(self)
+        self.action_type = action_type
+        self.status = status
+        self.service = service
+        self.message = remove_emojis(message)
+        self.details = _clean_details(details)
+
+
+class SystemRecord(LogRecord):
+    __slots__ = ('system_event_type', 'message', 'details')
+    event_type = 'system'
+    fields = __slots__
+
+    def __init__(self, system_event_type, message, details=None):
+        LogRecord.__init__(self)
+        self.system_event_type = system_event_type
+        self.message = remove_emojis(message)
+        self.details = _clean_details(details)
+
+
+def serialize_record(record):
+    """Sérialise une entrée typée ou un dict (entrées importées) en JSON compact"""
+    if isinstance(record, LogRecord):
+        return record.to_json()
+    return _encode(record)
+
+
+def record_to_dict(record):
+    """Convertit une entrée typée en dict (les dicts sont retournés tels quels)"""
+    if isinstance(record, LogRecord):
+        return record.to_dict()
+    return record
@@ -0,0 +1,284 @@
+import gzip
+import json
+import lzma
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Période de segmentation -> (format de la clé, durée d'un segment)
+SEGMENT_PERIODS = {
+    'hourly': ('%Y%m%d%H', timedelta(hours=1)),
+    'daily': ('%Y%m%d', timedelta(days=1))
+}
+
+
+# Compression des segments fermés -> (extension, module)
+COMPRESSION_CODECS = {
+    'gzip': ('.gz', gzip),
+    'lzma': ('.xz', lzma)
+}
+
+
+def manifest_path(log_file):
+    """Chemin du manifeste associé à un fichier de log"""
+    base, _ = os.path.splitext(log_file)
+    return base + '.manifest.json'
+
+
+def read_manifest(log_file):
+    """Lit le manifeste des segments (None si le log n'est pas segmenté)"""
+    path = manifest_path(log_file)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def select_segments(log_file, manifest, start=None, end=None):
+    """
+    Retourne les chemins des segments couvrant l'intervalle [start, end]
+    start/end sont des timestamps ISO (chaînes) ou None
+    """
+    log_dir = os.path.dirname(log_file) or '.'
+    paths = []
+    for segment in sorted(manifest.get('segments', []), key=lambda s: s['key']):
+        if start is not None and segment['end'] <= start:
+            continue
+        if end is not None and segment['start'] > end:
+            continue
+        paths.append(os.path.join(log_dir, segment['file']))
+    return paths
+
+
+class SegmentManager:
+    """Gère les segments horaires/journaliers d'un log et leur manifeste"""
+
+    def __init__(self, log_file, period='daily'):
+        self.log_file = log_file
+        self.log_dir = os.path.dirname(log_file) or '.'
+        self.base, self.extension = os.path.splitext(os.path.basename(log_file))
+        self.period = period
+        self.key_format, self.duration = SEGMENT_PERIODS[period]
+        self.manifest_file = manifest_path(log_file)
+        self.lock = threading.Lock()
+        self.active_key = None
+
+        manifest = read_manifest(log_file) or {}
+        self.segments = {segment['key']: segment for segment in manifest.get('segments', [])}
+
+    def segment_key(self, timestamp):
+        """Clé du segment pour un timestamp ISO (découpage direct de la chaîne)"""
+        key = timestamp[0:4] + timestamp[5:7] + timestamp[8:10]
+        if self.period == 'hourly':
+            key += timestamp[11:13]
+        return key
+
+    def segment_path(self, key):
+        """Chemin du fichier d'un segment"""
+        return os.path.join(self.log_dir, f"{self.base}-{key}{self.extension}")
+
+    def open_segment(self, key):
+        """Enregistre un segment dans le manifeste s'il est nouveau et retourne son chemin"""
+        with self.lock:
+            if key not in self.segments:
+                start = datetime.strptime(key, self.key_format)
+                self.segments[key] = {
+                    'key': key,
+                    'file': os.path.basename(self.segment_path(key)),
+                    'start': start.isoformat(),
+                    'end': (start + self.duration).isoformat(),
+                    'closed': False,
+                    'bytes': 0
+                }
+            # Les segments plus anciens que le segment actif sont désormais fermés
+            for other_key, segment in self.segments.items():
+                if other_key < key:
+                    segment['closed'] = True
+            if self.active_key is None or key >= self.active_key:
+                self.active_key = key
+            self._save()
+        return self.segment_path(key)
+
+    def _save(self):
+        """Écrit le manifeste de façon atomique (appelé sous verrou)"""
+        manifest = {
+            'period': self.period,
+            'segments': sorted(self.segments.values(), key=lambda s: s['key'])
+        }
+        tmp_file = self.manifest_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.manifest_file)
+
+    def _remove_segment(self, key):
+        """Supprime un segment du disque et du manifeste (appelé sous verrou)"""
+        segment = self.segments.pop(key)
+        path = os.path.join(self.log_dir, segment['file'])
+        # Le segment et son index annexe éventuel
+        for file_path in (path, path + '.idx'):
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+        return segment
+
+    def enforce_retention(self, max_age_days=0, max_total_bytes=0):
+        """
+        Applique la politique de rétention (âge maximal et taille totale maximale)
+        Le segment actif n'est jamais supprimé
+        Retourne la liste des segments supprimés
+        """
+        removed = []
+        now = datetime.now().isoformat()
+
+        with self.lock:
+            for segment in self.segments.values():
+                path = os.path.join(self.log_dir, segment['file'])
+                segment['bytes'] = os.path.getsize(path) if os.path.exists(path) else 0
+                if segment['end'] <= now:
+                    segment['closed'] = True
+
+            candidates = sorted(key for key in self.segments if key != self.active_key)
+
+            if max_age_days > 0:
+                limit = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+                for key in list(candidates):
+                    if self.segments[key]['end'] <= limit:
+                        removed.append(self._remove_segment(key))
+                        candidates.remove(key)
+
+            if max_total_bytes > 0:
+                total_bytes = sum(segment['bytes'] for segment in self.segments.values())
+                while total_bytes > max_total_bytes and candidates:
+                    segment = self._remove_segment(candidates.pop(0))
+                    total_bytes -= segment['bytes']
+                    removed.append(segment)
+
+            self._save()
+
+        return removed
+
+    def compress_closed_segments(self, codec='gzip'):
+        """
+        Compresse les segments fermés (hors segment actif) et met à jour le manifeste
+        Retourne les statistiques de chaque segment compressé
+        """
+        with self.lock:
+            candidates = [
+                dict(segment) for key, segment in sorted(self.segments.items())
+                if segment.get('closed') and not segment.get('codec')
+                and (self.active_key is None or key < self.active_key)
+            ]
+
+        return [self._compress_segment(segment, codec) for segment in candidates]
+
+    def _compress_segment(self, segment, codec):
+        """Compresse un segment hors verrou puis bascule le manifeste sur le fichier compressé"""
+        extension, module = COMPRESSION_CODECS[codec]
+        source = os.path.join(self.log_dir, segment['file'])
+        target = source + extension
+        tmp_file = target + '.tmp'
+
+        cpu_started = time.thread_time()
+        wall_started = time.monotonic()
+        with open(source, 'rb') as src, module.open(tmp_file, 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp_file, target)
+        # L'index (offsets dans le flux décompressé) suit le segment
+        if os.path.exists(source + '.idx'):
+            os.replace(source + '.idx', target + '.idx')
+
+        raw_bytes = os.path.getsize(source)
+        compressed_bytes = os.path.getsize(target)
+        with self.lock:
+            current = self.segments.get(segment['key'])
+            if current is not None:
+                current.update({
+                    'file': os.path.basename(target),
+                    'codec': codec,
+                    'raw_bytes': raw_bytes,
+                    'bytes': compressed_bytes
+                })
+                self._save()
+        os.remove(source)
+
+        return {
+            'file': os.path.basename(target),
+            'codec': codec,
+            'raw_bytes': raw_bytes,
+            'compressed_bytes': compressed_bytes,
+            'cpu_seconds': time.thread_time() - cpu_started,
+            'wall_seconds': time.monotonic() - wall_started
+        }
+
+
+class RetentionWorker:
+    """
+    Thread d'arrière-plan appliquant périodiquement la rétention des segments
+    et la compression des segments fermés
+    """
+
+    def __init__(self, segment_manager, max_age_days=30, max_total_bytes=0, check_interval=300,
+                 compression='none'):
+        self.segment_manager = segment_manager
+        self.max_age_days = max_age_days
+        self.max_total_bytes = max_total_bytes
+        self.check_interval = check_interval
+        self.compression = compression if compression in COMPRESSION_CODECS else None
+        self.removed_segments = 0
+        self.compressed_segments = 0
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self.compression_cpu_seconds = 0.0
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-retention", daemon=True)
+        self._thread.start()
+
+    def run_once(self):
+        """Effectue un passage de rétention"""
+        try:
+            removed = self.segment_manager.enforce_retention(self.max_age_days, self.max_total_bytes)
+            self.removed_segments += len(removed)
+        except Exception as e:
+            print(f"Error enforcing log retention: {e}")
+
+        if self.compression is None:
+            return
+        try:
+            for stats in self.segment_manager.compress_closed_segments(self.compression):
+                self.compressed_segments += 1
+                self.raw_bytes += stats['raw_bytes']
+                self.compressed_bytes += stats['compressed_bytes']
+                self.compression_cpu_seconds += stats['cpu_seconds']
+                ratio = stats['raw_bytes'] / max(stats['compressed_bytes'], 1)
+                print(f"🗜️ Segment {stats['file']} compressé ({stats['codec']}): "
+                      f"{stats['raw_bytes'] / 1048576:.2f} MB → {stats['compressed_bytes'] / 1048576:.2f} MB "
+                      f"(ratio {ratio:.1f}x, CPU {stats['cpu_seconds']:.2f}s)")
+        except Exception as e:
+            print(f"Error compressing log segments: {e}")
+
+    def get_stats(self):
+        """Retourne les statistiques de rétention et de compression"""
+        return {
+            'removed_segments': self.removed_segments,
+            'compressed_segments': self.compressed_segments,
+            'raw_bytes': self.raw_bytes,
+            'compressed_bytes': self.compressed_bytes,
+            'compression_ratio': round(self.raw_bytes / self.compressed_bytes, 2) if self.compressed_bytes else None,
+            'compression_cpu_seconds': round(self.compression_cpu_seconds, 3)
+        }
+
+    def _run(self):
+        """Boucle du thread de rétention"""
+        while not self._stop_event.wait(self.check_interval):
+            self.run_once()
+
+    def stop(self):
+        """Arrête le thread de rétention"""
+        self._stop_event.set()
+        self._thread.join(timeout=5.0)
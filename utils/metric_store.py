@@ -0,0 +1,204 @@
+import json
+import os
+import threading
+import numpy as np
+
+# Colonnes des métriques système (telles qu'enregistrées par log_metrics_to_json)
+SYSTEM_METRIC_FIELDS = (
+    'cpu_percent', 'memory_percent', 'disk_percent',
+    'network_sent_mb', 'network_recv_mb', 'total_network_mb'
+)
+
+TIMESTAMP_DTYPE = 'datetime64[ms]'
+VALUE_DTYPE = 'float32'
+INITIAL_CAPACITY = 8192
+
+# Lignes parcourues pour retrouver la dernière valeur mesurée de chaque champ
+LATEST_SCAN_ROWS = 1024
+
+
+class MetricStore:
+    """
+    Stockage colonnaire des métriques système
+    - une colonne par métrique, chacune dans son propre fichier mappé en mémoire
+    - timestamps en millisecondes depuis l'epoch (datetime64[ms])
+    - en-tête [nombre de lignes, capacité] partagé avec les lecteurs
+    Les ajouts sont en O(1) amorti et les lectures par intervalle sont des vues NumPy
+    """
+
+    def __init__(self, path="logs/metrics", fields=SYSTEM_METRIC_FIELDS, readonly=False):
+        self.path = path
+        self.readonly = readonly
+        self.lock = threading.Lock()
+        self.meta_file = os.path.join(path, 'meta.json')
+        self.header_file = os.path.join(path, 'header.i8')
+
+        if not os.path.exists(self.meta_file):
+            if readonly:
+                raise FileNotFoundError(f"Magasin de métriques introuvable: {path}")
+            self._create(fields)
+
+        with open(self.meta_file, 'r', encoding='utf-8') as f:
+            self.fields = tuple(json.load(f)['fields'])
+
+        mode = 'r' if readonly else 'r+'
+        self.header = np.memmap(self.header_file, dtype='int64', mode=mode, shape=(2,))
+        self.columns = {}
+        self._mapped_capacity = 0
+        self._map_columns()
+
+    def _create(self, fields):
+        """Crée les fichiers du magasin (métadonnées, en-tête, colonnes vides)"""
+        os.makedirs(self.path, exist_ok=True)
+        header = np.memmap(self.header_file, dtype='int64', mode='w+', shape=(2,))
+        header[:] = (0, INITIAL_CAPACITY)
+        header.flush()
+        del header
+
+        for name, dtype in self._column_dtypes(fields).items():
+            column = np.memmap(self._column_file(name), dtype=dtype, mode='w+', shape=(INITIAL_CAPACITY,))
+            column.flush()
+            del column
+
+        tmp_file = self.meta_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'fields': list(fields), 'timestamp_dtype': TIMESTAMP_DTYPE,
+                       'value_dtype': VALUE_DTYPE}, f, indent=2)
+        os.replace(tmp_file, self.meta_file)
+
+    @staticmethod
+    def _column_dtypes(fields):
+        """Type de chaque colonne (timestamp en premier)"""
+        dtypes = {'timestamp': TIMESTAMP_DTYPE}
+        dtypes.update({field: VALUE_DTYPE for field in fields})
+        return dtypes
+
+    def _column_file(self, name):
+        """Chemin du fichier d'une colonne"""
+        return os.path.join(self.path, f"{name}.col")
+
+    def _map_columns(self):
+        """(Re)mappe les colonnes à la capacité courante"""
+        capacity = int(self.header[1])
+        mode = 'r' if self.readonly else 'r+'
+        self.columns = {
+            name: np.memmap(self._column_file(name), dtype=dtype, mode=mode, shape=(capacity,))
+            for name, dtype in self._column_dtypes(self.fields).items()
+        }
+        self._mapped_capacity = capacity
+
+    def _grow(self):
+        """Double la capacité des colonnes (appelé sous verrou)"""
+        new_capacity = self._mapped_capacity * 2
+        for name, column in self.columns.items():
+            column.flush()
+            with open(self._column_file(name), 'r+b') as f:
+                f.truncate(new_capacity * column.dtype.itemsize)
+        self.header[1] = new_capacity
+        self.header.flush()
+        self._map_columns()
+
+    def __len__(self):
+        return int(self.header[0])
+
+    def append(self, timestamp, values):
+        """
+        Ajoute une ligne (timestamp ISO ou datetime, dict des valeurs)
+        Le compteur est incrémenté en dernier: un lecteur ne voit jamais de ligne partielle
+        """
+        if self.readonly:
+            raise PermissionError("Magasin de métriques ouvert en lecture seule")
+
+        with self.lock:
+            count = int(self.header[0])
+            if count >= self._mapped_capacity:
+                self._grow()
+
+            self.columns['timestamp'][count] = np.datetime64(timestamp, 'ms')
+            for field in self.fields:
+                value = values.get(field)
+                self.columns[field][count] = np.nan if value is None else value
+            self.header[0] = count + 1
+
+    def ingest(self, records):
+        """Observateur du logger: ajoute les métriques système d'un lot d'entrées"""
+        for record in records:
+            if record.get('event_type') == 'metric' and record.get('metric_type') == 'system':
+                self.append(record['timestamp'], record['values'])
+
+    def refresh(self):
+        """Remappe les colonnes si un autre écrivain a agrandi le magasin (lecteurs)"""
+        if int(self.header[1]) != self._mapped_capacity:
+            self._map_columns()
+
+    def index_range(self, start=None, end=None):
+        """
+        Retourne les positions (first, last) des lignes entre start et end (inclus)
+        start/end: timestamps ISO, datetime ou None
+        """
+        self.refresh()
+        count = min(len(self), self._mapped_capacity)
+        timestamps = self.columns['timestamp'][:count]
+
+        first = 0 if start is None else int(np.searchsorted(timestamps, np.datetime64(start, 'ms'), 'left'))
+        last = count if end is None else int(np.searchsorted(timestamps, np.datetime64(end, 'ms'), 'right'))
+        return first, last
+
+    def read_range(self, start=None, end=None):
+        """Retourne les colonnes entre start et end (inclus) sous forme de vues sans copie"""
+        first, last = self.index_range(start, end)
+        return {name: column[first:last] for name, column in self.columns.items()}
+
+    def latest(self, measured=False):
+        """
+        Retourne la dernière ligne enregistrée (ou None)
+        measured: chaque champ prend sa dernière valeur mesurée parmi les LATEST_SCAN_ROWS
+        dernières lignes (NaN si aucune), les collecteurs n'alimentant pas toutes les lignes
+        """
+        self.refresh()
+        count = min(len(self), self._mapped_capacity)
+        if count == 0:
+            return None
+        row = {name: column[count - 1] for name, column in self.columns.items()}
+        if measured:
+            first = max(count - LATEST_SCAN_ROWS, 0)
+            for field in self.fields:
+                values = self.columns[field][first:count]
+                present = np.flatnonzero(~np.isnan(values))
+                if len(present) > 0:
+                    row[field] = values[present[-1]]
+        return row
+
+    def is_sorted(self):
+        """Vrai si les timestamps sont croissants (invariant des lectures par intervalle)"""
+        self.refresh()
+        count = min(len(self), self._mapped_capacity)
+        timestamps = self.columns['timestamp'][:count].astype('int64')
+        return bool(np.all(timestamps[1:] >= timestamps[:-1]))
+
+    def sort(self):
+        """
+        Réordonne les lignes par timestamp (tri stable), après l'ajout de mesures plus anciennes
+        (import d'un historique); retourne True si des lignes ont été déplacées
+        """
+        if self.readonly:
+            raise PermissionError("Magasin de métriques ouvert en lecture seule")
+        if self.is_sorted():
+            return False
+
+        with self.lock:
+            count = int(self.header[0])
+            order = np.argsort(self.columns['timestamp'][:count], kind='stable')
+            for column in self.columns.values():
+                column[:count] = column[:count][order]
+                column.flush()
+        return True
+
+    def flush(self):
+        """Force l'écriture des pages modifiées sur disque"""
+        if self.readonly:
+            return
+        with self.lock:
+            for column in self.columns.values():
+                column.flush()
+            self.header.flush()
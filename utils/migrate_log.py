@@ -0,0 +1,146 @@
+"""
+Migration d'un ancien log au format tableau JSON vers le stockage actuel
+
+Usage:
+    python -m utils.migrate_log logs/monitoring.json [--dest logs/monitoring.jsonl] [--rebuild-stores]
+
+Le tableau est analysé de façon incrémentale (mémoire constante) et les entrées sont
+réécrites par lots via le logger: segments, index, magasin de métriques et agrégats
+sont alimentés comme en fonctionnement normal.
+À lancer avant le premier démarrage de la surveillance avec le nouveau format.
+"""
+import argparse
+import os
+import sys
+import time
+from config.settings import (
+    LOG_FILE, LOG_FSYNC, LOG_FSYNC_INTERVAL, LOG_SEGMENT_PERIOD,
+    METRIC_STORE_ENABLED, METRIC_STORE_PATH, ROLLUPS_ENABLED, ROLLUP_PATH,
+    LOG_SQLITE_ENABLED, LOG_SQLITE_FILE, LOG_RETENTION_DAYS,
+    EVENT_COUNTERS_ENABLED, EVENT_COUNTERS_BUCKET_SECONDS
+)
+from utils.event_counters import EventCounters, counters_path
+from utils.json_array_logger import JSONArrayLogger
+from utils.log_reader import detect_log_format, iter_json_array
+from utils.metric_store import MetricStore
+from utils.rollups import RollupAggregator
+from utils.sqlite_event_store import SQLiteEventStore
+
+
+def format_progress(records, bytes_read, total_bytes, elapsed):
+    """Ligne de progression (entrées, volume, débit)"""
+    elapsed = max(elapsed, 1e-6)
+    percent = 100.0 * bytes_read / total_bytes if total_bytes else 100.0
+    return (f"   {records} entrées | {bytes_read / 1048576:.1f}/{total_bytes / 1048576:.1f} MB "
+            f"({percent:.1f}%) | {records / elapsed:.0f} entrées/s | "
+            f"{bytes_read / 1048576 / elapsed:.1f} MB/s")
+
+
+def migrate(source, dest, batch_size=1000, progress_interval=2.0, rebuild_stores=False):
+    """
+    Migre source (tableau JSON) vers dest; retourne le nombre d'entrées migrées
+    Les lectures par intervalle du magasin de métriques et des agrégats supposent des timestamps
+    croissants: un magasin déjà alimenté n'est complété que si rebuild_stores est demandé
+    (tri du magasin puis recalcul des agrégats à la fin de la migration)
+    """
+    if detect_log_format(source) != 'array':
+        raise ValueError(f"{source} n'est pas un tableau JSON")
+
+    metric_store = MetricStore(METRIC_STORE_PATH) if METRIC_STORE_ENABLED else None
+    rebuild = metric_store is not None and len(metric_store) > 0
+    if rebuild and not rebuild_stores:
+        raise ValueError(
+            f"le magasin de métriques {METRIC_STORE_PATH} contient déjà {len(metric_store)} mesures: "
+            "les mesures migrées, plus anciennes, rompraient l'ordre chronologique. "
+            "Relancez avec --rebuild-stores pour les fusionner (tri du magasin et recalcul des agrégats)"
+        )
+
+    json_logger = JSONArrayLogger(
+        dest, 'jsonl', LOG_FSYNC, LOG_FSYNC_INTERVAL,
+        segment_period=LOG_SEGMENT_PERIOD
+    )
+    if metric_store is not None:
+        json_logger.add_observer(metric_store.ingest)
+    rollups = RollupAggregator(ROLLUP_PATH) if ROLLUPS_ENABLED else None
+    if rollups is not None and not rebuild:
+        json_logger.add_observer(rollups.ingest)
+    event_store = SQLiteEventStore(LOG_SQLITE_FILE) if LOG_SQLITE_ENABLED else None
+    if event_store is not None:
+        json_logger.add_observer(event_store.ingest)
+    event_counters = None
+    if EVENT_COUNTERS_ENABLED:
+        event_counters = EventCounters.load(counters_path(dest), retention_days=LOG_RETENTION_DAYS) or EventCounters(
+            counters_path(dest), EVENT_COUNTERS_BUCKET_SECONDS, LOG_RETENTION_DAYS
+        )
+        json_logger.add_observer(event_counters.ingest)
+
+    total_bytes = os.path.getsize(source)
+    records = 0
+    batch = []
+    started = time.monotonic()
+    last_report = started
+
+    print(f"🔄 Migration de {source} vers {dest}")
+    try:
+        with open(source, 'r', encoding='utf-8') as f:
+            for record in iter_json_array(f):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    json_logger.import_records(batch)
+                    records += len(batch)
+                    batch = []
+
+                    now = time.monotonic()
+                    if now - last_report >= progress_interval:
+                        print(format_progress(records, f.buffer.tell(), total_bytes, now - started))
+                        last_report = now
+
+            if batch:
+                json_logger.import_records(batch)
+                records += len(batch)
+    finally:
+        if rollups is not None and not rebuild:
+            rollups.close()
+        if metric_store is not None:
+            metric_store.flush()
+        json_logger.close()
+        if event_store is not None:
+            event_store.close()
+        if event_counters is not None:
+            event_counters.close()
+
+    print(format_progress(records, total_bytes, total_bytes, time.monotonic() - started))
+    if rebuild:
+        print("🔄 Fusion avec les mesures existantes: tri du magasin de métriques")
+        metric_store.sort()
+        if rollups is not None:
+            print("🔄 Recalcul des agrégats 1m/5m/1h")
+            rollups.rebuild(metric_store.read_range())
+    print(f"✅ Migration terminée: {records} entrées")
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migration d'un log tableau JSON vers le stockage JSON Lines")
+    parser.add_argument('source', help="Ancien fichier de log (tableau JSON)")
+    parser.add_argument('--dest', default=LOG_FILE, help="Log de destination (défaut: LOG_FILE)")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Entrées écrites par lot")
+    parser.add_argument('--progress-interval', type=float, default=2.0, help="Secondes entre deux rapports")
+    parser.add_argument('--rebuild-stores', action='store_true',
+                        help="Fusionne avec un magasin de métriques déjà alimenté (tri et recalcul des agrégats)")
+    args = parser.parse_args()
+
+    if os.path.abspath(args.source) == os.path.abspath(args.dest):
+        print("❌ La source et la destination doivent être différentes")
+        return 1
+
+    try:
+        migrate(args.source, args.dest, args.batch_size, args.progress_interval, args.rebuild_stores)
+    except (ValueError, OSError) as e:
+        print(f"❌ Erreur de migration: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+import numpy as np
+from utils.metric_store import SYSTEM_METRIC_FIELDS
+
+# Niveaux d'agrégation -> résolution en secondes (diviseurs de 86400)
+ROLLUP_TIERS = {'1m': 60, '5m': 300, '1h': 3600}
+
+# Ordre des statistiques dans chaque cellule persistée
+# (count: échantillons où le champ est renseigné; absent des cellules écrites avant son ajout)
+ROLLUP_STATS = ('min', 'max', 'avg', 'last', 'count')
+
+
+def bucket_start(timestamp, resolution):
+    """Début de l'intervalle (datetime) contenant un timestamp ISO, aligné sur minuit"""
+    moment = datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp
+    seconds = moment.hour * 3600 + moment.minute * 60 + moment.second
+    midnight = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight + timedelta(seconds=seconds - seconds % resolution)
+
+
+def tier_path(path, tier):
+    """Chemin du fichier d'un niveau d'agrégation"""
+    return os.path.join(path, f"system-{tier}.jsonl")
+
+
+def choose_tier(resolution, tiers=ROLLUP_TIERS):
+    """
+    Retourne le niveau le plus grossier dont la résolution reste inférieure ou égale
+    à la résolution demandée (en secondes), ou None s'il faut lire les données brutes
+    """
+    candidates = [(seconds, tier) for tier, seconds in tiers.items() if seconds <= resolution]
+    return max(candidates)[1] if candidates else None
+
+
+class _Bucket:
+    """Agrégat en cours pour un intervalle"""
+
+    __slots__ = ('start', 'count', 'counts', 'minimum', 'maximum', 'total', 'last')
+
+    def __init__(self, start, fields):
+        self.start = start
+        self.count = 0
+        self.counts = dict.fromkeys(fields, 0)
+        self.minimum = dict.fromkeys(fields, float('inf'))
+        self.maximum = dict.fromkeys(fields, float('-inf'))
+        self.total = dict.fromkeys(fields, 0.0)
+        self.last = dict.fromkeys(fields)
+
+    def add(self, values):
+        self.count += 1
+        for field in self.total:
+            value = values.get(field)
+            if value is None:
+                continue
+            if value < self.minimum[field]:
+                self.minimum[field] = value
+            if value > self.maximum[field]:
+                self.maximum[field] = value
+            self.total[field] += value
+            self.counts[field] += 1
+            self.last[field] = value
+
+    def to_record(self):
+        record = {'t': self.start.isoformat(), 'n': self.count}
+        for field, total in self.total.items():
+            count = self.counts[field]
+            if count == 0:
+                continue
+            record[field] = [self.minimum[field], self.maximum[field],
+                             round(total / count, 4), self.last[field], count]
+        return record
+
+
+class RollupAggregator:
+    """
+    Agrégats incrémentaux (min/max/avg/last) des métriques système par niveau (1m/5m/1h)
+    Chaque intervalle est persisté dès sa fermeture dans logs/rollups/system-<niveau>.jsonl
+    """
+
+    def __init__(self, path="logs/rollups", fields=SYSTEM_METRIC_FIELDS, tiers=ROLLUP_TIERS):
+        self.path = path
+        self.fields = fields
+        self.tiers = tiers
+        self.lock = threading.Lock()
+        self.open_buckets = dict.fromkeys(tiers)
+        os.makedirs(path, exist_ok=True)
+
+    def add(self, timestamp, values):
+        """Ajoute un échantillon à chaque niveau, en persistant les intervalles fermés"""
+        moment = datetime.fromisoformat(timestamp)
+        closed = []
+
+        with self.lock:
+            for tier, resolution in self.tiers.items():
+                start = bucket_start(moment, resolution)
+                bucket = self.open_buckets[tier]
+                if bucket is not None and bucket.start != start:
+                    closed.append((tier, bucket))
+                    bucket = None
+                if bucket is None:
+                    bucket = self.open_buckets[tier] = _Bucket(start, self.fields)
+                bucket.add(values)
+
+            for tier, bucket in closed:
+                self._persist(tier, bucket)
+
+    def _persist(self, tier, bucket):
+        """Ajoute un intervalle au fichier de son niveau (appelé sous verrou)"""
+        with open(tier_path(self.path, tier), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(bucket.to_record(), separators=(',', ':')) + '\n')
+
+    def ingest(self, records):
+        """Observateur du logger: agrège les métriques système d'un lot d'entrées"""
+        for record in records:
+            if record.get('event_type') == 'metric' and record.get('metric_type') == 'system':
+                self.add(record['timestamp'], record['values'])
+
+    def close(self):
+        """
+        Persiste les intervalles ouverts (partiels)
+        Un intervalle repris après redémarrage est fusionné à la lecture
+        """
+        with self.lock:
+            for tier, bucket in self.open_buckets.items():
+                if bucket is not None and bucket.count > 0:
+                    self._persist(tier, bucket)
+            self.open_buckets = dict.fromkeys(self.tiers)
+
+    def rebuild(self, columns):
+        """
+        Recalcule tous les niveaux depuis des colonnes triées par timestamp (MetricStore.read_range),
+        en remplaçant les fichiers existants
+        """
+        with self.lock:
+            self.open_buckets = dict.fromkeys(self.tiers)
+            for tier in self.tiers:
+                file_path = tier_path(self.path, tier)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+
+        timestamps = columns['timestamp']
+        for position in range(len(timestamps)):
+            values = {}
+            for field in self.fields:
+                value = float(columns[field][position])
+                values[field] = None if np.isnan(value) else value
+            self.add(str(timestamps[position]), values)
+        self.close()
+
+
+def _cell_count(cell, row):
+    """Échantillons renseignés d'une cellule (nombre d'échantillons de la ligne pour l'ancien format)"""
+    return cell[4] if len(cell) > 4 else row['n']
+
+
+def _merge_rows(previous, row):
+    """Fusionne deux lignes persistées pour le même intervalle (moyennes pondérées par champ)"""
+    for field, cell in row.items():
+        if field in ('t', 'n'):
+            continue
+        if field not in previous:
+            previous[field] = cell
+            continue
+        old = previous[field]
+        old_count, count = _cell_count(old, previous), _cell_count(cell, row)
+        average = (old[2] * old_count + cell[2] * count) / (old_count + count)
+        previous[field] = [min(old[0], cell[0]), max(old[1], cell[1]), round(average, 4), cell[3],
+                           old_count + count]
+    previous['n'] += row['n']
+    return previous
+
+
+def _cell_stat(row, field, index):
+    """Statistique d'un champ dans une ligne persistée (NaN si absente)"""
+    cell = row.get(field)
+    if cell is None:
+        return np.nan
+    if index < len(cell):
+        return cell[index]
+    return row['n'] if ROLLUP_STATS[index] == 'count' else np.nan
+
+
+def read_rollups(path, tier, start=None, end=None, stat='avg'):
+    """
+    Lit un niveau d'agrégation entre start et end (timestamps ISO)
+    Retourne un dict de tableaux NumPy: 'timestamp' puis une série par métrique
+    """
+    rows = []
+    file_path = tier_path(path, tier)
+    if os.path.exists(file_path):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if start is not None and row['t'] < start:
+                    continue
+                if end is not None and row['t'] > end:
+                    continue
+                if rows and rows[-1]['t'] == row['t']:
+                    _merge_rows(rows[-1], row)
+                else:
+                    rows.append(row)
+
+    index = ROLLUP_STATS.index(stat)
+    series = {'timestamp': np.array([row['t'] for row in rows], dtype='datetime64[ms]')}
+    for field in SYSTEM_METRIC_FIELDS:
+        series[field] = np.array(
+            [_cell_stat(row, field, index) for row in rows], dtype='float32'
+        )
+    return series
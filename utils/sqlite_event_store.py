@@ -0,0 +1,150 @@
+import json
+import os
+import sqlite3
+import threading
+from utils.log_records import serialize_record
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    subtype TEXT,
+    service TEXT,
+    severity TEXT,
+    status TEXT,
+    message TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_type_time ON events (event_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_type_subtype_service ON events (event_type, subtype, service);
+"""
+
+INSERT_SQL = """
+INSERT INTO events (timestamp, event_type, subtype, service, severity, status, message, payload)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Champ portant le sous-type de chaque type d'événement
+SUBTYPE_FIELDS = {
+    'alert': 'alert_type',
+    'action': 'action_type',
+    'system': 'system_event_type'
+}
+
+# Colonnes utilisables comme filtres d'égalité dans les requêtes
+FILTER_COLUMNS = ('subtype', 'service', 'severity', 'status')
+
+
+def _event_row(record):
+    """Ligne SQL d'un événement (alerte, action ou événement système)"""
+    event_type = record['event_type']
+    details = record.get('details') or {}
+    service = record.get('service') or details.get('service')
+    return (
+        record['timestamp'],
+        event_type,
+        record.get(SUBTYPE_FIELDS[event_type]),
+        service,
+        record.get('severity'),
+        record.get('status'),
+        record.get('message'),
+        serialize_record(record)
+    )
+
+
+class SQLiteEventStore:
+    """
+    Stockage SQLite des événements (alertes, actions, événements système)
+    - mode WAL: les lectures du tableau de bord ne bloquent pas l'écriture
+    - insertions par lots dans une transaction unique (requête préparée)
+    - index (event_type, timestamp) et (event_type, subtype, service)
+    Les métriques restent dans le log JSON Lines et le magasin colonnaire
+    La base sert les dernières entrées (recent) et les requêtes filtrées et paginées de l'API
+    (iter_events); les agrégations du tableau de bord (comptes par type, service et statut) sont
+    lues dans les compteurs d'événements (utils.event_counters), qui remplacent les requêtes COUNT
+    """
+
+    def __init__(self, db_file="logs/events.db", readonly=False):
+        self.db_file = db_file
+        self.readonly = readonly
+        self.lock = threading.Lock()
+
+        if readonly:
+            if not os.path.exists(db_file):
+                raise FileNotFoundError(f"Base d'événements introuvable: {db_file}")
+            self.connection = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+            self.connection = sqlite3.connect(db_file, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(SCHEMA)
+
+    def ingest(self, records):
+        """Observateur du logger: insère les événements d'un lot en une transaction"""
+        rows = [_event_row(record) for record in records if record.get('event_type') in SUBTYPE_FIELDS]
+        if not rows:
+            return
+        with self.lock:
+            with self.connection:
+                self.connection.executemany(INSERT_SQL, rows)
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def recent(self, event_type, limit=10):
+        """Derniers événements d'un type (entrées d'origine, plus récentes en premier)"""
+        rows = self._query(
+            "SELECT payload FROM events WHERE event_type = ? ORDER BY timestamp DESC LIMIT ?",
+            (event_type, limit)
+        )
+        return [json.loads(payload) for (payload,) in rows]
+
+    def iter_events(self, event_type, filters=None, start=None, end=None, after=None,
+                    descending=False, limit=None, batch_size=500):
+        """
+        Itère sur les événements d'un type, triés par (timestamp, id), sous forme (id, timestamp, payload)
+        filters: {colonne: valeur} parmi subtype, service, severity, status
+        after: (timestamp, id) du dernier événement déjà lu (pagination par curseur)
+        Les lignes sont lues par lots: le verrou n'est jamais gardé entre deux lots
+        """
+        clauses = ["event_type = ?"]
+        params = [event_type]
+        for column, value in (filters or {}).items():
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"Filtre inconnu: {column}")
+            clauses.append(f"{column} = ?")
+            params.append(value)
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp <= ?")
+            params.append(end)
+        if after is not None:
+            operator = '<' if descending else '>'
+            clauses.append(f"(timestamp {operator} ? OR (timestamp = ? AND id {operator} ?))")
+            params.extend([after[0], after[0], after[1]])
+
+        order = 'DESC' if descending else 'ASC'
+        sql = (f"SELECT id, timestamp, payload FROM events WHERE {' AND '.join(clauses)} "
+               f"ORDER BY timestamp {order}, id {order}")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self.lock:
+            cursor = self.connection.execute(sql, params)
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+    def close(self):
+        """Ferme la connexion"""
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,301 @@
+"""
+API REST d'interrogation de l'historique, servie par le serveur du tableau de bord
+
+    GET /api/metrics   ?type=system|service_status|...  &service=  &fields=cpu_percent,memory_percent
+    GET /api/alerts    ?type=<alert_type>  &severity=  &service=
+    GET /api/actions   ?type=<action_type> &status=    &service=
+    GET /api/services  ?service=  &status=  &latest=true
+
+Paramètres communs: start / end (timestamps ISO), limit, order=asc|desc, cursor
+Réponse: {"items": [...], "count": n, "next_cursor": "..." | null}, envoyée au fil de la lecture
+(la page n'est jamais construite en mémoire); next_cursor se passe tel quel à la requête suivante.
+Sources: base SQLite des événements si elle existe, magasin colonnaire pour les métriques système
+dont tous les champs demandés (fields) y sont conservés, sinon le log via son index annexe
+(seuls les offsets des types demandés sont lus). Sans fields, les entrées complètes du log sont
+renvoyées (répartition CPU, cœurs, métadonnées); avec fields, chaque entrée ne contient que ces
+valeurs, horodatées à la milliseconde quelle que soit la source.
+"""
+import base64
+import json
+from datetime import datetime
+import numpy as np
+from flask import Blueprint, Response, request
+from config.settings import API_PAGE_SIZE, API_MAX_PAGE_SIZE, MONITORED_SERVICES
+from utils.log_index import iter_query_records, latest_records
+from utils.log_records import serialize_record
+
+# Filtres acceptés par type d'entrée: paramètre -> valeur extraite d'une entrée du log
+EVENT_FILTERS = {
+    'alert': {
+        'type': lambda record: record.get('alert_type'),
+        'severity': lambda record: record.get('severity'),
+        'service': lambda record: (record.get('details') or {}).get('service')
+    },
+    'action': {
+        'type': lambda record: record.get('action_type'),
+        'status': lambda record: record.get('status'),
+        'service': lambda record: record.get('service')
+    }
+}
+METRIC_FILTERS = {
+    'service': lambda record: (record.get('values') or {}).get('service'),
+    'status': lambda record: (record.get('values') or {}).get('status')
+}
+
+# Paramètre de l'API -> colonne de la base SQLite des événements
+SQL_COLUMNS = {'type': 'subtype', 'severity': 'severity', 'status': 'status', 'service': 'service'}
+
+# Nombre d'entrées regroupées par écriture dans la réponse
+CHUNK_ITEMS = 100
+
+
+class QueryError(ValueError):
+    """Paramètre de requête invalide (réponse 400)"""
+
+
+def encode_cursor(source, timestamp, position):
+    """Curseur opaque: source, timestamp et position de la dernière entrée renvoyée"""
+    payload = json.dumps([source, timestamp, position], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, source):
+    """Retourne (timestamp, position) d'un curseur produit par la même source"""
+    try:
+        kind, timestamp, position = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError):
+        raise QueryError("Curseur invalide") from None
+    if kind != source:
+        raise QueryError("Curseur invalide (source de données différente)")
+    return timestamp, position
+
+
+def _parse_timestamp(value, name):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        raise QueryError(f"{name}: timestamp ISO attendu") from None
+
+
+class PageQuery:
+    """Paramètres communs d'une requête paginée"""
+
+    def __init__(self, args):
+        self.start = _parse_timestamp(args.get('start'), 'start')
+        self.end = _parse_timestamp(args.get('end'), 'end')
+        self.cursor = args.get('cursor')
+
+        order = args.get('order', 'asc')
+        if order not in ('asc', 'desc'):
+            raise QueryError("order: 'asc' ou 'desc' attendu")
+        self.descending = order == 'desc'
+
+        try:
+            self.limit = int(args.get('limit', API_PAGE_SIZE))
+        except ValueError:
+            raise QueryError("limit: entier attendu") from None
+        if not 1 <= self.limit <= API_MAX_PAGE_SIZE:
+            raise QueryError(f"limit: entre 1 et {API_MAX_PAGE_SIZE}")
+
+
+class HistoryQuery:
+    """
+    Requêtes paginées sur l'historique, pour les scripts et outils externes
+    Chaque source produit des (timestamp, position, JSON de l'entrée) dans l'ordre demandé;
+    la position départage les entrées de même timestamp dans le curseur
+    """
+
+    def __init__(self, log_file, get_metric_store=None, get_event_store=None):
+        self.log_file = log_file
+        self.get_metric_store = get_metric_store or (lambda: None)
+        self.get_event_store = get_event_store or (lambda: None)
+
+    def events(self, event_type, page, filters):
+        """Alertes ou actions: base SQLite si disponible, sinon log indexé"""
+        store = self.get_event_store()
+        if store is not None:
+            after = decode_cursor(page.cursor, 'sql') if page.cursor else None
+            return 'sql', self._sql_items(store, event_type, page, filters, after)
+        matchers = {EVENT_FILTERS[event_type][name]: value for name, value in filters.items()}
+        after = decode_cursor(page.cursor, 'log') if page.cursor else None
+        return 'log', self._log_items([event_type], page, matchers, after)
+
+    def metrics(self, metric_type, page, filters, fields=None):
+        """
+        Métriques: magasin colonnaire pour les métriques système si fields ne demande que des
+        colonnes qu'il conserve, sinon log indexé (entrées complètes, ou projetées sur fields)
+        """
+        store = self.get_metric_store() if metric_type == 'system' and fields and not filters else None
+        if store is not None and set(fields) <= set(store.fields):
+            after = decode_cursor(page.cursor, 'store') if page.cursor else None
+            return 'store', self._store_items(store, page, after, fields)
+        matchers = {METRIC_FILTERS[name]: value for name, value in filters.items()}
+        after = decode_cursor(page.cursor, 'log') if page.cursor else None
+        project = (lambda record: _project_metric(record, fields)) if fields else None
+        return 'log', self._log_items([f'metric:{metric_type}'], page, matchers, after, project)
+
+    def latest_services(self, service=None):
+        """Dernier statut de chaque service (index des dernières entrées, sinon lecture à rebours)"""
+        latest = latest_records(self.log_file)
+        if latest is None:
+            latest = {}
+            expected = set(MONITORED_SERVICES)
+            for record in iter_query_records(self.log_file, ['metric:service_status'], newest_first=True):
+                name = record['values'].get('service')
+                latest.setdefault(name, record)
+                if expected <= latest.keys():
+                    break
+        if service is not None:
+            latest = {name: record for name, record in latest.items() if name == service}
+        return [latest[name] for name in sorted(latest, key=str)]
+
+    def _sql_items(self, store, event_type, page, filters, after):
+        columns = {SQL_COLUMNS[name]: value for name, value in filters.items()}
+        for event_id, timestamp, payload in store.iter_events(
+                event_type, columns, page.start, page.end, after, page.descending, page.limit + 1):
+            yield timestamp, event_id, payload
+
+    def _log_items(self, kinds, page, matchers, after, project=None):
+        start, end = page.start, page.end
+        after, skip = after or (None, 0)
+        if after is not None:
+            # Reprise au timestamp du curseur, en sautant les entrées déjà renvoyées à ce timestamp
+            if page.descending:
+                end = after if end is None else min(end, after)
+            else:
+                start = after if start is None else max(start, after)
+
+        last_timestamp, position = None, 0
+        for record in iter_query_records(self.log_file, kinds, start, end, page.descending):
+            if any(match(record) != value for match, value in matchers.items()):
+                continue
+            timestamp = record.get('timestamp', '')
+            if timestamp == after and skip > 0:
+                skip -= 1
+                last_timestamp, position = timestamp, position + 1
+                continue
+            position = position + 1 if timestamp == last_timestamp else 1
+            last_timestamp = timestamp
+            yield timestamp, position, serialize_record(project(record) if project else record)
+
+    def _store_items(self, store, page, after, fields):
+        # Positions absolues des lignes (le magasin ne fait qu'ajouter): curseur stable
+        first, last = store.index_range(page.start, page.end)
+        if after is not None:
+            if page.descending:
+                last = min(last, after[1])
+            else:
+                first = max(first, after[1] + 1)
+        rows = range(last - 1, first - 1, -1) if page.descending else range(first, last)
+
+        columns = store.columns
+        for row in rows:
+            values = {}
+            for field in fields:
+                value = float(columns[field][row])
+                values[field] = None if value != value else round(value, 3)
+            record = {'timestamp': str(columns['timestamp'][row]), 'event_type': 'metric',
+                      'metric_type': 'system', 'values': values}
+            yield str(columns['timestamp'][row]), row, serialize_record(record)
+
+
+def _project_metric(record, fields):
+    """Entrée du log réduite aux valeurs demandées, au format du magasin colonnaire"""
+    values = record.get('values') or {}
+    projected = {}
+    for field in fields:
+        value = values.get(field)
+        projected[field] = round(float(value), 3) if isinstance(value, (int, float)) else value
+    return {'timestamp': str(np.datetime64(record['timestamp'], 'ms')), 'event_type': 'metric',
+            'metric_type': record.get('metric_type'), 'values': projected}
+
+
+def _fields(value):
+    """Liste des champs de fields=a,b (None si absent)"""
+    if not value:
+        return None
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    return fields or None
+
+
+def stream_page(source, items, limit):
+    """
+    Réponse JSON envoyée au fil de la lecture des entrées
+    Une entrée de plus que la limite est lue pour savoir s'il existe une page suivante
+    """
+    def generate():
+        yield '{"items":['
+        chunk = []
+        count = 0
+        last = None
+        has_more = False
+        for timestamp, position, text in items:
+            if count == limit:
+                has_more = True
+                break
+            chunk.append(text if count == 0 else ',' + text)
+            count += 1
+            last = (timestamp, position)
+            if len(chunk) >= CHUNK_ITEMS:
+                yield ''.join(chunk)
+                chunk = []
+        if chunk:
+            yield ''.join(chunk)
+        next_cursor = encode_cursor(source, *last) if has_more else None
+        yield f'],"count":{count},"next_cursor":{json.dumps(next_cursor)}}}'
+
+    return Response(generate(), mimetype='application/json', headers={'Cache-Control': 'no-cache'})
+
+
+def _error(message, status=400):
+    return Response(json.dumps({'error': message}, ensure_ascii=False), status=status,
+                    mimetype='application/json')
+
+
+def _filters(names):
+    """Filtres renseignés dans la requête parmi ceux acceptés"""
+    return {name: request.args[name] for name in names if request.args.get(name)}
+
+
+def create_api_blueprint(history):
+    """Blueprint Flask des routes /api/* (enregistré sur le serveur du tableau de bord)"""
+    api = Blueprint('history_api', __name__, url_prefix='/api')
+
+    @api.errorhandler(QueryError)
+    def invalid_query(error):
+        return _error(str(error))
+
+    def events_route(event_type):
+        page = PageQuery(request.args)
+        source, items = history.events(event_type, page, _filters(EVENT_FILTERS[event_type]))
+        return stream_page(source, items, page.limit)
+
+    @api.route('/alerts')
+    def alerts():
+        return events_route('alert')
+
+    @api.route('/actions')
+    def actions():
+        return events_route('action')
+
+    @api.route('/metrics')
+    def metrics():
+        page = PageQuery(request.args)
+        metric_type = request.args.get('type') or 'system'
+        source, items = history.metrics(metric_type, page, _filters(['service']),
+                                        _fields(request.args.get('fields')))
+        return stream_page(source, items, page.limit)
+
+    @api.route('/services')
+    def services():
+        if request.args.get('latest', '').lower() in ('1', 'true'):
+            items = history.latest_services(request.args.get('service'))
+            return Response(json.dumps({'items': items, 'count': len(items), 'next_cursor': None},
+                                       ensure_ascii=False), mimetype='application/json')
+        page = PageQuery(request.args)
+        source, items = history.metrics('service_status', page, _filters(METRIC_FILTERS))
+        return stream_page(source, items, page.limit)
+
+    return api
@@ -0,0 +1,22 @@
+// Sorties des composants lues sur /data/<composant> (callbacks côté navigateur)
+// Le JSON rendu une seule fois par version côté serveur est partagé par tous les visiteurs;
+// la requête est conditionnelle (If-None-Match): une réponse 304 réutilise la copie du navigateur
+window.dashboardData = {
+    fetchComponent: function (componentId, sources, version) {
+        var noUpdate = window.dash_clientside.no_update;
+        if (!version) {
+            return noUpdate;
+        }
+        var changed = version.changed || [];
+        if (sources && !sources.some(function (name) { return changed.indexOf(name) >= 0; })) {
+            return noUpdate;
+        }
+        return fetch('/data/' + componentId, {cache: 'no-cache', credentials: 'same-origin'})
+            .then(function (response) {
+                return response.ok ? response.json() : noUpdate;
+            })
+            .catch(function () {
+                return noUpdate;
+            });
+    }
+};
@@ -0,0 +1,14 @@
+// Mises à jour en direct: le serveur signale chaque nouvelle version des données
+// (Server-Sent Events) et le bouton caché déclenche le rafraîchissement des composants
+(function () {
+    if (!window.EventSource) {
+        return;
+    }
+    var source = new EventSource('/stream');
+    source.onmessage = function () {
+        var trigger = document.getElementById('live-trigger');
+        if (trigger) {
+            trigger.click();
+        }
+    };
+})();
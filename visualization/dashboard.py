@@ -1,116 +1,686 @@
 import json
+import bisect
 import os
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State, no_update
 import dash_bootstrap_components as dbc
+from flask import Response, request
+from config.settings import (
+    LOG_FILE, LEGACY_LOG_FILE, METRIC_STORE_ENABLED, METRIC_STORE_PATH,
+    ROLLUPS_ENABLED, ROLLUP_PATH, DASHBOARD_MAX_POINTS, DASHBOARD_RENDER_CACHE_SIZE,
+    LOG_SQLITE_ENABLED, LOG_SQLITE_FILE, EVENT_COUNTERS_ENABLED, EVENT_COUNTERS_BUCKET_SECONDS
+)
+from utils.event_counters import EventCounters, counters_path, COUNTED_EVENT_TYPES, COUNTER_DIMENSIONS
+from utils.log_reader import LogTailReader, log_mtime, check_legacy_log
+from utils.log_index import has_index, query_records, latest_records
+from utils.metric_store import MetricStore
+from utils.rollups import ROLLUP_TIERS, choose_tier, read_rollups
+from utils.sqlite_event_store import SQLiteEventStore
+from visualization.api import HistoryQuery, create_api_blueprint
+from visualization.downsampling import downsample_series
+from visualization.render_cache import RenderCache
+
+# Colonnes du magasin de métriques -> noms utilisés par les graphiques
+SYSTEM_METRIC_COLUMNS = {
+    'cpu': 'cpu_percent',
+    'memory': 'memory_percent',
+    'disk': 'disk_percent',
+    'network': 'total_network_mb'
+}
+
+# Fenêtres temporelles du graphique des métriques (secondes; None: toute la période)
+TIME_RANGES = {
+    '15m': 15 * 60,
+    '1h': 3600,
+    '24h': 24 * 3600,
+    '7d': 7 * 24 * 3600
+}
+DEFAULT_TIME_RANGE = '24h'
+
+# Colonnes des tampons par type d'entrée (remplis une seule fois, à la lecture du log)
+BUFFER_COLUMNS = {
+    'system': ('timestamp', 'cpu', 'memory', 'disk', 'network'),
+    'alert': ('timestamp', 'type', 'severity', 'message', 'service'),
+    'action': ('timestamp', 'type', 'status', 'message', 'service'),
+    'service_status': ('timestamp', 'service', 'status')
+}
+
+
+def metric_text(value, unit):
+    """Valeur d'une carte de métrique ('—' si jamais mesurée)"""
+    return "—" if value is None else f"{value:.1f}{unit}"
+
+
+def metric_color(value, limit):
+    """Couleur d'une carte de métrique selon son seuil (gris si jamais mesurée)"""
+    if value is None:
+        return 'gray'
+    return 'red' if value > limit else 'green'
+
+
+class EventBuffer:
+    """
+    Entrées d'un type stockées par colonnes (listes, en ajout seul)
+    Les lecteurs passent par view(): une vue figée sur les lignes complètes
+    """
+
+    __slots__ = ('columns',)
+
+    def __init__(self, names):
+        self.columns = {name: [] for name in names}
+
+    def append(self, row):
+        # Le timestamp (qui détermine la longueur) est ajouté en dernier
+        for name, values in self.columns.items():
+            if name != 'timestamp':
+                values.append(row[name])
+        self.columns['timestamp'].append(row['timestamp'])
+
+    def __len__(self):
+        return len(self.columns['timestamp'])
+
+    def view(self):
+        return BufferView(self.columns, len(self))
+
+
+class BufferView:
+    """Vue figée des size premières lignes d'un tampon (les listes ne font que croître)"""
+
+    __slots__ = ('columns', 'size')
+
+    def __init__(self, columns, size):
+        self.columns = columns
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def column(self, name, first=0):
+        return self.columns[name][first:self.size]
+
+    def row(self, position):
+        return {name: values[position] for name, values in self.columns.items()}
+
+    def to_frame(self):
+        return pd.DataFrame({name: values[:self.size] for name, values in self.columns.items()})
+
+
+class DataSnapshot:
+    """
+    Instantané des données publié à chaque version, une fois les entrées entièrement intégrées
+    Les lecteurs (callbacks Dash, SSE, /data) ne lisent que l'instantané courant, sans verrou
+    """
+
+    __slots__ = ('version', 'type_versions', 'buffers', 'latest_services', 'counters')
+
+    def __init__(self, version, type_versions, buffers, latest_services, counters):
+        self.version = version
+        self.type_versions = type_versions
+        self.buffers = {name: buffer.view() for name, buffer in buffers.items()}
+        self.latest_services = dict(latest_services)
+        # Copie: les compteurs vivants continuent d'être incrémentés après la publication
+        self.counters = counters.copy()
+
 
 class MonitoringDashboard:
-    def __init__(self, log_file="logs/monitoring.json", port=8050):
+    def __init__(self, log_file=LOG_FILE, port=8050, metric_store_path=METRIC_STORE_PATH, event_bus=None):
         self.log_file = log_file
+        check_legacy_log(log_file, LEGACY_LOG_FILE)
         self.port = port
         self.last_modified = 0
-        self.data = []
+        self.buffers = {}
+        self.latest_services = {}
+        self.data_version = 0
+        self.type_versions = {name: 0 for name in BUFFER_COLUMNS}
+        self.refresh_lock = threading.Lock()
+        self.version_changed = threading.Condition()
+        # Mode direct: entrées reçues par le bus d'événements (surveillance dans le même processus)
+        # L'abonnement précède toute lecture du log: aucune entrée publiée ne peut être manquée
+        self.event_bus = event_bus
+        self.subscription = event_bus.subscribe() if event_bus is not None else None
+        self.live = event_bus is not None
+        self._consumer = None
+        self._cache = {}
+        self._cache_version = None
+        self.cache_lock = threading.Lock()
+        # Sorties rendues partagées entre visiteurs (une construction par version des données)
+        self.render_cache = RenderCache(DASHBOARD_RENDER_CACHE_SIZE)
+        self.components = {}
+        self._reset_buffers()
+        self.tail_reader = LogTailReader(log_file)
+        self.metric_store_path = metric_store_path if METRIC_STORE_ENABLED else None
+        self.metric_store = None
+        self.rollup_path = ROLLUP_PATH if ROLLUPS_ENABLED else None
+        self.event_store_file = LOG_SQLITE_FILE if LOG_SQLITE_ENABLED else None
+        self.event_store = None
+        self.counters_file = counters_path(log_file) if EVENT_COUNTERS_ENABLED else None
+        self.stored_counters = None
+        self.counters_modified = 0
+        self.snapshot = self._make_snapshot(self.data_version, self.type_versions)
+    
+    def get_metric_store(self):
+        """Ouvre le magasin de métriques en lecture seule dès qu'il existe"""
+        if self.metric_store is None and self.metric_store_path:
+            try:
+                self.metric_store = MetricStore(self.metric_store_path, readonly=True)
+            except FileNotFoundError:
+                return None
+        return self.metric_store
         
+    def get_event_store(self):
+        """Ouvre la base SQLite des événements en lecture seule dès qu'elle existe"""
+        if self.event_store is None and self.event_store_file:
+            try:
+                self.event_store = SQLiteEventStore(self.event_store_file, readonly=True)
+            except FileNotFoundError:
+                return None
+        return self.event_store
+    
+    def get_event_counters(self):
+        """
+        Compteurs d'événements: fichier tenu à jour par la surveillance s'il existe,
+        sinon (mode direct, fichier absent) compteurs tenus à la lecture des entrées
+        """
+        if self.live or self.stored_counters is None:
+            return self.counters
+        return self.stored_counters
+    
+    def _reload_counters(self):
+        """
+        Recharge le fichier des compteurs s'il a changé
+        Retourne les types d'événements dont les comptes ont changé (fichier réécrit sans
+        changement pour eux: aucun composant à recalculer)
+        """
+        if self.live or self.counters_file is None or not os.path.exists(self.counters_file):
+            return []
+        modified = os.path.getmtime(self.counters_file)
+        if modified <= self.counters_modified:
+            return []
+        counters = EventCounters.load(self.counters_file)
+        if counters is None:
+            return []
+        previous = self.stored_counters
+        self.stored_counters = counters
+        self.counters_modified = modified
+        if previous is None:
+            return list(COUNTED_EVENT_TYPES)
+        return [
+            event_type for event_type in COUNTED_EVENT_TYPES
+            if counters.counts(event_type, COUNTER_DIMENSIONS) != previous.counts(event_type, COUNTER_DIMENSIONS)
+        ]
+    
+    def _query_store(self):
+        """Base SQLite pour les requêtes sur les événements (mode direct: la mémoire est plus à jour)"""
+        return None if self.live else self.get_event_store()
+    
+    def _use_index(self):
+        """Index annexe du log pour les requêtes (mode direct: la mémoire est plus à jour)"""
+        return not self.live and has_index(self.log_file)
+    
     def load_data(self):
-        """Charge les données depuis le fichier JSON"""
+        """
+        Charge les nouvelles entrées du log (JSON Lines ou tableau JSON)
+        Seules les lignes ajoutées depuis la lecture précédente sont analysées;
+        rechargement complet après rotation, troncature ou suppression d'un segment
+        """
         try:
-            if os.path.exists(self.log_file) and os.path.getsize(self.log_file) > 0:
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    self.data = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError) as e:
+            records, reloaded = self.tail_reader.read()
+        except (json.JSONDecodeError, OSError, ValueError) as e:
             print(f"Erreur lecture données: {e}")
-            self.data = []
+            self.tail_reader.reset()
+            self._reset_buffers()
+            self._bump_version(BUFFER_COLUMNS)
+            return
+        
+        self._apply_records(records, reloaded)
+        if records:
+            # Dernière entrée lue: les doublons publiés sur le bus seront ignorés
+            self.loaded_until = records[-1]['timestamp']
+    
+    def _apply_records(self, records, reloaded=False):
+        """Intègre des entrées (log ou bus) aux tampons et publie une nouvelle version si besoin"""
+        if reloaded:
+            self._reset_buffers()
+        if records or reloaded:
+            sizes = {name: len(buffer) for name, buffer in self.buffers.items()}
+            self._demultiplex(records)
+            changed = BUFFER_COLUMNS if reloaded else [
+                name for name, buffer in self.buffers.items() if len(buffer) != sizes[name]
+            ]
+            self._bump_version(changed)
+    
+    def _make_snapshot(self, version, type_versions):
+        return DataSnapshot(version, type_versions, self.buffers, self.latest_services, self.get_event_counters())
+    
+    def _bump_version(self, changed):
+        """
+        Nouvelle version des données (appelé sous refresh_lock, entrées entièrement intégrées)
+        L'instantané est publié avant la version: une version annoncée est toujours lisible
+        """
+        with self.version_changed:
+            version = self.data_version + 1
+            type_versions = dict(self.type_versions)
+            for name in changed:
+                type_versions[name] = version
+            self.snapshot = self._make_snapshot(version, type_versions)
+            self.type_versions = type_versions
+            self.data_version = version
+            self.version_changed.notify_all()
+    
+    def start_live_updates(self):
+        """
+        Mode direct: chargement initial de l'historique depuis le log, puis intégration
+        des entrées publiées par la surveillance (sans relecture du fichier)
+        Le tableau de bord doit être créé avant le démarrage de la surveillance
+        """
+        if self.subscription is None or self._consumer is not None:
+            return
+        with self.refresh_lock:
+            self.load_data()
+        self._consumer = threading.Thread(target=self._consume_events, name="dashboard-events", daemon=True)
+        self._consumer.start()
+    
+    def _consume_events(self):
+        """
+        Thread du mode direct: applique chaque lot publié dès sa réception
+        La version (annoncée aux navigateurs par /stream) n'est publiée qu'une fois le lot
+        entièrement intégré, avec l'instantané que liront les callbacks qu'elle déclenche
+        """
+        while True:
+            records = self.subscription.get()
+            with self.refresh_lock:
+                if self.subscription.overflowed:
+                    # Retard excessif: resynchronisation complète depuis le log
+                    print("⚠️ Tableau de bord en retard sur le bus d'événements: rechargement du log")
+                    self.subscription.clear()
+                    self.tail_reader.reset()
+                    self.load_data()
+                    continue
+                # Entrées déjà lues dans le log (publiées avant la lecture initiale) ignorées
+                loaded_until = self.loaded_until
+                if loaded_until:
+                    records = [entry for entry in records if entry['timestamp'] > loaded_until]
+                    self.loaded_until = None
+                self._apply_records(records)
+    
+    def stream_events(self, heartbeat=15.0):
+        """
+        Flux Server-Sent Events: la version des données à chaque changement (commentaire sinon)
+        Seules les versions dont l'instantané est publié sont annoncées (lot entièrement intégré)
+        """
+        sent = None
+        while True:
+            with self.version_changed:
+                if sent == self.snapshot.version:
+                    self.version_changed.wait(heartbeat)
+                version = self.snapshot.version
+            if version != sent:
+                sent = version
+                yield f"data: {version}\n\n"
+            else:
+                yield ": keepalive\n\n"
+    
+    def refresh_data(self):
+        """Recharge les données si le log a été modifié depuis la dernière lecture"""
+        if self.live:
+            # Mode direct: les données sont déjà à jour
+            return
+        with self.refresh_lock:
+            current_modified = log_mtime(self.log_file)
+            if current_modified > self.last_modified:
+                self.load_data()
+                self.last_modified = current_modified
+            changed = self._reload_counters()
+            if changed:
+                self._bump_version(changed)
+    
+    def changed_types(self, since=None, snapshot=None):
+        """Types d'entrées modifiés depuis une version (tous si la version est inconnue)"""
+        snapshot = snapshot or self.snapshot
+        if since is None or since > snapshot.version:
+            return list(BUFFER_COLUMNS)
+        return [name for name, version in snapshot.type_versions.items() if version > since]
+    
+    def _reset_buffers(self):
+        """Vide les tampons par type d'entrée"""
+        self.buffers = {name: EventBuffer(columns) for name, columns in BUFFER_COLUMNS.items()}
+        self.latest_services = {}
+        self.counters = EventCounters(bucket_seconds=EVENT_COUNTERS_BUCKET_SECONDS, retention_days=0)
+        self.loaded_until = None
+    
+    def _demultiplex(self, records):
+        """Répartit les nouvelles entrées dans les tampons par type (un seul parcours)"""
+        buffers = self.buffers
+        for entry in records:
+            event_type = entry.get('event_type')
+            if event_type == 'alert':
+                buffers['alert'].append(self._alert_row(entry))
+            elif event_type == 'action':
+                buffers['action'].append(self._action_row(entry))
+            elif event_type == 'metric':
+                metric_type = entry.get('metric_type')
+                if metric_type == 'system':
+                    buffers['system'].append(self._system_row(entry))
+                elif metric_type == 'service_status':
+                    row = self._service_row(entry)
+                    buffers['service_status'].append(row)
+                    self.latest_services[row['service']] = row
+        self.counters.ingest(records)
+    
+    def _cached(self, key, compute):
+        """
+        Résultat de compute(instantané) mis en cache pour la version courante des données
+        Un résultat calculé sur un instantané remplacé entre-temps est retourné sans être conservé
+        Les DataFrames et agrégats retournés sont partagés: ne pas les modifier en place
+        """
+        snapshot = self.snapshot
+        with self.cache_lock:
+            if self._cache_version == snapshot.version and key in self._cache:
+                return self._cache[key]
+        
+        value = compute(snapshot)
+        with self.cache_lock:
+            if snapshot is not self.snapshot:
+                return value
+            if self._cache_version != snapshot.version:
+                self._cache = {}
+                self._cache_version = snapshot.version
+            return self._cache.setdefault(key, value)
+    
+    def get_system_metric_arrays(self, start=None, end=None, resolution=None):
+        """Séries système (tableaux), mises en cache pour la version courante des données"""
+        return self._cached(
+            ('system_arrays', start, end, resolution),
+            lambda snapshot: self._read_system_metric_arrays(snapshot, start, end, resolution)
+        )
+    
+    def _read_system_metric_arrays(self, snapshot, start=None, end=None, resolution=None):
+        """
+        Retourne les séries système sous forme de tableaux (timestamp, cpu, memory, disk, network)
+        - resolution (secondes par point): lecture du niveau d'agrégation le plus grossier adapté,
+          complété par les échantillons bruts postérieurs au dernier intervalle persisté
+        - sinon depuis le magasin colonnaire: vues sans copie sur l'intervalle demandé
+        """
+        if self.live and resolution is None and start is not None and end is None:
+            # Mode direct: échantillons récents lus en mémoire (en avance sur le magasin)
+            return self._buffer_system_arrays(snapshot, start)
+        
+        store = self.get_metric_store()
+        tier = choose_tier(resolution) if resolution and self.rollup_path else None
+        if tier is not None:
+            columns = read_rollups(self.rollup_path, tier, start, end)
+            if len(columns['timestamp']) > 0:
+                if store is not None:
+                    tail_start = columns['timestamp'][-1] + np.timedelta64(ROLLUP_TIERS[tier], 's')
+                    tail = store.read_range(tail_start, end)
+                    columns = {name: np.concatenate([values, tail[name]]) for name, values in columns.items()}
+                return self._chart_series(columns)
+        
+        if store is not None:
+            return self._chart_series(store.read_range(start, end))
+        
+        df = self._system_metrics_frame(snapshot)
+        if start is not None:
+            df = df[df['timestamp'] >= start]
+        if end is not None:
+            df = df[df['timestamp'] <= end]
+        if df.empty:
+            return {'timestamp': []}
+        series = {name: df[name].to_numpy() for name in df.columns}
+        series['timestamp'] = np.array(series['timestamp'], dtype='datetime64[ms]')
+        return series
+    
+    def _buffer_system_arrays(self, snapshot, start):
+        """Échantillons système en mémoire à partir de start (tampon chronologique)"""
+        buffer = snapshot.buffers['system']
+        first = bisect.bisect_left(buffer.columns['timestamp'], start, 0, len(buffer))
+        series = {name: np.asarray(buffer.column(name, first), dtype='float64') for name in buffer.columns
+                  if name != 'timestamp'}
+        series['timestamp'] = np.array(buffer.column('timestamp', first), dtype='datetime64[ms]')
+        return series
+    
+    def get_latest_system_metrics(self):
+        """
+        Dernières valeurs système mesurées (cpu, memory, disk, network) ou None
+        Chaque métrique prend sa dernière mesure (None si jamais mesurée): les collecteurs
+        tournant à des intervalles différents, une entrée ne porte pas toutes les métriques
+        """
+        buffer = self.snapshot.buffers['system']
+        if len(buffer) > 0:
+            latest = {'timestamp': buffer.columns['timestamp'][len(buffer) - 1]}
+            for name in SYSTEM_METRIC_COLUMNS:
+                values = buffer.columns[name]
+                latest[name] = next(
+                    (values[row] for row in range(len(buffer) - 1, -1, -1) if values[row] is not None), None
+                )
+            return latest
+        store = self.get_metric_store()
+        latest = store.latest(measured=True) if store is not None else None
+        if latest is None:
+            return None
+        return {
+            name: None if np.isnan(latest[field]) else float(latest[field])
+            for name, field in SYSTEM_METRIC_COLUMNS.items()
+        }
+    
+    @staticmethod
+    def _chart_series(columns):
+        """Renomme les colonnes du magasin selon les noms utilisés par les graphiques"""
+        series = {'timestamp': columns['timestamp']}
+        for name, field in SYSTEM_METRIC_COLUMNS.items():
+            series[name] = columns[field]
+        return series
     
     def get_system_metrics(self):
         """Extrait les métriques système"""
-        system_data = []
-        for entry in self.data:
-            if entry.get('event_type') == 'metric' and entry.get('metric_type') == 'system':
-                system_data.append({
-                    'timestamp': entry['timestamp'],
-                    'cpu': entry['values']['cpu_percent'],
-                    'memory': entry['values']['memory_percent'],
-                    'disk': entry['values']['disk_percent'],
-                    'network': entry['values']['total_network_mb']
-                })
-        return pd.DataFrame(system_data)
+        return self._cached('system', self._system_metrics_frame)
+    
+    def _system_metrics_frame(self, snapshot):
+        store = self.get_metric_store()
+        if store is not None and not self.live:
+            return pd.DataFrame(self.get_system_metric_arrays())
+        return snapshot.buffers['system'].to_frame()
+    
+    @staticmethod
+    def _system_row(entry):
+        """Ligne des métriques système pour une entrée du log"""
+        values = entry['values']
+        return {
+            'timestamp': entry['timestamp'],
+            'cpu': values.get('cpu_percent'),
+            'memory': values.get('memory_percent'),
+            'disk': values.get('disk_percent'),
+            'network': values.get('total_network_mb')
+        }
+    
+    @staticmethod
+    def _alert_row(entry):
+        """Ligne du tableau des alertes pour une entrée du log"""
+        return {
+            'timestamp': entry['timestamp'],
+            'type': entry['alert_type'],
+            'severity': entry['severity'],
+            'message': entry['message'],
+            'service': entry['details'].get('service', 'Système')
+        }
+    
+    @staticmethod
+    def _action_row(entry):
+        """Ligne du tableau des actions pour une entrée du log"""
+        return {
+            'timestamp': entry['timestamp'],
+            'type': entry['action_type'],
+            'status': entry['status'],
+            'message': entry['message'],
+            'service': entry.get('service', 'N/A')
+        }
+    
+    @staticmethod
+    def _service_row(entry):
+        """Ligne du tableau des services pour une entrée du log"""
+        return {
+            'timestamp': entry['timestamp'],
+            'service': entry['values']['service'],
+            'status': entry['values']['status']
+        }
     
     def get_alerts(self):
         """Extrait les alertes"""
-        alerts = []
-        for entry in self.data:
-            if entry.get('event_type') == 'alert':
-                alerts.append({
-                    'timestamp': entry['timestamp'],
-                    'type': entry['alert_type'],
-                    'severity': entry['severity'],
-                    'message': entry['message'],
-                    'service': entry['details'].get('service', 'Système')
-                })
-        return pd.DataFrame(alerts)
+        return self._cached('alert', lambda snapshot: snapshot.buffers['alert'].to_frame())
     
     def get_actions(self):
         """Extrait les actions"""
-        actions = []
-        for entry in self.data:
-            if entry.get('event_type') == 'action':
-                actions.append({
-                    'timestamp': entry['timestamp'],
-                    'type': entry['action_type'],
-                    'status': entry['status'],
-                    'message': entry['message'],
-                    'service': entry.get('service', 'N/A')
-                })
-        return pd.DataFrame(actions)
+        return self._cached('action', lambda snapshot: snapshot.buffers['action'].to_frame())
     
     def get_service_status(self):
         """Extrait le statut des services"""
-        service_data = []
-        for entry in self.data:
-            if entry.get('event_type') == 'metric' and entry.get('metric_type') == 'service_status':
-                service_data.append({
-                    'timestamp': entry['timestamp'],
-                    'service': entry['values']['service'],
-                    'status': entry['values']['status']
-                })
-        return pd.DataFrame(service_data)
+        return self._cached('service_status', lambda snapshot: snapshot.buffers['service_status'].to_frame())
     
     def get_latest_service_status(self):
         """Récupère le dernier statut de chaque service"""
-        df = self.get_service_status()
-        if df.empty:
-            return []
+        return self._cached('latest_service_status', self._latest_service_status)
+    
+    def _latest_service_status(self, snapshot):
+        if self._use_index():
+            # Lecture directe des dernières entrées indexées
+            latest = latest_records(self.log_file)
+            if latest is not None:
+                return [self._service_row(latest[service]) for service in sorted(latest)]
         
-        # Obtenir le dernier statut pour chaque service
-        latest_status = df.sort_values('timestamp').groupby('service').last().reset_index()
-        return latest_status.to_dict('records')
+        # Dernier statut de chaque service, maintenu à la lecture des entrées
+        return [snapshot.latest_services[service] for service in sorted(snapshot.latest_services)]
     
     def get_recent_alerts(self, limit=10):
         """Récupère les alertes récentes"""
-        df = self.get_alerts()
-        if df.empty:
-            return []
+        return self._cached(('recent_alerts', limit), lambda snapshot: self._recent_alerts(snapshot, limit))
+    
+    def _recent_alerts(self, snapshot, limit):
+        store = self._query_store()
+        if store is not None:
+            return [self._alert_row(entry) for entry in store.recent('alert', limit)]
+        
+        if self._use_index():
+            records = query_records(self.log_file, ['alert'], limit=limit, newest_first=True)
+            return [self._alert_row(entry) for entry in records]
         
-        return df.sort_values('timestamp', ascending=False).head(limit).to_dict('records')
+        return self._recent_rows(snapshot, 'alert', limit)
     
     def get_recent_actions(self, limit=10):
         """Récupère les actions récentes"""
-        df = self.get_actions()
-        if df.empty:
-            return []
+        return self._cached(('recent_actions', limit), lambda snapshot: self._recent_actions(snapshot, limit))
+    
+    def _recent_actions(self, snapshot, limit):
+        store = self._query_store()
+        if store is not None:
+            return [self._action_row(entry) for entry in store.recent('action', limit)]
         
-        return df.sort_values('timestamp', ascending=False).head(limit).to_dict('records')
+        if self._use_index():
+            records = query_records(self.log_file, ['action'], limit=limit, newest_first=True)
+            return [self._action_row(entry) for entry in records]
+        
+        return self._recent_rows(snapshot, 'action', limit)
     
-    def create_system_metrics_chart(self):
-        """Crée le graphique des métriques système"""
-        df = self.get_system_metrics()
-        if df.empty:
-            return go.Figure().add_annotation(text="Aucune donnée disponible", showarrow=False)
+    @staticmethod
+    def _recent_rows(snapshot, name, limit):
+        """Dernières lignes d'un tampon (chronologique), plus récentes en premier"""
+        buffer = snapshot.buffers[name]
+        rows = range(len(buffer) - 1, max(len(buffer) - limit, 0) - 1, -1)
+        return [buffer.row(row) for row in rows]
+    
+    def get_event_count(self, event_type, since=None):
+        """Nombre d'alertes ou d'actions (depuis un timestamp ISO optionnel)"""
+        return self._cached(
+            ('count', event_type, since), lambda snapshot: snapshot.counters.total(event_type, since)
+        )
+    
+    def get_alert_counts_by_service(self):
+        """Nombre d'alertes par service (Series indexée par service)"""
+        return self._cached('alerts_by_service', self._alerts_by_service)
+    
+    def _alerts_by_service(self, snapshot):
+        counts = {}
+        for (service,), count in snapshot.counters.counts('alert', ('service',)).items():
+            service = service or 'Système'
+            counts[service] = counts.get(service, 0) + count
+        return pd.Series(counts, dtype='int64').sort_values(ascending=False)
+    
+    def get_alert_counts_by_type(self):
+        """Nombre d'alertes par type (colonnes type, count)"""
+        return self._cached('alerts_by_type', self._alerts_by_type)
+    
+    def _alerts_by_type(self, snapshot):
+        counts = snapshot.counters.counts('alert', ('type',))
+        return pd.DataFrame([(alert_type, count) for (alert_type,), count in counts.items()],
+                            columns=['type', 'count']).sort_values('count', ascending=False)
+    
+    def get_failed_action_counts_by_type(self):
+        """Nombre d'actions échouées par type (colonnes type, count)"""
+        return self._cached('failed_actions_by_type', self._failed_actions_by_type)
+    
+    def _failed_actions_by_type(self, snapshot):
+        counts = snapshot.counters.counts('action', ('type',), where={'status': 'FAILED'})
+        return pd.DataFrame([(action_type, count) for (action_type,), count in counts.items()],
+                            columns=['type', 'count']).sort_values('count', ascending=False)
+    
+    def get_action_counts_by_type_and_status(self):
+        """Nombre d'actions par type et statut (colonnes type, status, count)"""
+        return self._cached('actions_by_type_and_status', self._actions_by_type_and_status)
+    
+    def _actions_by_type_and_status(self, snapshot):
+        counts = snapshot.counters.counts('action', ('type', 'status'))
+        return pd.DataFrame([key + (count,) for key, count in sorted(counts.items(), key=str)],
+                            columns=['type', 'status', 'count'])
+    
+    @staticmethod
+    def time_window(time_range=DEFAULT_TIME_RANGE, start_date=None, end_date=None):
+        """
+        Bornes (timestamps ISO) de la fenêtre affichée
+        Fenêtre glissante: début arrondi à la minute (clé de cache stable), sans borne de fin
+        'custom': jours complets entre start_date et end_date (YYYY-MM-DD)
+        """
+        if time_range == 'custom':
+            start = f"{start_date[:10]}T00:00:00" if start_date else None
+            end = f"{end_date[:10]}T23:59:59.999999" if end_date else None
+            return start, end
+        seconds = TIME_RANGES.get(time_range)
+        if seconds is None:
+            return None, None
+        start = (datetime.now() - timedelta(seconds=seconds)).replace(second=0, microsecond=0)
+        return start.isoformat(), None
+    
+    def create_system_metrics_chart(self, time_range=DEFAULT_TIME_RANGE, start_date=None, end_date=None):
+        """
+        Crée le graphique des métriques système sur la fenêtre demandée
+        Chaque courbe est réduite à DASHBOARD_MAX_POINTS points (LTTB) côté serveur
+        """
+        return self.create_system_metrics_figure(time_range, start_date, end_date)[0]
+    
+    def create_system_metrics_figure(self, time_range=DEFAULT_TIME_RANGE, start_date=None, end_date=None):
+        """
+        Retourne (figure, curseur); le curseur décrit le dernier point envoyé au navigateur
+        et sert aux ajouts incrémentaux (None si la figure ne contient aucune courbe)
+        """
+        start, end = self.time_window(time_range, start_date, end_date)
+        series = self.get_system_metric_arrays(start, end)
+        if len(series['timestamp']) == 0:
+            return go.Figure().add_annotation(text="Aucune donnée disponible", showarrow=False), None
+        
+        # Historique long: lecture du niveau d'agrégation adapté au nombre de points affichables
+        timestamps = np.asarray(series['timestamp'], dtype='datetime64[ms]')
+        span = (timestamps[-1] - timestamps[0]) / np.timedelta64(1, 's')
+        resolution = span / DASHBOARD_MAX_POINTS
+        if choose_tier(resolution) is not None:
+            series = self.get_system_metric_arrays(start, end, resolution)
+        
+        points = downsample_series(series, DASHBOARD_MAX_POINTS, list(SYSTEM_METRIC_COLUMNS))
+        cursor = self._system_metrics_cursor(series, points, span, time_range, end)
         
         fig = make_subplots(
             rows=2, cols=2,
@@ -122,39 +692,96 @@ class MonitoringDashboard:
         
         # CPU
         fig.add_trace(
-            go.Scatter(x=df['timestamp'], y=df['cpu'], name='CPU', line=dict(color='red')),
+            go.Scatter(x=points['cpu'][0], y=points['cpu'][1], name='CPU', line=dict(color='red'),
+                       connectgaps=True),
             row=1, col=1
         )
         
         # Mémoire
         fig.add_trace(
-            go.Scatter(x=df['timestamp'], y=df['memory'], name='Mémoire', line=dict(color='blue')),
+            go.Scatter(x=points['memory'][0], y=points['memory'][1], name='Mémoire', line=dict(color='blue'),
+                       connectgaps=True),
             row=1, col=2
         )
         
         # Disque
         fig.add_trace(
-            go.Scatter(x=df['timestamp'], y=df['disk'], name='Disque', line=dict(color='green')),
+            go.Scatter(x=points['disk'][0], y=points['disk'][1], name='Disque', line=dict(color='green'),
+                       connectgaps=True),
             row=2, col=1
         )
         
         # Réseau
         fig.add_trace(
-            go.Scatter(x=df['timestamp'], y=df['network'], name='Réseau', line=dict(color='purple')),
+            go.Scatter(x=points['network'][0], y=points['network'][1], name='Réseau', line=dict(color='purple'),
+                       connectgaps=True),
             row=2, col=2
         )
         
         fig.update_layout(height=400, showlegend=False, title_text="Évolution des Métriques Système")
-        return fig
+        return fig, cursor
+    
+    @staticmethod
+    def _system_metrics_cursor(series, points, span, time_range, end):
+        """
+        Curseur des ajouts incrémentaux: dernier point envoyé, pas minimal entre deux points
+        ajoutés (figure réduite) et taille de la fenêtre glissante (points par courbe)
+        """
+        timestamps = np.asarray(series['timestamp'], dtype='datetime64[ms]')
+        sent = max(len(x) for x, _ in points.values())
+        window = TIME_RANGES.get(time_range)
+        if len(timestamps) > DASHBOARD_MAX_POINTS:
+            # Figure réduite: un point ajouté au plus par intervalle de la figure initiale
+            step_ms = int(span * 1000 / DASHBOARD_MAX_POINTS)
+            max_points = sent
+        elif window and len(timestamps) > 1:
+            # Échantillons bruts: autant de points que la fenêtre en contient à la cadence observée
+            step_ms = 0
+            interval = np.median(np.diff(timestamps) / np.timedelta64(1, 's'))
+            max_points = min(DASHBOARD_MAX_POINTS, max(sent, int(window / max(interval, 1e-3))))
+        else:
+            step_ms = 0
+            max_points = DASHBOARD_MAX_POINTS
+        return {'last': str(timestamps[-1]), 'step_ms': step_ms, 'max_points': max_points, 'end': end}
+    
+    def create_system_metrics_extension(self, cursor):
+        """
+        Points système postérieurs au curseur, au format extendData de dcc.Graph
+        (fenêtre glissante de cursor['max_points'] points par courbe)
+        Retourne (extendData ou None, curseur mis à jour)
+        """
+        if cursor.get('end') is not None:
+            # Fenêtre personnalisée terminée: aucun nouveau point à afficher
+            return None, cursor
+        
+        series = self.get_system_metric_arrays(cursor['last'])
+        timestamps = np.asarray(series['timestamp'], dtype='datetime64[ms]')
+        last = np.datetime64(cursor['last'], 'ms')
+        keep = np.flatnonzero(timestamps > last)
+        step = cursor['step_ms']
+        if step and len(keep):
+            # Premier échantillon de chaque intervalle entièrement écoulé depuis le dernier point
+            buckets = (timestamps[keep] - last).astype(np.int64) // step
+            _, first = np.unique(buckets, return_index=True)
+            keep = keep[first[buckets[first] >= 1]]
+        if len(keep) == 0:
+            return None, cursor
+        
+        x = np.datetime_as_string(timestamps[keep], unit='ms').tolist()
+        data = {
+            'x': [x] * len(SYSTEM_METRIC_COLUMNS),
+            'y': [np.asarray(series[name])[keep].tolist() for name in SYSTEM_METRIC_COLUMNS]
+        }
+        traces = list(range(len(SYSTEM_METRIC_COLUMNS)))
+        return [data, traces, cursor['max_points']], dict(cursor, last=x[-1])
     
     def create_alerts_by_service_chart(self):
         """Crée le graphique des alertes par service"""
-        df = self.get_alerts()
-        if df.empty:
+        if self.get_event_count('alert') == 0:
             return go.Figure().add_annotation(text="Aucune alerte enregistrée", showarrow=False)
         
         # Alertes par service
-        service_counts = df['service'].value_counts()
+        service_counts = self.get_alert_counts_by_service()
         fig = px.bar(x=service_counts.index, y=service_counts.values,
                      title="Nombre d'Incidents par Service",
                      labels={'x': 'Service', 'y': "Nombre d'Alertes"},
@@ -165,23 +792,16 @@ class MonitoringDashboard:
     
     def create_incidents_by_type_chart(self):
         """Crée le graphique des incidents par type"""
-        df_alerts = self.get_alerts()
-        df_actions = self.get_actions()
-        
-        if df_alerts.empty and df_actions.empty:
+        if self.get_event_count('alert') == 0 and self.get_event_count('action') == 0:
             return go.Figure().add_annotation(text="Aucun incident enregistré", showarrow=False)
         
         # Compter les alertes par type
-        alert_counts = df_alerts['type'].value_counts().reset_index()
-        alert_counts.columns = ['type', 'count']
-        alert_counts['category'] = 'Alerte'
+        alert_counts = self.get_alert_counts_by_type().assign(category='Alerte')
         
         # Compter les actions par type (échecs seulement pour les incidents)
-        failed_actions = df_actions[df_actions['status'] == 'FAILED']
-        if not failed_actions.empty:
-            action_counts = failed_actions['type'].value_counts().reset_index()
-            action_counts.columns = ['type', 'count']
-            action_counts['category'] = 'Action Échouée'
+        action_counts = self.get_failed_action_counts_by_type()
+        if not action_counts.empty:
+            action_counts = action_counts.assign(category='Action Échouée')
             
             # Combiner les données
             all_incidents = pd.concat([alert_counts, action_counts], ignore_index=True)
@@ -201,12 +821,11 @@ class MonitoringDashboard:
     
     def create_actions_chart(self):
         """Crée le graphique des actions"""
-        df = self.get_actions()
-        if df.empty:
+        if self.get_event_count('action') == 0:
             return go.Figure().add_annotation(text="Aucune action enregistrée", showarrow=False)
         
         # Actions par type et statut
-        action_status = df.groupby(['type', 'status']).size().reset_index(name='count')
+        action_status = self.get_action_counts_by_type_and_status()
         fig = px.bar(action_status, x='type', y='count', color='status',
                     title="Actions par Type et Statut",
                     labels={'type': "Type d'Action", 'count': 'Nombre'},
@@ -295,9 +914,181 @@ class MonitoringDashboard:
         
         return dbc.ListGroup(rows, flush=True)
     
+    def create_live_metrics(self):
+        """Crée la ligne des métriques en temps réel"""
+        latest_metrics = self.get_latest_system_metrics()
+        alert_count = self.get_event_count('alert')
+        action_count = self.get_event_count('action')
+        # Fenêtre glissante lue dans les compteurs par intervalle (sans parcours de l'historique)
+        day_start = self.time_window('24h')[0]
+        alerts_today = self.get_event_count('alert', day_start)
+        service_count = len(self.get_latest_service_status())
+        
+        if latest_metrics is not None:
+            
+            # Create metric cards
+            metrics_row = dbc.Row([
+                # CPU
+                dbc.Col([
+                    html.Div([
+                        html.Div("💻 CPU", className="small text-muted"),
+                        html.H4(metric_text(latest_metrics['cpu'], '%'), 
+                               style={'color': metric_color(latest_metrics['cpu'], 80),
+                                      'fontWeight': 'bold'})
+                    ], className="text-center")
+                ], width=2),
+                
+                # Memory
+                dbc.Col([
+                    html.Div([
+                        html.Div("🧠 Mémoire", className="small text-muted"),
+                        html.H4(metric_text(latest_metrics['memory'], '%'), 
+                               style={'color': metric_color(latest_metrics['memory'], 85),
+                                      'fontWeight': 'bold'})
+                    ], className="text-center")
+                ], width=2),
+                
+                # Disk
+                dbc.Col([
+                    html.Div([
+                        html.Div("💾 Disque", className="small text-muted"),
+                        html.H4(metric_text(latest_metrics['disk'], '%'), 
+                               style={'color': metric_color(latest_metrics['disk'], 90),
+                                      'fontWeight': 'bold'})
+                    ], className="text-center")
+                ], width=2),
+                
+                # Network
+                dbc.Col([
+                    html.Div([
+                        html.Div("🌐 Réseau", className="small text-muted"),
+                        html.H4(metric_text(latest_metrics['network'], 'MB'), 
+                               style={'color': 'orange', 'fontWeight': 'bold'})
+                    ], className="text-center")
+                ], width=2),
+                
+                # Alerts
+                dbc.Col([
+                    html.Div([
+                        html.Div("🚨 Alertes", className="small text-muted"),
+                        html.H4(f"{alert_count}", 
+                               style={'color': 'red' if alert_count > 0 else 'green',
+                                      'fontWeight': 'bold'}),
+                        html.Div(f"24h: {alerts_today}", className="small text-muted")
+                    ], className="text-center")
+                ], width=1),
+                
+                # Actions
+                dbc.Col([
+                    html.Div([
+                        html.Div("⚡ Actions", className="small text-muted"),
+                        html.H4(f"{action_count}", 
+                               style={'color': 'blue', 'fontWeight': 'bold'})
+                    ], className="text-center")
+                ], width=1),
+                
+                # Services
+                dbc.Col([
+                    html.Div([
+                        html.Div("🔧 Services", className="small text-muted"),
+                        html.H4(f"{service_count}", 
+                               style={'color': 'purple', 'fontWeight': 'bold'})
+                    ], className="text-center")
+                ], width=1),
+                
+                # Last Update
+                dbc.Col([
+                    html.Div([
+                        html.Div("🕐 Dernière MAJ", className="small text-muted"),
+                        html.H4(f"{datetime.now().strftime('%H:%M:%S')}", 
+                               style={'color': 'gray', 'fontWeight': 'bold'})
+                    ], className="text-center")
+                ], width=1)
+            ])
+            
+            live_metrics = metrics_row
+        else:
+            live_metrics = dbc.Alert("⏳ En attente de données de surveillance...", 
+                                   color="warning", className="text-center")
+        
+        return live_metrics
+    
+    def _register_component(self, app, component_id, prop, sources, render):
+        """
+        Callback d'un composant, déclenché par la version des données
+        sources: types d'entrées dont dépend le composant (None: toujours recalculé)
+        Exécuté dans le navigateur (assets/component_data.js): la sortie est lue sur
+        /data/<composant>, JSON rendu une fois par version et requêtes conditionnelles (ETag / 304)
+        """
+        self.components[component_id] = (sources, render)
+        
+        app.clientside_callback(
+            f"function (version) {{ return window.dashboardData.fetchComponent("
+            f"{json.dumps(component_id)}, {json.dumps(sources)}, version); }}",
+            Output(component_id, prop),
+            Input('data-version', 'data')
+        )
+    
+    def render_component(self, component_id):
+        """Sortie d'un composant, construite une seule fois par version de ses données"""
+        sources, render = self.components[component_id]
+        snapshot = self.snapshot
+        if sources is None:
+            key = (component_id, snapshot.version)
+        else:
+            key = (component_id,) + tuple(snapshot.type_versions[name] for name in sources)
+        return self.render_cache.get(key, lambda: (render(), None))
+    
+    def render_system_metrics_chart(self, time_range=DEFAULT_TIME_RANGE, start_date=None, end_date=None):
+        """Graphique système en cache par (version des métriques, fenêtre); extra: curseur d'ajout"""
+        window = self.time_window(time_range, start_date, end_date)
+        key = ('system-metrics-chart', self.snapshot.type_versions['system'], time_range) + window
+        return self.render_cache.get(
+            key, lambda: self.create_system_metrics_figure(time_range, start_date, end_date)
+        )
+    
+    def data_response(self, component_id):
+        """
+        Réponse GET /data/<composant>: JSON de la sortie rendue, avec ETag
+        (304 si le navigateur possède déjà cette version)
+        """
+        self.refresh_data()
+        if component_id == 'system-metrics-chart':
+            entry = self.render_system_metrics_chart(
+                request.args.get('range', DEFAULT_TIME_RANGE),
+                request.args.get('start_date'), request.args.get('end_date')
+            )
+        elif component_id in self.components:
+            entry = self.render_component(component_id)
+        else:
+            return Response('{"error": "composant inconnu"}', status=404, mimetype='application/json')
+        
+        headers = {'ETag': entry.etag, 'Cache-Control': 'no-cache'}
+        if request.if_none_match.contains(entry.etag.strip('"')):
+            return Response(status=304, headers=headers)
+        return Response(entry.json, mimetype='application/json', headers=headers)
+    
     def create_dashboard(self):
         """Crée le tableau de bord Dash"""
         app = dash.Dash(__name__, external_stylesheets=[dbc.themes.FLATLY])
+        self.start_live_updates()
+        
+        @app.server.route('/data/<component_id>')
+        def data(component_id):
+            # Sorties rendues en JSON, requêtes conditionnelles (ETag / 304)
+            return self.data_response(component_id)
+        
+        # API REST d'historique paginée (scripts et outils externes)
+        history = HistoryQuery(self.log_file, self.get_metric_store, self.get_event_store)
+        app.server.register_blueprint(create_api_blueprint(history))
+        
+        @app.server.route('/stream')
+        def stream():
+            # Notifications Server-Sent Events (assets/live_updates.js); 204: pas de mode direct
+            if not self.live:
+                return Response(status=204)
+            return Response(self.stream_events(), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
         
         app.layout = dbc.Container([
             # Header
@@ -336,6 +1127,25 @@ class MonitoringDashboard:
                         dbc.CardHeader("📈 Évolution des Métriques Système", 
                                       className="fw-bold bg-primary text-white"),
                         dbc.CardBody([
+                            dbc.Row([
+                                dbc.Col([
+                                    dbc.RadioItems(
+                                        id="time-range",
+                                        options=[
+                                            {'label': '15 min', 'value': '15m'},
+                                            {'label': '1 h', 'value': '1h'},
+                                            {'label': '24 h', 'value': '24h'},
+                                            {'label': '7 j', 'value': '7d'},
+                                            {'label': 'Personnalisé', 'value': 'custom'}
+                                        ],
+                                        value=DEFAULT_TIME_RANGE,
+                                        inline=True
+                                    )
+                                ], width=8),
+                                dbc.Col([
+                                    dcc.DatePickerRange(id="custom-range", display_format='YYYY-MM-DD')
+                                ], width=4)
+                            ], className="mb-2"),
                             dcc.Graph(id="system-metrics-chart")
                         ])
                     ], className="mb-4 shadow-sm"),
@@ -413,7 +1223,8 @@ class MonitoringDashboard:
             dbc.Row([
                 dbc.Col([
                     html.Hr(),
-                    html.P("Système de Surveillance - Mise à jour automatique toutes les 5 secondes", 
+                    html.P("Système de Surveillance - Mise à jour en direct" if self.live else
+                           "Système de Surveillance - Mise à jour automatique toutes les 5 secondes", 
                           className="text-center text-muted small mt-3")
                 ], width=12)
             ]),
@@ -421,134 +1232,75 @@ class MonitoringDashboard:
             dcc.Interval(
                 id='interval-component',
                 interval=5*1000,  # 5 secondes
-                n_intervals=0
-            )
+                n_intervals=0,
+                disabled=self.live  # mode direct: notifications poussées, pas d'interrogation
+            ),
+            # Déclenché par le flux /stream à chaque nouvelle version des données
+            html.Button(id='live-trigger', n_clicks=0, style={'display': 'none'}),
+            # Version des données vue par le navigateur et types d'entrées modifiés
+            dcc.Store(id='data-version'),
+            # Dernier point du graphique système reçu par le navigateur
+            dcc.Store(id='system-chart-cursor')
         ], fluid=True, style={'backgroundColor': '#f8f9fa'})
         
+        @app.callback(
+            Output('data-version', 'data'),
+            [Input('interval-component', 'n_intervals'),
+             Input('live-trigger', 'n_clicks')],
+            [State('data-version', 'data')]
+        )
+        def update_data_version(n, clicks, current):
+            # Rechargement incrémental si le fichier a été modifié (sans effet en mode direct)
+            self.refresh_data()
+            snapshot = self.snapshot
+            if current is not None and current.get('version') == snapshot.version:
+                return no_update
+            since = current.get('version') if current else None
+            return {'version': snapshot.version, 'changed': self.changed_types(since, snapshot)}
+        
+        # Un callback par composant: seuls ceux dont les données ont changé sont recalculés
         @app.callback(
             [Output('system-metrics-chart', 'figure'),
-             Output('alerts-by-service-chart', 'figure'),
-             Output('incidents-by-type-chart', 'figure'),
-             Output('actions-chart', 'figure'),
-             Output('live-metrics-details', 'children'),
-             Output('service-status-table', 'children'),
-             Output('alerts-table', 'children'),
-             Output('actions-table', 'children')],
-            [Input('interval-component', 'n_intervals')]
+             Output('system-metrics-chart', 'extendData'),
+             Output('system-chart-cursor', 'data')],
+            [Input('data-version', 'data'),
+             Input('time-range', 'value'),
+             Input('custom-range', 'start_date'),
+             Input('custom-range', 'end_date')],
+            [State('system-chart-cursor', 'data')]
         )
-        def update_dashboard(n):
-            # Recharger les données si le fichier a été modifié
-            current_modified = os.path.getmtime(self.log_file) if os.path.exists(self.log_file) else 0
-            if current_modified > self.last_modified:
-                self.load_data()
-                self.last_modified = current_modified
-            
-            # Créer les graphiques
-            system_fig = self.create_system_metrics_chart()
-            alerts_service_fig = self.create_alerts_by_service_chart()
-            incidents_type_fig = self.create_incidents_by_type_chart()
-            actions_fig = self.create_actions_chart()
-            
-            # Créer les tableaux
-            service_table = self.create_service_status_table()
-            alerts_table = self.create_alerts_table()
-            actions_table = self.create_actions_table()
-            
-            # Métriques en temps réel
-            df_system = self.get_system_metrics()
-            df_alerts = self.get_alerts()
-            df_actions = self.get_actions()
-            df_services = self.get_service_status()
-            
-            if not df_system.empty:
-                latest_metrics = df_system.iloc[-1]
-                
-                # Create metric cards
-                metrics_row = dbc.Row([
-                    # CPU
-                    dbc.Col([
-                        html.Div([
-                            html.Div("💻 CPU", className="small text-muted"),
-                            html.H4(f"{latest_metrics['cpu']:.1f}%", 
-                                   style={'color': 'red' if latest_metrics['cpu'] > 80 else 'green',
-                                          'fontWeight': 'bold'})
-                        ], className="text-center")
-                    ], width=2),
-                    
-                    # Memory
-                    dbc.Col([
-                        html.Div([
-                            html.Div("🧠 Mémoire", className="small text-muted"),
-                            html.H4(f"{latest_metrics['memory']:.1f}%", 
-                                   style={'color': 'red' if latest_metrics['memory'] > 85 else 'green',
-                                          'fontWeight': 'bold'})
-                        ], className="text-center")
-                    ], width=2),
-                    
-                    # Disk
-                    dbc.Col([
-                        html.Div([
-                            html.Div("💾 Disque", className="small text-muted"),
-                            html.H4(f"{latest_metrics['disk']:.1f}%", 
-                                   style={'color': 'red' if latest_metrics['disk'] > 90 else 'green',
-                                          'fontWeight': 'bold'})
-                        ], className="text-center")
-                    ], width=2),
-                    
-                    # Network
-                    dbc.Col([
-                        html.Div([
-                            html.Div("🌐 Réseau", className="small text-muted"),
-                            html.H4(f"{latest_metrics['network']:.1f}MB", 
-                                   style={'color': 'orange', 'fontWeight': 'bold'})
-                        ], className="text-center")
-                    ], width=2),
-                    
-                    # Alerts
-                    dbc.Col([
-                        html.Div([
-                            html.Div("🚨 Alertes", className="small text-muted"),
-                            html.H4(f"{len(df_alerts)}", 
-                                   style={'color': 'red' if len(df_alerts) > 0 else 'green',
-                                          'fontWeight': 'bold'})
-                        ], className="text-center")
-                    ], width=1),
-                    
-                    # Actions
-                    dbc.Col([
-                        html.Div([
-                            html.Div("⚡ Actions", className="small text-muted"),
-                            html.H4(f"{len(df_actions)}", 
-                                   style={'color': 'blue', 'fontWeight': 'bold'})
-                        ], className="text-center")
-                    ], width=1),
-                    
-                    # Services
-                    dbc.Col([
-                        html.Div([
-                            html.Div("🔧 Services", className="small text-muted"),
-                            html.H4(f"{len(df_services['service'].unique()) if not df_services.empty else 0}", 
-                                   style={'color': 'purple', 'fontWeight': 'bold'})
-                        ], className="text-center")
-                    ], width=1),
-                    
-                    # Last Update
-                    dbc.Col([
-                        html.Div([
-                            html.Div("🕐 Dernière MAJ", className="small text-muted"),
-                            html.H4(f"{datetime.now().strftime('%H:%M:%S')}", 
-                                   style={'color': 'gray', 'fontWeight': 'bold'})
-                        ], className="text-center")
-                    ], width=1)
-                ])
-                
-                live_metrics = metrics_row
-            else:
-                live_metrics = dbc.Alert("⏳ En attente de données de surveillance...", 
-                                       color="warning", className="text-center")
-            
-            return (system_fig, alerts_service_fig, incidents_type_fig, actions_fig, 
-                   live_metrics, service_table, alerts_table, actions_table)
+        def update_system_metrics_chart(version, time_range, start_date, end_date, cursor):
+            # Figure complète au chargement ou au changement de fenêtre, sinon ajout des nouveaux points
+            triggered = {item['prop_id'].split('.')[0] for item in dash.callback_context.triggered}
+            if version is None:
+                return no_update, no_update, no_update
+            if triggered == {'data-version'}:
+                if 'system' not in version.get('changed', ()):
+                    return no_update, no_update, no_update
+                if cursor is not None:
+                    extension, cursor = self.create_system_metrics_extension(cursor)
+                    if extension is None:
+                        return no_update, no_update, no_update
+                    return no_update, extension, cursor
+            if triggered == {'custom-range'} and time_range != 'custom':
+                return no_update, no_update, no_update
+            entry = self.render_system_metrics_chart(time_range, start_date, end_date)
+            return entry.output, no_update, entry.extra
+        
+        self._register_component(app, 'alerts-by-service-chart', 'figure', ('alert',),
+                                 self.create_alerts_by_service_chart)
+        self._register_component(app, 'incidents-by-type-chart', 'figure', ('alert', 'action'),
+                                 self.create_incidents_by_type_chart)
+        self._register_component(app, 'actions-chart', 'figure', ('action',),
+                                 self.create_actions_chart)
+        self._register_component(app, 'live-metrics-details', 'children', None,
+                                 self.create_live_metrics)
+        self._register_component(app, 'service-status-table', 'children', ('service_status',),
+                                 self.create_service_status_table)
+        self._register_component(app, 'alerts-table', 'children', ('alert',),
+                                 self.create_alerts_table)
+        self._register_component(app, 'actions-table', 'children', ('action',),
+                                 self.create_actions_table)
         
         return app
     
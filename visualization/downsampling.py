@@ -0,0 +1,79 @@
+import numpy as np
+
+
+def _as_float(x):
+    """Abscisses en flottants (datetime64 convertis en millisecondes)"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ms]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb_indices(x, ys, threshold):
+    """
+    Largest-Triangle-Three-Buckets sur plusieurs séries partageant les mêmes abscisses
+    x: (n,), ys: (k, n) -> indices retenus (k, threshold), premier et dernier points inclus
+    Les calculs de chaque intervalle sont vectorisés (toutes les séries et tous les points
+    de l'intervalle à la fois); seul l'enchaînement des intervalles reste séquentiel
+    """
+    x = _as_float(x)
+    ys = np.atleast_2d(np.asarray(ys, dtype=np.float64))
+    k, n = ys.shape
+    if threshold >= n or threshold < 3:
+        return np.tile(np.arange(n), (k, 1))
+
+    # Intervalles [edges[b], edges[b + 1]) entre le premier et le dernier point
+    buckets = threshold - 2
+    edges = (np.floor(np.arange(buckets + 1) * (n - 2) / buckets) + 1).astype(np.int64)
+    counts = np.diff(edges)
+
+    # Moyenne de chaque intervalle (sommet c du triangle pour l'intervalle précédent)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(np.nan_to_num(ys[:, :n - 1]), edges[:-1], axis=1) / counts
+    next_x = np.append(mean_x[1:], x[n - 1])
+    next_y = np.concatenate([mean_y[:, 1:], ys[:, n - 1:]], axis=1)
+
+    # Intervalles alignés dans une matrice (intervalles, taille max), cases vides masquées
+    width = int(counts.max())
+    offsets = np.arange(width)
+    index = np.minimum(edges[:-1, None] + offsets, n - 1)
+    valid = offsets < counts[:, None]
+    bucket_x = x[index]
+    bucket_y = ys[:, index]
+
+    selected = np.empty((k, threshold), dtype=np.int64)
+    selected[:, 0] = 0
+    selected[:, -1] = n - 1
+    rows = np.arange(k)
+    ax = np.full(k, x[0])
+    ay = ys[:, 0].copy()
+
+    for b in range(buckets):
+        cx = next_x[b]
+        cy = next_y[:, b]
+        area = np.abs(
+            (ax - cx)[:, None] * (bucket_y[:, b] - ay[:, None])
+            - (ax[:, None] - bucket_x[b]) * (cy - ay)[:, None]
+        )
+        area = np.where(valid[b] & ~np.isnan(area), area, -1.0)
+        chosen = index[b, area.argmax(axis=1)]
+        selected[:, b + 1] = chosen
+        ax = x[chosen]
+        ay = ys[rows, chosen]
+
+    return selected
+
+
+def downsample_series(series, threshold, names):
+    """
+    Réduit chaque série à threshold points (LTTB)
+    series: dict de tableaux ('timestamp' + une entrée par nom)
+    Retourne {nom: (abscisses, valeurs)}, les abscisses retenues différant d'une série à l'autre
+    """
+    timestamps = np.asarray(series['timestamp'])
+    values = np.vstack([np.asarray(series[name], dtype=np.float64) for name in names])
+    selected = lttb_indices(timestamps, values, threshold)
+    return {
+        name: (timestamps[selected[row]], values[row, selected[row]])
+        for row, name in enumerate(names)
+    }
@@ -0,0 +1,79 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from plotly.io.json import to_json_plotly
+
+
+class RenderedOutput:
+    """Sortie rendue (figure ou composant) et sa sérialisation JSON, calculée une seule fois"""
+
+    __slots__ = ('output', 'extra', '_json', '_etag')
+
+    def __init__(self, output, extra=None):
+        self.output = output
+        self.extra = extra
+        self._json = None
+        self._etag = None
+
+    @property
+    def json(self):
+        if self._json is None:
+            self._json = to_json_plotly(self.output)
+        return self._json
+
+    @property
+    def etag(self):
+        """ETag calculé sur le contenu (identique d'un processus à l'autre)"""
+        if self._etag is None:
+            self._etag = '"' + hashlib.sha1(self.json.encode('utf-8')).hexdigest()[:20] + '"'
+        return self._etag
+
+
+class RenderCache:
+    """
+    Cache LRU des sorties rendues du tableau de bord, par clé (composant, versions des données, paramètres)
+    Plusieurs visiteurs demandant la même clé déclenchent une seule construction
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max(1, max_entries)
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.key_locks = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, render):
+        """
+        Retourne la sortie en cache pour key, ou la construit avec render()
+        render retourne (sortie, données annexes)
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Un autre visiteur a pu construire la sortie pendant l'attente
+            with self.lock:
+                entry = self.entries.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    return entry
+
+            entry = RenderedOutput(*render())
+
+            with self.lock:
+                self.misses += 1
+                self.entries[key] = entry
+                self.key_locks.pop(key, None)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+            return entry
+
+    def get_stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
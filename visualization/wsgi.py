@@ -0,0 +1,17 @@
+"""
+Point d'entrée WSGI du tableau de bord (mode séparé, plusieurs processus)
+
+Usage:
+    gunicorn --workers 4 --bind 0.0.0.0:8050 visualization.wsgi:server
+
+Chaque processus ouvre le log, le magasin de métriques et les agrégats en lecture seule:
+les fichiers mappés en mémoire partagent leurs pages entre processus, et la charge du
+tableau de bord ne concurrence plus la boucle de surveillance (GIL distinct par processus).
+Lancé automatiquement par main.py lorsque DASHBOARD_MODE=separate.
+"""
+from config.settings import DASHBOARD_PORT
+from visualization.dashboard import MonitoringDashboard
+
+dashboard = MonitoringDashboard(port=DASHBOARD_PORT)
+app = dashboard.create_dashboard()
+server = app.server